@@ -0,0 +1,339 @@
+"""Benchmarks of the scheduler tick and of the loggers.
+
+Synthetic homes are generated with a configurable number of sensors,
+devices and events, then the following are measured:
+
+- ticks per second and p50/p99 latency of `Scheduler.manual_update`,
+- memory allocated per entity while building the home,
+- throughput of the text loggers and of the binary event log.
+
+Results are written as JSON, so that runs can be compared.
+With a baseline, the run fails if a throughput dropped by more than the tolerance.
+
+```bash
+python -m benchmarks.bench_scheduler --sensors 10000 --output results.json
+python -m benchmarks.bench_scheduler --sensors 10000 --baseline results.json
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from random import Random
+from time import perf_counter, perf_counter_ns
+from typing import Any
+
+from src.async_logger import AsyncLogger
+from src.clock import VirtualClock
+from src.device import Device
+from src.device_command import DeviceCommand
+from src.event_log import EventLogWriter, EventRecord, RecordKind
+from src.logger import Logger
+from src.physical_quantity import PhysicalQuantity
+from src.requirement import SensorRequirement
+from src.scheduler import Scheduler, SchedulerEvent
+from src.sensor import ComparisonMode, Sensor
+
+_COMPARISON_MODES: tuple[ComparisonMode, ...] = ("EQ", "NE", "LE", "GE", "LT", "GT")
+
+# Keys of the results where higher is better, compared against the baseline.
+_THROUGHPUT_KEYS: tuple[str, ...] = (
+    "ticks_per_sec",
+    "logger_texts_per_sec",
+    "async_logger_texts_per_sec",
+    "event_log_records_per_sec",
+)
+
+
+def build_synthetic_home(
+    sensor_count: int,
+    device_count: int,
+    event_count: int,
+    seed: int = 0,
+) -> Scheduler:
+    """Build a scheduler with random sensors, devices and events.
+
+    Each event has one or two requirements on random sensors,
+    and sets a random device to a random value.
+    """
+
+    random: Random = Random(seed)
+    physical_quantities: list[PhysicalQuantity] = list(PhysicalQuantity)
+
+    sensors: list[Sensor] = [
+        Sensor(
+            f"Sensor {index}",
+            random.choice(physical_quantities),
+            (0, 100),
+        )
+        for index in range(sensor_count)
+    ]
+    devices: list[Device] = [
+        Device(
+            f"Device {index}",
+            random.choice(physical_quantities),
+            (0, 100),
+        )
+        for index in range(device_count)
+    ]
+
+    events: list[SchedulerEvent] = [
+        SchedulerEvent(
+            requirements=[
+                SensorRequirement(
+                    random.choice(sensors),
+                    random.choice(_COMPARISON_MODES),
+                    random.randrange(0, 101),
+                )
+                for _ in range(random.randint(1, 2))
+            ],
+            actions=[DeviceCommand(random.choice(devices), random.randrange(0, 101))],
+        )
+        for _ in range(event_count if sensors and devices else 0)
+    ]
+
+    scheduler: Scheduler = Scheduler(1, VirtualClock())
+    scheduler.register_sensors(sensors)
+    scheduler.register_devices(devices)
+    scheduler.register_events(events)
+
+    return scheduler
+
+
+def _percentile(sorted_samples: list[float], percentile: float) -> float:
+    """Return a percentile of sorted samples, with the nearest-rank method."""
+
+    if not sorted_samples:
+        return 0.0
+
+    rank: int = max(0, round(percentile / 100 * len(sorted_samples)) - 1)
+
+    return sorted_samples[min(rank, len(sorted_samples) - 1)]
+
+
+def measure_ticks(scheduler: Scheduler, tick_count: int) -> dict[str, float]:
+    """Measure the throughput and latency of manual updates.
+
+    The first tick compiles the rules and is measured separately.
+    """
+
+    started_at: int = perf_counter_ns()
+    scheduler.manual_update()
+    first_tick_ms: float = (perf_counter_ns() - started_at) / 1e6
+
+    latencies_ms: list[float] = []
+    for _ in range(tick_count):
+        started_at = perf_counter_ns()
+        scheduler.manual_update()
+        latencies_ms.append((perf_counter_ns() - started_at) / 1e6)
+
+    total_sec: float = sum(latencies_ms) / 1e3
+    latencies_ms.sort()
+
+    return {
+        "first_tick_ms": first_tick_ms,
+        "ticks_per_sec": tick_count / total_sec if total_sec > 0 else 0.0,
+        "tick_p50_ms": _percentile(latencies_ms, 50),
+        "tick_p99_ms": _percentile(latencies_ms, 99),
+    }
+
+
+def measure_memory_per_entity(
+    sensor_count: int,
+    device_count: int,
+    event_count: int,
+    seed: int,
+) -> float:
+    """Return the bytes allocated per sensor, device and event of a home."""
+
+    tracemalloc.start()
+    try:
+        scheduler: Scheduler = build_synthetic_home(
+            sensor_count,
+            device_count,
+            event_count,
+            seed,
+        )
+        allocated_size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del scheduler
+
+    return allocated_size / max(1, sensor_count + device_count + event_count)
+
+
+def measure_loggers(message_count: int) -> dict[str, float]:
+    """Measure the throughput of the loggers, writing to memory."""
+
+    messages: list[str] = [
+        f"Sensor {index}: current MOTION (%) reading is {index % 100}."
+        for index in range(message_count)
+    ]
+    batches: list[list[str]] = [
+        messages[start : start + 100] for start in range(0, message_count, 100)
+    ]
+
+    def _ignore(_: str) -> None:
+        pass
+
+    started_at: float = perf_counter()
+    with Logger(io.StringIO(), _ignore, buffered=True) as logger:
+        for batch in batches:
+            logger.log_texts(batch)
+    logger_sec: float = perf_counter() - started_at
+
+    started_at = perf_counter()
+    with AsyncLogger(io.StringIO(), _ignore) as async_logger:
+        for batch in batches:
+            async_logger.log_texts(batch)
+    async_logger_sec: float = perf_counter() - started_at
+
+    records: list[EventRecord] = [
+        EventRecord(float(index), index, RecordKind.SENSOR, index % 100)
+        for index in range(message_count)
+    ]
+    event_log_writer: EventLogWriter = EventLogWriter(io.BytesIO())
+
+    started_at = perf_counter()
+    for start in range(0, message_count, 100):
+        event_log_writer.write_records(records[start : start + 100])
+    event_log_writer.flush()
+    event_log_sec: float = perf_counter() - started_at
+
+    return {
+        "logger_texts_per_sec": message_count / logger_sec,
+        "async_logger_texts_per_sec": message_count / async_logger_sec,
+        "event_log_records_per_sec": message_count / event_log_sec,
+    }
+
+
+def run_benchmarks(
+    sensor_count: int,
+    device_count: int,
+    event_count: int,
+    tick_count: int,
+    message_count: int,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Run every benchmark and return the results."""
+
+    scheduler: Scheduler = build_synthetic_home(
+        sensor_count,
+        device_count,
+        event_count,
+        seed,
+    )
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "sensors": sensor_count,
+            "devices": device_count,
+            "events": event_count,
+            "ticks": tick_count,
+            "messages": message_count,
+            "seed": seed,
+        },
+        "results": {
+            **measure_ticks(scheduler, tick_count),
+            "bytes_per_entity": measure_memory_per_entity(
+                sensor_count,
+                device_count,
+                event_count,
+                seed,
+            ),
+            **measure_loggers(message_count),
+        },
+    }
+
+
+def find_regressions(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float,
+) -> list[str]:
+    """Return a description of every throughput that dropped below the baseline.
+
+    A throughput regressed if it is lower than the baseline by more than
+    `tolerance`, a fraction of the baseline value.
+    """
+
+    regressions: list[str] = []
+
+    for key in _THROUGHPUT_KEYS:
+        baseline_value: float | None = baseline["results"].get(key)
+        value: float | None = results["results"].get(key)
+        if not baseline_value or value is None:
+            continue
+
+        if value < baseline_value * (1 - tolerance):
+            regressions.append(
+                f"{key}: {value:.1f} is {1 - value / baseline_value:.1%} "
+                f"below the baseline {baseline_value:.1f}"
+            )
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks from the command line."""
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scheduler and the loggers."
+    )
+    parser.add_argument("--sensors", type=int, default=1000)
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="allowed throughput drop against the baseline, as a fraction",
+    )
+    arguments = parser.parse_args(argv)
+
+    results: dict[str, Any] = run_benchmarks(
+        arguments.sensors,
+        arguments.devices,
+        arguments.events,
+        arguments.ticks,
+        arguments.messages,
+        arguments.seed,
+    )
+
+    encoded_results: str = json.dumps(results, indent=2)
+    if arguments.output is None:
+        print(encoded_results)
+    else:
+        with open(arguments.output, "w", encoding="utf-8") as output_file:
+            output_file.write(encoded_results + "\n")
+
+    if arguments.baseline is None:
+        return 0
+
+    with open(arguments.baseline, encoding="utf-8") as baseline_file:
+        baseline: dict[str, Any] = json.load(baseline_file)
+
+    regressions: list[str] = find_regressions(results, baseline, arguments.tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,12 +21,19 @@ turned off when the temperature is low.
 
 """
 
-from src.scheduler import Scheduler, SchedulerEvent
-from src.logger import Logger
+import argparse
+
+from src.scheduler import LogMode, Scheduler, SchedulerEvent
+from src.requirement import SensorRequirement
+from src.async_logger import AsyncLogger
+from src.event_log import EventLogWriter, dump_catalog
+from src.time_series import SensorHistoryStore
 from src.physical_quantity import PhysicalQuantity
 from src.sensor import Sensor
 from src.device import Device
+from src.device_command import DeviceCommand
 from src.dashboard import Dashboard
+from src.headless import HeadlessServer
 
 
 def prepare_basic_scheduler() -> Scheduler:
@@ -86,87 +93,87 @@ def prepare_basic_scheduler() -> Scheduler:
     # turn on lights when it is dark (brightness <= 20)
     turn_on_light_when_dark: SchedulerEvent = SchedulerEvent(
         requirements=[
-            lambda: main_sunlight_sensor.compare_sensor_reading("LE", 20),
+            SensorRequirement(main_sunlight_sensor, "LE", 20),
         ],
         actions=[
-            lambda: front_door_light.set_device_value(75),
-            lambda: balcony_light.set_device_value(75),
+            DeviceCommand(front_door_light, 75),
+            DeviceCommand(balcony_light, 75),
         ],
     )
     # dim lights when it is not dark ( 20 < brightness <= 40)
     dim_light_when_not_dark: SchedulerEvent = SchedulerEvent(
         requirements=[
-            lambda: main_sunlight_sensor.compare_sensor_reading("GT", 20),
-            lambda: main_sunlight_sensor.compare_sensor_reading("LE", 40),
+            SensorRequirement(main_sunlight_sensor, "GT", 20),
+            SensorRequirement(main_sunlight_sensor, "LE", 40),
         ],
         actions=[
-            (lambda: front_door_light.set_device_value(25)),
-            (lambda: balcony_light.set_device_value(25)),
+            DeviceCommand(front_door_light, 25),
+            DeviceCommand(balcony_light, 25),
         ],
     )
     turn_on_bathroom_light_when_motion_detected: SchedulerEvent = SchedulerEvent(
         requirements=[
-            lambda: bathroom_motion_sensor.compare_sensor_reading("GT", 80),
+            SensorRequirement(bathroom_motion_sensor, "GT", 80),
         ],
         actions=[
-            (lambda: bathroom_light.set_device_value(100)),
+            DeviceCommand(bathroom_light, 100),
         ],
     )
     turn_off_bathroom_light_after_use: SchedulerEvent = SchedulerEvent(
         requirements=[
-            lambda: bathroom_motion_sensor.compare_sensor_reading("LE", 80),
+            SensorRequirement(bathroom_motion_sensor, "LE", 80),
         ],
         actions=[
-            (lambda: bathroom_light.set_device_value(0)),
+            DeviceCommand(bathroom_light, 0),
         ],
     )
 
     # turn off lights when it is bright (brightness > 40)
     turn_off_front_light_when_bright: SchedulerEvent = SchedulerEvent(
         requirements=[
-            lambda: main_sunlight_sensor.compare_sensor_reading("GT", 40),
+            SensorRequirement(main_sunlight_sensor, "GT", 40),
         ],
         actions=[
-            (lambda: front_door_light.set_device_value(0)),
-            (lambda: balcony_light.set_device_value(0)),
+            DeviceCommand(front_door_light, 0),
+            DeviceCommand(balcony_light, 0),
         ],
     )
     # activate humidifier when humidity is low (humidity <= 40)
     activate_humidifier_when_humidity_low: SchedulerEvent = SchedulerEvent(
         requirements=[
-            (lambda: main_humidity_sensor.compare_sensor_reading("LE", 40)),
+            SensorRequirement(main_humidity_sensor, "LE", 40),
         ],
         actions=[
-            (lambda: bed_room_humidifier.set_device_value(100)),
+            DeviceCommand(bed_room_humidifier, 100),
         ],
     )
 
     # deactivate humidifier when humidity is high (humidity > 60)
     deactivate_humidifier_when_humidity_high: SchedulerEvent = SchedulerEvent(
         requirements=[
-            (lambda: main_humidity_sensor.compare_sensor_reading("GT", 60)),
+            SensorRequirement(main_humidity_sensor, "GT", 60),
         ],
         actions=[
-            (lambda: bed_room_humidifier.set_device_value(0)),
+            DeviceCommand(bed_room_humidifier, 0),
         ],
     )
 
     # lower temperature when hot (temperature > 30)
     lower_temp_when_hot: SchedulerEvent = SchedulerEvent(
         requirements=[
-            (lambda: main_thermometer.compare_sensor_reading("GT", 30)),
+            SensorRequirement(main_thermometer, "GT", 30),
         ],
         actions=[
-            (lambda: primary_air_conditioner.set_device_value(22)),
+            DeviceCommand(primary_air_conditioner, 22),
         ],
     )
     # raise temperature when cold (temperature < 20)
     raise_temp_when_cold: SchedulerEvent = SchedulerEvent(
         requirements=[
-            (lambda: main_thermometer.compare_sensor_reading("LT", 20)),
+            SensorRequirement(main_thermometer, "LT", 20),
         ],
         actions=[
-            (lambda: primary_air_conditioner.set_device_value(20)),
+            DeviceCommand(primary_air_conditioner, 20),
         ],
     )
 
@@ -211,22 +218,89 @@ def prepare_basic_scheduler() -> Scheduler:
     return scheduler
 
 
-def main() -> None:
+def main(
+    headless: bool = False,
+    port: int = 8000,
+    delta_logging: bool = False,
+    keyframe_interval_sec: float | None = None,
+) -> None:
     basic_scheduler: Scheduler = prepare_basic_scheduler()
+    if delta_logging:
+        basic_scheduler.log_mode = LogMode.DELTA
+        basic_scheduler.keyframe_interval_sec = keyframe_interval_sec
     # basic_scheduler.start_interface()
     # prepare scheduler
+    with open(
+        "logs/event_logs.catalog.json",
+        "w",
+        encoding="utf-8",
+    ) as catalog_file:
+        dump_catalog(
+            catalog_file,
+            basic_scheduler.sensors,
+            basic_scheduler.devices,
+        )
+
     with open(
         "logs/event_logs.txt",
         "w",
         encoding="utf-8",
-    ) as event_log_file:
-        basic_logger: Logger = Logger(
+    ) as event_log_file, open(
+        "logs/event_logs.bin",
+        "wb",
+    ) as binary_event_log_file:
+        with AsyncLogger(
             event_log_file,
             log_function=print,
-        )
-        my_dashboard = Dashboard(basic_scheduler, basic_logger)
-        my_dashboard.start()
+            event_log_writer=EventLogWriter(binary_event_log_file),
+        ) as basic_logger, SensorHistoryStore("logs/history") as history_store:
+            basic_scheduler.subscribe_records(basic_logger.log_records)
+            basic_scheduler.subscribe_records(history_store.append_records)
+
+            if not headless:
+                my_dashboard = Dashboard(basic_scheduler, basic_logger)
+                my_dashboard.start()
+                return
+
+            # Without a display, serve the state over HTTP
+            # and run the autopilot until interrupted.
+            with HeadlessServer(basic_scheduler, port=port):
+                basic_scheduler.start()
+                try:
+                    basic_scheduler.autopilot(basic_logger.log_texts)
+                except KeyboardInterrupt:
+                    basic_scheduler.stop()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Smart home IoT simulator.")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="serve the state over HTTP instead of opening the dashboard",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="port of the headless HTTP server",
+    )
+    parser.add_argument(
+        "--delta-logging",
+        action="store_true",
+        help="only log the sensors and devices whose value changed",
+    )
+    parser.add_argument(
+        "--keyframe-interval",
+        type=float,
+        default=None,
+        help="with delta logging, log the full state every this many seconds",
+    )
+    arguments = parser.parse_args()
+
+    main(
+        arguments.headless,
+        arguments.port,
+        arguments.delta_logging,
+        arguments.keyframe_interval,
+    )
@@ -0,0 +1,269 @@
+"""Module for asynchronous logger.
+
+The `AsyncLogger` moves file and stream output off the thread that logs.
+Producers push messages onto a bounded queue,
+and a dedicated writer thread drains the queue in batches.
+Binary event records go through the same queue,
+each list of records logged at once counting as one message.
+
+When the queue is full, the overflow policy decides what happens:
+- BLOCK: the producer waits until the writer frees up space,
+- DROP_OLDEST: the oldest queued message is discarded,
+- SAMPLE: only one in every `sample_rate` overflowing messages is kept
+  (replacing the oldest queued message), the others are discarded.
+
+If writing a batch fails, for example because the stream was closed,
+the batch is counted as failed, the error is kept in `last_error`,
+and the writer thread carries on with the next batch.
+"""
+
+from collections import deque
+from enum import StrEnum
+from threading import Condition, Thread
+from typing import Callable, TextIO
+
+from src.event_log import EventLogWriter, EventRecord
+from src.logger import Logger
+
+
+class OverflowPolicy(StrEnum):
+    """What to do with new messages when the queue is full."""
+
+    BLOCK = "BLOCK"
+    DROP_OLDEST = "DROP_OLDEST"
+    SAMPLE = "SAMPLE"
+
+
+class AsyncLogger(Logger):
+    """Logger that writes messages on a background thread.
+
+    Attributes
+    ----------
+    max_queue_size : int
+        The maximum number of messages waiting to be written.
+    overflow_policy : OverflowPolicy
+        What to do with new messages when the queue is full.
+    sample_rate : int
+        With the SAMPLE policy, keep one in every `sample_rate` overflowing messages.
+    batch_size : int
+        The maximum number of messages written by the writer thread at once.
+    """
+
+    def __init__(
+        self,
+        log_file: TextIO,
+        log_function: Callable[[str], None],
+        buffered: bool = True,
+        flush_size: int = 64 * 1024,
+        flush_interval_sec: float = 1.0,
+        max_queue_size: int = 10_000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        sample_rate: int = 10,
+        batch_size: int = 1024,
+        event_log_writer: EventLogWriter | None = None,
+    ) -> None:
+        super().__init__(
+            log_file,
+            log_function,
+            buffered=buffered,
+            flush_size=flush_size,
+            flush_interval_sec=flush_interval_sec,
+            event_log_writer=event_log_writer,
+        )
+
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+
+        # Texts, and lists of binary event records.
+        self._queue: deque[str | list[EventRecord]] = deque()
+        self._queue_condition: Condition = Condition()
+        self._in_flight_count: int = 0
+        self._closing: bool = False
+
+        self._overflow_count: int = 0
+        self._dropped_count: int = 0
+        self._written_count: int = 0
+        self._failed_count: int = 0
+        self._last_error: Exception | None = None
+        self._max_queue_depth: int = 0
+
+        self._writer: Thread = Thread(target=self._drain_queue, daemon=True)
+        self._writer.start()
+
+    def log_texts(self, loggable_texts: list[str]) -> None:
+        """Queue messages to be logged by the writer thread.
+
+        After the logger is closed, messages are logged synchronously.
+
+        Parameters
+        ----------
+        loinable_texts : list[str]
+            A list of messages to log.
+        """
+
+        with self._queue_condition:
+            if not self._closing:
+                for loggable_text in loggable_texts:
+                    self._enqueue(loggable_text)
+                self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+                self._queue_condition.notify_all()
+                return
+
+        super().log_texts(loggable_texts)
+
+    def log_records(self, records: list[EventRecord]) -> None:
+        """Queue binary event records to be logged by the writer thread.
+
+        The records count as one message.
+        After the logger is closed, records are logged synchronously.
+
+        Parameters
+        ----------
+        records : list[EventRecord]
+            A list of records to log.
+        """
+
+        if self.event_log_writer is None or not records:
+            return
+
+        with self._queue_condition:
+            if not self._closing:
+                self._enqueue(list(records))
+                self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+                self._queue_condition.notify_all()
+                return
+
+        super().log_records(records)
+
+    def flush(self) -> None:
+        """Wait until every queued message is written, then flush the file."""
+
+        with self._queue_condition:
+            self._queue_condition.wait_for(
+                lambda: not self._queue and self._in_flight_count == 0
+            )
+
+        super().flush()
+
+    def close(self) -> None:
+        """Write the remaining messages and stop the writer thread."""
+
+        with self._queue_condition:
+            self._closing = True
+            self._queue_condition.notify_all()
+
+        self._writer.join()
+        super().close()
+
+    def _enqueue(self, message: str | list[EventRecord]) -> None:
+        """Add a message to the queue, the queue condition must be held."""
+
+        queue: deque[str | list[EventRecord]] = self._queue
+        if len(queue) < self.max_queue_size:
+            queue.append(message)
+            return
+
+        match self.overflow_policy:
+            case OverflowPolicy.BLOCK:
+                self._queue_condition.wait_for(
+                    lambda: len(queue) < self.max_queue_size or self._closing
+                )
+                queue.append(message)
+
+            case OverflowPolicy.DROP_OLDEST:
+                queue.popleft()
+                queue.append(message)
+                self._dropped_count += 1
+
+            case _:
+                self._overflow_count += 1
+                self._dropped_count += 1
+                if self._overflow_count % self.sample_rate == 0:
+                    queue.popleft()
+                    queue.append(message)
+
+    def _drain_queue(self) -> None:
+        """Write queued messages in batches until the logger is closed."""
+
+        queue: deque[str | list[EventRecord]] = self._queue
+        while True:
+            with self._queue_condition:
+                self._queue_condition.wait_for(lambda: bool(queue) or self._closing)
+                if not queue:
+                    return
+
+                batch: list[str | list[EventRecord]] = [
+                    queue.popleft() for _ in range(min(len(queue), self.batch_size))
+                ]
+                self._in_flight_count = len(batch)
+                self._queue_condition.notify_all()
+
+            error: Exception | None = None
+            try:
+                self._write_batch(batch)
+            except Exception as batch_error:
+                error = batch_error
+            finally:
+                with self._queue_condition:
+                    self._in_flight_count = 0
+                    if error is None:
+                        self._written_count += len(batch)
+                    else:
+                        self._failed_count += len(batch)
+                        self._last_error = error
+                    self._queue_condition.notify_all()
+
+    def _write_batch(self, batch: list[str | list[EventRecord]]) -> None:
+        """Write a batch of messages in order, grouping consecutive texts."""
+
+        loggable_texts: list[str] = []
+        for message in batch:
+            if isinstance(message, str):
+                loggable_texts.append(message)
+                continue
+
+            if loggable_texts:
+                Logger.log_texts(self, loggable_texts)
+                loggable_texts = []
+            Logger.log_records(self, message)
+
+        if loggable_texts:
+            Logger.log_texts(self, loggable_texts)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of messages waiting to be written."""
+
+        return len(self._queue)
+
+    @property
+    def max_queue_depth(self) -> int:
+        """Return the largest number of messages that waited at once."""
+
+        return self._max_queue_depth
+
+    @property
+    def dropped_count(self) -> int:
+        """Return the number of messages discarded because the queue was full."""
+
+        return self._dropped_count
+
+    @property
+    def written_count(self) -> int:
+        """Return the number of messages written by the writer thread."""
+
+        return self._written_count
+
+    @property
+    def failed_count(self) -> int:
+        """Return the number of messages in batches that failed to be written."""
+
+        return self._failed_count
+
+    @property
+    def last_error(self) -> Exception | None:
+        """Return the error of the last batch that failed to be written."""
+
+        return self._last_error
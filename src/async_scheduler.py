@@ -0,0 +1,167 @@
+"""Scheduler driven by asyncio.
+
+The `AsyncScheduler` has the same registry API as the `Scheduler`,
+but its tick awaits the sensor drivers of the due sensors concurrently,
+so sensors with real I/O latency (serial lines, sockets) overlap
+instead of adding up.
+It can be driven from an existing event loop:
+
+```python
+scheduler.start()
+asyncio.create_task(scheduler.autopilot_async(dispatch_event))
+```
+
+Sensors without a driver keep being updated by the batched random walk.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable
+
+from src.clock import WALL_CLOCK, Clock
+from src.sampling_schedule import SamplingGroup
+from src.scheduler import Scheduler
+from src.sensor import Sensor
+
+
+class AsyncSensorDriver(ABC):
+    """Base class for drivers that read sensors asynchronously."""
+
+    @abstractmethod
+    async def read(self, sensor: Sensor) -> int:
+        """Read the current value of the sensor."""
+
+
+class SimulatedLatencyDriver(AsyncSensorDriver):
+    """Driver that simulates a slow device, such as a serial or socket sensor.
+
+    Each read waits for `latency_sec` and returns a randomized reading.
+    """
+
+    def __init__(self, latency_sec: float) -> None:
+        self.latency_sec = latency_sec
+
+    async def read(self, sensor: Sensor) -> int:
+        await asyncio.sleep(self.latency_sec)
+
+        return sensor.sample_next_reading()
+
+
+class AsyncScheduler(Scheduler):
+    """Scheduler whose ticks await sensor drivers concurrently.
+
+    The synchronous `manual_update` and `autopilot` still work,
+    but they do not read the drivers,
+    so driven sensors keep their last reading.
+    """
+
+    def __init__(
+        self,
+        update_interval_sec: float = 5,
+        clock: Clock = WALL_CLOCK,
+    ) -> None:
+        super().__init__(update_interval_sec, clock)
+
+        self._sensor_drivers: dict[int, AsyncSensorDriver] = {}
+
+    def register_sensors(
+        self,
+        sensors: list[Sensor],
+        driver: AsyncSensorDriver | None = None,
+    ) -> None:
+        """Register sensors to the scheduler.
+
+        If a driver is given, the readings of the sensors come from it
+        instead of the random walk.
+        """
+
+        super().register_sensors(sensors)
+
+        if driver is None:
+            return
+
+        for sensor in sensors:
+            self._sensor_drivers[sensor.uuid] = driver
+            self._sensor_fleet.set_external(sensor._fleet_index)
+
+    async def manual_update_async(
+        self,
+        dispatch_event: Callable[[list[str]], None] | None = None,
+    ) -> None:
+        """Read every sensor driver, then update the sensors and evaluate the events."""
+
+        await self._read_sensor_drivers(None)
+
+        self._run_tick(dispatch_event)
+
+    async def autopilot_async(
+        self,
+        dispatch_event: Callable[[list[str]], None] | None,
+    ) -> None:
+        """Run the scheduler until it is stopped, without blocking the event loop."""
+
+        while self._running:
+            await self.clock.sleep_async(
+                await self._run_due_groups_async(dispatch_event)
+            )
+
+    async def simulate_async(
+        self,
+        step_count: int,
+        dispatch_event: Callable[[list[str]], None] | None = None,
+    ) -> None:
+        """Run a fixed number of autopilot steps."""
+
+        for _ in range(step_count):
+            await self.clock.sleep_async(
+                await self._run_due_groups_async(dispatch_event)
+            )
+
+    async def _run_due_groups_async(
+        self,
+        dispatch_event: Callable[[list[str]], None] | None,
+    ) -> float:
+        """Run the sampling groups that are due, awaiting their sensor drivers.
+
+        Returns
+        -------
+        float
+            The number of seconds until the next group is due.
+        """
+
+        now: float = self.clock.now().timestamp()
+
+        due_groups: list[SamplingGroup] | None = self._pop_due_groups(now)
+        if due_groups is None or due_groups:
+            await self._read_sensor_drivers(due_groups)
+            self._run_tick(dispatch_event, due_groups)
+
+        return self._delay_until_next_group(now)
+
+    async def _read_sensor_drivers(
+        self,
+        due_groups: list[SamplingGroup] | None,
+    ) -> None:
+        """Read the driven sensors of the due groups concurrently."""
+
+        if not self._sensor_drivers:
+            return
+
+        sensors: Iterable[Sensor]
+        if due_groups is None:
+            sensors = self.sensors
+        else:
+            sensors = [sensor for group in due_groups for sensor in group.sensors]
+
+        driven_sensors: list[tuple[Sensor, AsyncSensorDriver]] = [
+            (sensor, self._sensor_drivers[sensor.uuid])
+            for sensor in sensors
+            if sensor.uuid in self._sensor_drivers
+        ]
+
+        readings: list[int] = await asyncio.gather(
+            *(driver.read(sensor) for sensor, driver in driven_sensors)
+        )
+
+        for (sensor, _), reading in zip(driven_sensors, readings):
+            self._sensor_fleet.set_reading(sensor._fleet_index, reading)
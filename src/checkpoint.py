@@ -0,0 +1,418 @@
+"""Binary checkpoints of the full state of a simulation.
+
+A checkpoint holds what changes while a scheduler runs:
+the readings of the sensor fleet, the values of the devices,
+the uuid trackers of sensors and devices, the state of the random generator
+of the fleet, the simulated time of a `VirtualClock`,
+and the state of the events (satisfied hysteresis requirements and gates).
+
+What does not change, such as names, ranges and rules, is not saved.
+A checkpoint is restored into a scheduler built the same way
+as the one it was captured from, typically by the same factory function,
+so a long soak test can be resumed, or many scenarios forked
+from a common warm state.
+
+The file starts with a fixed header, followed by raw native arrays,
+each aligned to 8 bytes:
+
+- header: magic, version, uuid trackers, clock timestamp, random generator
+  version and gaussian, then the size in bytes of every section,
+- sections: see `_SECTION_NAMES`.
+
+Capturing a checkpoint only copies arrays, so the scheduler pauses briefly.
+The `CheckpointWriter` then writes it on a background thread,
+to a temporary file that replaces the previous checkpoint once complete.
+Loading memory maps the file and copies each section straight into the
+arrays of the scheduler.
+"""
+
+from __future__ import annotations
+
+import os
+from array import array
+from collections import deque
+from datetime import datetime, timezone
+from math import isnan, nan
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from struct import Struct
+from threading import Condition, Thread
+from types import TracebackType
+from typing import BinaryIO, NamedTuple, Self
+
+from src.clock import VirtualClock
+from src.device import Device
+from src.scheduler import Scheduler
+from src.sensor import Sensor
+from src.sensor_fleet import SensorFleet
+
+_MAGIC: bytes = b"SHCK"
+_VERSION: int = 1
+
+# The sections of a checkpoint file, in order.
+_SECTION_NAMES: tuple[str, ...] = (
+    "sensor_kinds",
+    "sensor_live",
+    "sensor_readings",
+    "device_values",
+    "satisfied_requirements",
+    "gate_levels",
+    "gate_armed",
+    "gate_met_since",
+    "gate_ready_at",
+    "random_state",
+    "pending_uniforms",
+)
+
+# Native byte order, matching the arrays:
+# magic, version, sensor and device uuid trackers,
+# clock timestamp (NaN without a virtual clock),
+# random generator version and gaussian (NaN if None),
+# then the size in bytes of every section.
+_HEADER_STRUCT: Struct = Struct("=4sIqqdqd" + "q" * len(_SECTION_NAMES))
+
+
+class Checkpoint(NamedTuple):
+    """State of a simulation, as native bytes.
+
+    Sections are `bytes` once captured,
+    and `memoryview`s into the mapped file while being loaded.
+    """
+
+    sensor_uuid_tracker: int
+    device_uuid_tracker: int
+    clock_timestamp: float | None
+    random_version: int
+    random_gaussian: float | None
+    # One byte per fleet slot.
+    sensor_kinds: bytes | memoryview
+    sensor_live: bytes | memoryview
+    # One int64 per fleet slot.
+    sensor_readings: bytes | memoryview
+    # One int64 per device, in registration order.
+    device_values: bytes | memoryview
+    # One byte per compiled requirement.
+    satisfied_requirements: bytes | memoryview
+    # One byte, then one double, per gated event.
+    gate_levels: bytes | memoryview
+    gate_armed: bytes | memoryview
+    gate_met_since: bytes | memoryview
+    gate_ready_at: bytes | memoryview
+    # The uint32 words of the Mersenne Twister of the fleet.
+    random_state: bytes | memoryview
+    # The doubles the fleet generated in advance and did not use yet.
+    pending_uniforms: bytes | memoryview
+
+
+def capture_checkpoint(scheduler: Scheduler) -> Checkpoint:
+    """Copy the state of a scheduler.
+
+    This should be called between ticks,
+    for example from a record listener or while the scheduler is stopped.
+    """
+
+    fleet: SensorFleet = scheduler.sensor_fleet
+    generator_state, pending_uniforms = fleet.random_state()
+    random_version, random_state, random_gaussian = generator_state
+    (
+        satisfied_requirements,
+        gate_levels,
+        gate_armed,
+        gate_met_since,
+        gate_ready_at,
+    ) = scheduler.event_state()
+
+    return Checkpoint(
+        sensor_uuid_tracker=Sensor.next_uuid(),
+        device_uuid_tracker=Device.next_uuid(),
+        clock_timestamp=(
+            scheduler.clock.now().timestamp()
+            if isinstance(scheduler.clock, VirtualClock)
+            else None
+        ),
+        random_version=random_version,
+        random_gaussian=random_gaussian,
+        sensor_kinds=fleet.kinds.tobytes(),
+        sensor_live=bytes(fleet.live),
+        sensor_readings=fleet.readings.tobytes(),
+        device_values=array(
+            "q", [device.device_value for device in scheduler.devices]
+        ).tobytes(),
+        satisfied_requirements=satisfied_requirements,
+        gate_levels=gate_levels,
+        gate_armed=gate_armed,
+        gate_met_since=gate_met_since,
+        gate_ready_at=gate_ready_at,
+        random_state=array("I", random_state).tobytes(),
+        pending_uniforms=array("d", pending_uniforms).tobytes(),
+    )
+
+
+def restore_checkpoint(scheduler: Scheduler, checkpoint: Checkpoint) -> None:
+    """Restore a checkpoint into a scheduler built like the captured one.
+
+    The uuid trackers only move forward, so that sensors and devices
+    created afterwards never reuse a uuid.
+    The sampling schedule starts over from the restored time,
+    and every sensor counts as changed at the next tick.
+
+    Raises
+    ------
+    ValueError
+        If the scheduler does not have the same sensors, devices and events.
+    """
+
+    fleet: SensorFleet = scheduler.sensor_fleet
+    satisfied_requirements, gate_levels, *_ = scheduler.event_state()
+    if (
+        checkpoint.sensor_kinds != fleet.kinds.tobytes()
+        or checkpoint.sensor_live != fleet.live
+        or len(checkpoint.device_values) != 8 * len(scheduler.devices)
+        or len(checkpoint.satisfied_requirements) != len(satisfied_requirements)
+        or len(checkpoint.gate_levels) != len(gate_levels)
+    ):
+        raise ValueError("The checkpoint does not match the scheduler.")
+
+    fleet.load_readings(checkpoint.sensor_readings)
+
+    device_values: array[int] = array("q")
+    device_values.frombytes(checkpoint.device_values)
+    scheduler.restore_device_values(device_values)
+
+    scheduler.restore_event_state(
+        checkpoint.satisfied_requirements,
+        checkpoint.gate_levels,
+        checkpoint.gate_armed,
+        checkpoint.gate_met_since,
+        checkpoint.gate_ready_at,
+    )
+
+    random_state: array[int] = array("I")
+    random_state.frombytes(checkpoint.random_state)
+    pending_uniforms: array[float] = array("d")
+    pending_uniforms.frombytes(checkpoint.pending_uniforms)
+    fleet.restore_random_state(
+        (checkpoint.random_version, tuple(random_state), checkpoint.random_gaussian),
+        pending_uniforms,
+    )
+
+    Sensor.reserve_uuids(checkpoint.sensor_uuid_tracker)
+    Device.reserve_uuids(checkpoint.device_uuid_tracker)
+
+    if checkpoint.clock_timestamp is not None and isinstance(
+        scheduler.clock, VirtualClock
+    ):
+        scheduler.clock.set_now(
+            datetime.fromtimestamp(checkpoint.clock_timestamp, timezone.utc)
+        )
+
+    scheduler.resume_from_restored_state()
+
+
+def write_checkpoint(checkpoint: Checkpoint, file_path: str | Path) -> None:
+    """Write a checkpoint to a file.
+
+    The checkpoint is written to a temporary file next to it first,
+    so an interrupted write never leaves a truncated checkpoint behind.
+    """
+
+    file_path = Path(file_path)
+    temporary_path: Path = file_path.with_name(file_path.name + ".tmp")
+
+    sections: list[bytes | memoryview] = [
+        getattr(checkpoint, section_name) for section_name in _SECTION_NAMES
+    ]
+
+    with open(temporary_path, "wb") as checkpoint_file:
+        checkpoint_file.write(
+            _HEADER_STRUCT.pack(
+                _MAGIC,
+                _VERSION,
+                checkpoint.sensor_uuid_tracker,
+                checkpoint.device_uuid_tracker,
+                (
+                    nan
+                    if checkpoint.clock_timestamp is None
+                    else checkpoint.clock_timestamp
+                ),
+                checkpoint.random_version,
+                (
+                    nan
+                    if checkpoint.random_gaussian is None
+                    else checkpoint.random_gaussian
+                ),
+                *(len(section) for section in sections),
+            )
+        )
+        for section in sections:
+            _write_section(checkpoint_file, section)
+
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+
+    os.replace(temporary_path, file_path)
+
+
+def load_checkpoint(scheduler: Scheduler, file_path: str | Path) -> None:
+    """Restore a checkpoint file into a scheduler, see `restore_checkpoint`.
+
+    The file is memory mapped, and each section is copied
+    straight into the scheduler without being parsed.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a checkpoint, or does not match the scheduler.
+    """
+
+    with open(file_path, "rb") as checkpoint_file, mmap(
+        checkpoint_file.fileno(),
+        0,
+        access=ACCESS_READ,
+    ) as mapped_file:
+        view: memoryview = memoryview(mapped_file)
+        try:
+            checkpoint: Checkpoint = _parse_checkpoint(view)
+        finally:
+            view.release()
+
+        try:
+            restore_checkpoint(scheduler, checkpoint)
+        finally:
+            # The views must be released before the file is unmapped.
+            for section_name in _SECTION_NAMES:
+                section: bytes | memoryview = getattr(checkpoint, section_name)
+                if isinstance(section, memoryview):
+                    section.release()
+
+
+def _write_section(checkpoint_file: BinaryIO, section: bytes | memoryview) -> None:
+    """Write a section, padded to a multiple of 8 bytes."""
+
+    checkpoint_file.write(section)
+    checkpoint_file.write(bytes(-len(section) % 8))
+
+
+def _parse_checkpoint(view: memoryview) -> Checkpoint:
+    """Split a checkpoint file into views of its sections."""
+
+    if len(view) < _HEADER_STRUCT.size:
+        raise ValueError("The file is not a checkpoint.")
+
+    (
+        magic,
+        version,
+        sensor_uuid_tracker,
+        device_uuid_tracker,
+        clock_timestamp,
+        random_version,
+        random_gaussian,
+        *section_sizes,
+    ) = _HEADER_STRUCT.unpack_from(view)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("The file is not a checkpoint.")
+
+    sections: list[memoryview] = []
+    offset: int = _HEADER_STRUCT.size
+    for section_size in section_sizes:
+        if offset + section_size > len(view):
+            raise ValueError("The checkpoint is truncated.")
+        sections.append(view[offset : offset + section_size])
+        offset += section_size + (-section_size % 8)
+
+    return Checkpoint(
+        sensor_uuid_tracker,
+        device_uuid_tracker,
+        None if isnan(clock_timestamp) else clock_timestamp,
+        random_version,
+        None if isnan(random_gaussian) else random_gaussian,
+        *sections,
+    )
+
+
+class CheckpointWriter:
+    """Writer of checkpoints on a background thread.
+
+    `save` only pauses the caller while the state is copied.
+    If checkpoints are saved faster than they are written,
+    only the latest pending checkpoint of each file is kept.
+    """
+
+    def __init__(self) -> None:
+        self._pending: deque[Path] = deque()
+        self._checkpoints: dict[Path, Checkpoint] = {}
+        self._condition: Condition = Condition()
+        self._writing: bool = False
+        self._closing: bool = False
+        self._written_count: int = 0
+
+        self._writer: Thread = Thread(target=self._write_pending, daemon=True)
+        self._writer.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def save(self, scheduler: Scheduler, file_path: str | Path) -> None:
+        """Capture the state of a scheduler, and write it in the background."""
+
+        checkpoint: Checkpoint = capture_checkpoint(scheduler)
+        file_path = Path(file_path)
+
+        with self._condition:
+            if self._closing:
+                raise ValueError("The checkpoint writer is closed.")
+
+            if file_path not in self._checkpoints:
+                self._pending.append(file_path)
+            self._checkpoints[file_path] = checkpoint
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Wait until every saved checkpoint is written."""
+
+        with self._condition:
+            self._condition.wait_for(lambda: not self._pending and not self._writing)
+
+    def close(self) -> None:
+        """Write the remaining checkpoints and stop the writer thread."""
+
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+
+        self._writer.join()
+
+    def _write_pending(self) -> None:
+        """Write pending checkpoints until the writer is closed."""
+
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: bool(self._pending) or self._closing)
+                if not self._pending:
+                    return
+
+                file_path: Path = self._pending.popleft()
+                checkpoint: Checkpoint = self._checkpoints.pop(file_path)
+                self._writing = True
+
+            try:
+                write_checkpoint(checkpoint, file_path)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._written_count += 1
+                    self._condition.notify_all()
+
+    @property
+    def written_count(self) -> int:
+        """Return the number of checkpoints written."""
+
+        return self._written_count
@@ -0,0 +1,88 @@
+"""Clocks used to timestamp and pace the simulation.
+
+The `Clock` follows the wall clock, like the rest of the simulator used to.
+
+The `VirtualClock` keeps its own simulated time.
+Sleeping on it advances the simulated time instead of waiting,
+so a scheduler driven by it runs ticks as fast as the CPU allows.
+Optionally, a speed-up factor makes it wait a fraction of the real time,
+for example a speed-up of 60 simulates one minute per second.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from time import sleep
+
+
+class Clock:
+    """Wall clock in UTC."""
+
+    def now(self) -> datetime:
+        """Return the current time."""
+
+        return datetime.now(timezone.utc)
+
+    def sleep(self, seconds: float) -> None:
+        """Wait for the given number of seconds."""
+
+        sleep(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        """Wait for the given number of seconds without blocking the event loop."""
+
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Simulated clock that advances only when slept on.
+
+    Attributes
+    ----------
+    speedup : float | None
+        How many simulated seconds pass per real second while sleeping.
+        If None, sleeping returns immediately.
+    """
+
+    def __init__(
+        self,
+        start: datetime | None = None,
+        speedup: float | None = None,
+    ) -> None:
+        if start is None:
+            start = datetime.now(timezone.utc)
+
+        self._now: datetime = start
+        self.speedup = speedup
+
+    def now(self) -> datetime:
+        """Return the simulated time."""
+
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the simulated time, waiting only if a speed-up is set."""
+
+        self.advance(seconds)
+
+        if self.speedup is not None:
+            sleep(seconds / self.speedup)
+
+    async def sleep_async(self, seconds: float) -> None:
+        """Advance the simulated time, yielding to the event loop."""
+
+        self.advance(seconds)
+
+        await asyncio.sleep(0 if self.speedup is None else seconds / self.speedup)
+
+    def advance(self, seconds: float) -> None:
+        """Advance the simulated time without waiting."""
+
+        self._now += timedelta(seconds=seconds)
+
+    def set_now(self, now: datetime) -> None:
+        """Jump to the given simulated time, for example to resume a simulation."""
+
+        self._now = now
+
+
+WALL_CLOCK: Clock = Clock()
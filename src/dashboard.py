@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from typing import Callable
 from threading import Thread
 
 import tkinter as tk
@@ -8,66 +7,7 @@ import tkinter as tk
 from src.scheduler import Scheduler
 from src.logger import Logger
 from src.device import Device
-from src.sensor import Sensor
-
-
-def _prepare_sensor_status(
-    window: tk.Tk,
-    sensors: list[Sensor],
-) -> dict[int, tk.StringVar]:
-    record_widgets: dict[int, tk.StringVar] = {}
-    for sensor in sensors:
-        sensor_reading_label_text: tk.StringVar = tk.StringVar(
-            value=sensor.get_loggable_text(False),
-        )
-        sensor_reading_label = tk.Label(
-            window,
-            textvariable=sensor_reading_label_text,
-        )
-        sensor_reading_label.pack()
-
-        record_widgets[sensor.uuid] = sensor_reading_label_text
-
-    return record_widgets
-
-
-def _prepare_device_controls(
-    window: tk.Tk,
-    devices: list[Device],
-) -> dict[int, tuple[tk.StringVar, tk.DoubleVar, tk.Scale]]:
-    record_widgets: dict[int, tuple[tk.StringVar, tk.DoubleVar, tk.Scale]] = {}
-
-    for device in devices:
-        device_value_label_text = tk.StringVar(
-            value=device.get_loggable_text(False),
-        )
-        device_value_label = tk.Label(
-            window,
-            textvariable=device_value_label_text,
-        )
-        device_value_label.pack()
-
-        range_min, range_max = device.device_value_range
-
-        device_slider_value = tk.DoubleVar(
-            value=device.device_value,
-        )
-        device_slider = tk.Scale(
-            window,
-            variable=device_slider_value,
-            from_=range_min,
-            to=range_max,
-            orient=tk.HORIZONTAL,
-        )
-        device_slider.pack()
-
-        record_widgets[device.uuid] = (
-            device_value_label_text,
-            device_slider_value,
-            device_slider,
-        )
-
-    return record_widgets
+from src.inventory_table import InventoryTable
 
 
 class Dashboard(tk.Tk):
@@ -84,42 +24,52 @@ class Dashboard(tk.Tk):
         The scheduler is responsible for updating the sensors and devices.
     logger : Logger
         The logger is responsible for logging the events.
+    max_refresh_rate : float
+        The maximum number of times per second the widgets are refreshed.
+    row_count : int
+        The number of visible rows of the sensor and device tables.
     """
 
-    def __init__(self, scheduler: Scheduler, logger: Logger) -> None:
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        logger: Logger,
+        max_refresh_rate: float = 30,
+        row_count: int = 10,
+    ) -> None:
         super().__init__()
         self.scheduler: Scheduler = scheduler
         self.logger: Logger = logger
+        self.max_refresh_rate: float = max_refresh_rate
 
         # Prepare the thread for autopilot mode.
         # We can also control the thread from the dashboard
         # by calling start/stop method of the scheduler.
+        # The autopilot thread only logs, it never touches the widgets,
+        # since Tk may only be called from the main loop.
         self.__thread: Thread = Thread(
             target=self.scheduler.autopilot,
-            args=(self.__event_update_all_dashboard_widgets,),
+            args=(self.logger.log_texts,),
             daemon=True,
         )
 
-        # Prepare and keep track of the widgets so that we can update them later.
-        # We only need to update labels for sensors.
-        # But for devices, we need to update the slider and the label
-        self.__record_widget_sensor = _prepare_sensor_status(self, scheduler.sensors)
-        self.__record_widget_device = _prepare_device_controls(self, scheduler.devices)
-
-        # Bind the slider event to the slider widget
-        for uuid, (_, _, slider) in self.__record_widget_device.items():
-            # Defining a function inside a loop is not a good idea.
-            # But we need to pass the uuid to the function.
-
-            def _event_wrapper(
-                device_uuid: int,
-            ) -> Callable[[tk.Event[tk.Scale]], None]:
-                return lambda e: self.__event_slider_change(
-                    device_uuid,
-                    e,
-                )
+        # Prepare the tables of sensors and devices.
+        # They only create widgets for the visible rows,
+        # and the device table has a slider to control each device.
+        self.__sensor_table: InventoryTable = InventoryTable(
+            self,
+            list(scheduler.sensors),
+            row_count,
+        )
+        self.__sensor_table.pack(fill=tk.BOTH, expand=True)
 
-            slider.bind("<ButtonRelease-1>", _event_wrapper(uuid))
+        self.__device_table: InventoryTable = InventoryTable(
+            self,
+            list(scheduler.devices),
+            row_count,
+            on_slider_release=self.__event_slider_change,
+        )
+        self.__device_table.pack(fill=tk.BOTH, expand=True)
 
         # Prepare the dashboard control buttons and a label.
         # The label is used to display the current control status.
@@ -146,35 +96,32 @@ class Dashboard(tk.Tk):
         )
         self.__button_automatic_control.pack()
 
-    def __event_update_all_dashboard_widgets(
-        self,
-        loggable_texts: list[str],
-    ) -> None:
-        """Update the sensors and evaluate the events.
+        # Start polling the scheduler for changes from the main loop.
+        self.__event_refresh_changed_widgets()
 
-        Also update the dashboard display to reflect the changes.
+    def __event_refresh_changed_widgets(self) -> None:
+        """Update the widgets of the sensors and devices that changed.
 
-        This event is fired when the dashboard is manually updated in manual mode.
-        In autopilot mode, this event is fired by the autopilot thread
-        after the sensors and devices are updated.
+        This event runs on the Tk main loop and reschedules itself,
+        so changes made by the autopilot thread between two refreshes
+        are coalesced into one update per widget,
+        at no more than `max_refresh_rate` refreshes per second.
         """
 
-        self.logger.log_texts(loggable_texts)
+        self.__update_changed_widgets()
+
+        self.after(
+            max(1, round(1000 / self.max_refresh_rate)),
+            self.__event_refresh_changed_widgets,
+        )
 
-        for uuid, label_text in self.__record_widget_sensor.items():
-            for sensor in self.scheduler.sensors:
-                if sensor.uuid != uuid:
-                    continue
-                label_text.set(sensor.get_loggable_text(False))
+    def __update_changed_widgets(self) -> None:
+        """Update the widgets of the sensors and devices that changed."""
 
-        for uuid, item in self.__record_widget_device.items():
-            (label_text, slider_value, _) = item
+        changed_uuids: set[int] = self.scheduler.pop_changed_uuids()
 
-            for device in self.scheduler.devices:
-                if device.uuid != uuid:
-                    continue
-                label_text.set(device.get_loggable_text(False))
-                slider_value.set(device.device_value)
+        self.__sensor_table.refresh(changed_uuids)
+        self.__device_table.refresh(changed_uuids)
 
     def __event_disable_autopilot(self) -> None:
         """Disable the autopilot and enable the manual control.
@@ -201,16 +148,17 @@ class Dashboard(tk.Tk):
         This event fires three events:
         1. fires the __event_disable_autopilot event to disable the autopilot.
         2. trigger the scheduler to update the sensors and evaluate the events.
-        3. fires the __event_update_all_dashboard_widgets event to update the dashboard display.
+        3. update the widgets that changed, without waiting for the next refresh.
         """
 
         self.__event_disable_autopilot()
-        self.scheduler.manual_update(self.__event_update_all_dashboard_widgets)
+        self.scheduler.manual_update(self.logger.log_texts)
+        self.__update_changed_widgets()
 
     def __event_slider_change(
         self,
-        device_uuid: int,
-        _: tk.Event[tk.Scale],
+        device: Device,
+        value: int,
     ) -> None:
         """Update the device value when the slider is changed.
 
@@ -224,22 +172,9 @@ class Dashboard(tk.Tk):
 
         self.__event_disable_autopilot()
 
-        for uuid, (
-            string_label,
-            slider_value,
-            __,
-        ) in self.__record_widget_device.items():
-            if device_uuid != uuid:
-                continue
-
-            for device in self.scheduler.devices:
-                if device.uuid != uuid:
-                    continue
-                loggable_text: str = device.set_device_value(
-                    int(slider_value.get()),
-                )
-                self.logger.log_text(loggable_text)
-                string_label.set(device.get_loggable_text(False))
+        loggable_text: str = device.set_device_value(value)
+        self.logger.log_text(loggable_text)
+        self.__device_table.refresh([device.uuid])
 
     def __event_dashboard_autopilot(self) -> None:
         """Start the autopilot mode.
@@ -1,7 +1,12 @@
 """Module for base class for smart devices."""
 
-from datetime import datetime, timezone
+from __future__ import annotations
 
+from datetime import datetime
+from sys import intern
+from typing import Callable
+
+from src.clock import WALL_CLOCK, Clock
 from src.physical_quantity import PhysicalQuantity
 
 
@@ -20,8 +25,24 @@ class Device:
         The range of values that the smart device can take.
     device_value : int
         The current value of the smart device.
+    clock : Clock
+        The clock used for timestamps, set by the scheduler the device is registered to.
+
+    Devices have no instance `__dict__`, and their names are interned,
+    since scenarios may hold a very large number of them.
     """
 
+    __slots__ = (
+        "_name",
+        "clock",
+        "_device_kind",
+        "_device_value_range",
+        "_device_value",
+        "_uuid",
+        "_value_listener",
+        "_loggable_text",
+    )
+
     _uuid_tracker: int = 100001
 
     def __init__(
@@ -30,7 +51,7 @@ class Device:
         device_kind: PhysicalQuantity,
         device_value_range: tuple[int, int],
     ) -> None:
-        self.name = name
+        self._name: str = intern(name)
         self._device_kind = device_kind
         self._device_value_range = device_value_range
 
@@ -40,19 +61,54 @@ class Device:
         self._uuid = self.__class__._uuid_tracker
         self.__class__._uuid_tracker += 1
 
-    def get_loggable_text(self, include_timestamp: bool = True) -> str:
-        """Return a string representation of the current state of the smart device."""
+        # Set by the scheduler the device is registered to,
+        # so that it can keep track of which devices were written.
+        self._value_listener: Callable[[Device], None] | None = None
+
+        self.clock: Clock = WALL_CLOCK
+
+        # The loggable text is reset when the value or the name changes.
+        self._loggable_text: str | None = None
+
+    def get_loggable_text(
+        self,
+        include_timestamp: bool = True,
+        timestamp: datetime | None = None,
+    ) -> str:
+        """Return a string representation of the current state of the smart device.
+
+        If a timestamp is given, it is used instead of the clock of the device,
+        so that many devices can share one timestamp.
+        The text is cached until the value changes.
+        """
 
-        loggable_text: str = (
-            f"{self.name}: current {self._device_kind} is {self._device_value}."
-        )
+        if self._loggable_text is None:
+            self._loggable_text = (
+                f"{self._name}: current {self._device_kind} is {self._device_value}."
+            )
 
         if not include_timestamp:
-            return loggable_text
+            return self._loggable_text
+
+        if timestamp is None:
+            timestamp = self.clock.now()
+
+        return f"[{timestamp}] {self._loggable_text}"
+
+    @property
+    def name(self) -> str:
+        """Get the name of the smart device."""
 
-        timestamp: datetime = datetime.now(timezone.utc)
+        return self._name
 
-        return f"[{timestamp}] {loggable_text}"
+    @name.setter
+    def name(self, name: str) -> None:
+        """Set the name of the smart device, which is interned."""
+
+        name = intern(name)
+        if name is not self._name:
+            self._name = name
+            self._loggable_text = None
 
     @property
     def uuid(self) -> int:
@@ -60,6 +116,21 @@ class Device:
 
         return self._uuid
 
+    @classmethod
+    def next_uuid(cls) -> int:
+        """Return the uuid the next smart device will get."""
+
+        return cls._uuid_tracker
+
+    @classmethod
+    def reserve_uuids(cls, next_uuid: int) -> None:
+        """Make smart devices created from now on get uuids from `next_uuid` on.
+
+        The uuids never move backwards, so they stay unique.
+        """
+
+        cls._uuid_tracker = max(cls._uuid_tracker, next_uuid)
+
     @property
     def device_value_range(self) -> tuple[int, int]:
         """Return the range of the smart device."""
@@ -100,10 +171,25 @@ class Device:
         value = min(value, range_max)
         value = max(value, range_min)
 
-        self._device_value = value
+        if value != self._device_value:
+            self._device_value = value
+            self._loggable_text = None
+
+        if self._value_listener is not None:
+            self._value_listener(self)
 
         return self.get_loggable_text(include_timestamp)
 
+    def restore_device_value(self, value: int) -> None:
+        """Set the current value of the smart device from a saved state.
+
+        Unlike `set_device_value`, the scheduler is not told about a write.
+        """
+
+        if value != self._device_value:
+            self._device_value = value
+            self._loggable_text = None
+
 
 BASIC_SMART_LIGHT = Device(
     "Basic smart light",
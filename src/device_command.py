@@ -0,0 +1,170 @@
+"""Declarative device commands for scheduler events.
+
+An action written as a lambda is opaque to the scheduler.
+A `DeviceCommand` describes the same write as data (device and value),
+so that when several events write the same device in one tick,
+the scheduler can merge their commands and write each device only once,
+with a single clamp, log text and event record.
+
+How conflicting commands are merged is decided by a `CoalescePolicy`.
+Commands are applied at the end of the tick, after the other actions,
+but an action that writes a device overrides the commands
+added for it before, so that the last declared write still wins.
+
+A `DeviceCommand` is still callable,
+so it can be used anywhere a `Callable[[], str]` action is expected.
+"""
+
+from enum import StrEnum
+from time import perf_counter_ns
+
+from src.device import Device
+
+
+class CoalescePolicy(StrEnum):
+    """How conflicting commands to one device in one tick are merged.
+
+    - LAST_WRITER: the command of the last triggered event wins.
+    - PRIORITY: the command of the event with the highest priority wins,
+      ties are broken by the last writer.
+    - MAX: the highest value wins.
+    - MIN: the lowest value wins.
+    """
+
+    LAST_WRITER = "LAST_WRITER"
+    PRIORITY = "PRIORITY"
+    MAX = "MAX"
+    MIN = "MIN"
+
+
+class DeviceCommand:
+    """Action that sets a smart device to a value.
+
+    Attributes
+    ----------
+    device : Device
+        The smart device to write.
+    value : int
+        The value to write, clamped to the range of the device when applied.
+    """
+
+    __slots__ = ("_device", "_value")
+
+    def __init__(self, device: Device, value: int) -> None:
+        self._device = device
+        self._value = value
+
+    def __call__(self) -> str:
+        """Write the value to the device right away."""
+
+        return self._device.set_device_value(self._value)
+
+    def __repr__(self) -> str:
+        return f"DeviceCommand(device_uuid={self._device.uuid}, value={self._value})"
+
+    @property
+    def device(self) -> Device:
+        """Get the smart device to write."""
+
+        return self._device
+
+    @property
+    def value(self) -> int:
+        """Get the value to write."""
+
+        return self._value
+
+
+class CommandBuffer:
+    """Device commands of one tick, merged per device as they are added.
+
+    Only the winning (value, priority, event index) of each device is kept,
+    so the buffer holds at most one entry per written device.
+    """
+
+    def __init__(self, policy: CoalescePolicy = CoalescePolicy.LAST_WRITER) -> None:
+        self.policy = policy
+
+        self._pending: dict[Device, tuple[int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, device: Device) -> bool:
+        return device in self._pending
+
+    def add(
+        self,
+        command: DeviceCommand,
+        priority: int = 0,
+        event_index: int = -1,
+    ) -> None:
+        """Merge a command with the pending command of the same device.
+
+        `event_index` identifies the event that issued the command,
+        to attribute the duration of the write to it.
+        """
+
+        device: Device = command.device
+        value: int = command.value
+
+        pending: tuple[int, int, int] | None = self._pending.get(device)
+        if pending is not None:
+            pending_value, pending_priority, _ = pending
+            match self.policy:
+                case CoalescePolicy.PRIORITY:
+                    if priority < pending_priority:
+                        return
+                case CoalescePolicy.MAX:
+                    if value <= pending_value:
+                        return
+                case CoalescePolicy.MIN:
+                    if value >= pending_value:
+                        return
+
+        self._pending[device] = (value, priority, event_index)
+
+    def discard(self, device: Device) -> None:
+        """Drop the pending command of a device, if any."""
+
+        self._pending.pop(device, None)
+
+    def apply(
+        self,
+        changes_only: bool = False,
+        write_durations: dict[int, int] | None = None,
+    ) -> list[str]:
+        """Write every pending command and return one log per device.
+
+        Devices are written in the order they were first commanded,
+        and the buffer is emptied.
+        If `changes_only` is True, devices whose value did not change
+        are still written, but not logged.
+        If `write_durations` is given, the duration of each write,
+        in nanoseconds, is added to the entry of the event of its command.
+        """
+
+        pending: dict[Device, tuple[int, int, int]] = self._pending
+        self._pending = {}
+
+        if not changes_only and write_durations is None:
+            return [
+                device.set_device_value(value)
+                for device, (value, _, _) in pending.items()
+            ]
+
+        device_logs: list[str] = []
+        for device, (value, _, event_index) in pending.items():
+            previous_value: int = device.device_value
+            if write_durations is None:
+                device_log: str = device.set_device_value(value)
+            else:
+                started_at: int = perf_counter_ns()
+                device_log = device.set_device_value(value)
+                write_durations[event_index] = (
+                    write_durations.get(event_index, 0) + perf_counter_ns() - started_at
+                )
+            if not changes_only or device.device_value != previous_value:
+                device_logs.append(device_log)
+
+        return device_logs
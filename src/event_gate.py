@@ -0,0 +1,226 @@
+"""Gates deciding when satisfied scheduler events actually fire.
+
+By default, an event is level-triggered:
+it fires at every tick while its requirements are met.
+An event may instead be gated by
+
+- `edge_triggered`: it only fires once the requirements become met,
+  and has to see them unmet again before it can fire again,
+- `debounce_sec`: the requirements must have been met continuously
+  for that long before it fires,
+- `cooldown_sec`: after firing, it cannot fire again for that long.
+
+The state of the gated events is kept in a few flat arrays,
+and ungated events cost nothing.
+"""
+
+from __future__ import annotations
+
+from array import array
+from math import inf
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from src.scheduler import SchedulerEvent
+
+
+class EventGates:
+    """Per-event state of the gated events of a scheduler."""
+
+    def __init__(self) -> None:
+        # Registration index of each gated event, and its position here.
+        self._event_indices: array[int] = array("q")
+        self._positions: dict[int, int] = {}
+
+        # Configuration of each gated event.
+        self._edge_triggered: bytearray = bytearray()
+        self._debounce_secs: array[float] = array("d")
+        self._cooldown_secs: array[float] = array("d")
+
+        # Whether the requirements were met at the last check,
+        # whether an edge-triggered event may still fire for the current edge,
+        # since when the requirements are met, and when the cooldown ends.
+        self._levels: bytearray = bytearray()
+        self._armed: bytearray = bytearray()
+        self._met_since: array[float] = array("d")
+        self._ready_at: array[float] = array("d")
+
+    def __len__(self) -> int:
+        return len(self._event_indices)
+
+    def build(self, events: list[SchedulerEvent]) -> None:
+        """Collect the gated events, keeping the state of the known ones.
+
+        Events are known by their registration index.
+        """
+
+        old_positions: dict[int, int] = self._positions
+        old_levels: bytearray = self._levels
+        old_armed: bytearray = self._armed
+        old_met_since: array[float] = self._met_since
+        old_ready_at: array[float] = self._ready_at
+
+        gated_events: list[tuple[int, SchedulerEvent]] = [
+            (event_index, event)
+            for event_index, event in enumerate(events)
+            if event.edge_triggered
+            or event.debounce_sec is not None
+            or event.cooldown_sec is not None
+        ]
+
+        self._event_indices = array("q", [index for index, _ in gated_events])
+        self._positions = {
+            event_index: position
+            for position, (event_index, _) in enumerate(gated_events)
+        }
+        self._edge_triggered = bytearray(
+            event.edge_triggered for _, event in gated_events
+        )
+        self._debounce_secs = array(
+            "d", [event.debounce_sec or 0.0 for _, event in gated_events]
+        )
+        self._cooldown_secs = array(
+            "d", [event.cooldown_sec or 0.0 for _, event in gated_events]
+        )
+
+        self._levels = bytearray()
+        self._armed = bytearray()
+        self._met_since = array("d")
+        self._ready_at = array("d")
+        for event_index, _ in gated_events:
+            old_position: int | None = old_positions.get(event_index)
+            if old_position is None:
+                self._levels.append(0)
+                self._armed.append(0)
+                self._met_since.append(inf)
+                self._ready_at.append(-inf)
+            else:
+                self._levels.append(old_levels[old_position])
+                self._armed.append(old_armed[old_position])
+                self._met_since.append(old_met_since[old_position])
+                self._ready_at.append(old_ready_at[old_position])
+
+    def state(self) -> tuple[bytes, bytes, bytes, bytes]:
+        """Return the state of the gated events as native bytes.
+
+        Returns
+        -------
+        tuple[bytes, bytes, bytes, bytes]
+            The levels and armed flags, one byte per gated event,
+            and the met-since and ready-at timestamps, one double each.
+        """
+
+        return (
+            bytes(self._levels),
+            bytes(self._armed),
+            self._met_since.tobytes(),
+            self._ready_at.tobytes(),
+        )
+
+    def restore_state(
+        self,
+        levels: bytes | memoryview,
+        armed: bytes | memoryview,
+        met_since: bytes | memoryview,
+        ready_at: bytes | memoryview,
+    ) -> None:
+        """Restore the state returned by `state`, for the same gated events."""
+
+        gated_event_count: int = len(self._event_indices)
+        if len(levels) != gated_event_count or len(armed) != gated_event_count:
+            raise ValueError("The number of gated events does not match.")
+
+        self._levels = bytearray(levels)
+        self._armed = bytearray(armed)
+        self._met_since = array("d")
+        self._met_since.frombytes(met_since)
+        self._ready_at = array("d")
+        self._ready_at.frombytes(ready_at)
+
+        if (
+            len(self._met_since) != gated_event_count
+            or len(self._ready_at) != gated_event_count
+        ):
+            raise ValueError("The number of gated events does not match.")
+
+    def filter(
+        self,
+        triggered_event_indices: list[int],
+        should_trigger: list[bool],
+        checked_event_indices: Iterable[int] | None,
+        now: float,
+    ) -> list[int]:
+        """Remove the gated events that should not fire from the triggered events.
+
+        Parameters
+        ----------
+        triggered_event_indices : list[int]
+            The events whose requirements are met, in order.
+        should_trigger : list[bool]
+            Whether the requirements of each event are met.
+        checked_event_indices : Iterable[int] | None
+            The events that are due at this tick, or None if every event is due.
+            The state of the other events is left untouched.
+        now : float
+            The POSIX timestamp of the tick, in seconds.
+
+        Returns
+        -------
+        list[int]
+            The events that fire, in order.
+        """
+
+        positions: dict[int, int] = self._positions
+        if not positions:
+            return triggered_event_indices
+
+        checked_positions: Iterable[int]
+        if checked_event_indices is None:
+            checked_positions = range(len(self._event_indices))
+        else:
+            checked_positions = [
+                positions[event_index]
+                for event_index in checked_event_indices
+                if event_index in positions
+            ]
+
+        event_indices: array[int] = self._event_indices
+        blocked_event_indices: set[int] = {
+            event_indices[position]
+            for position in checked_positions
+            if not self._check(position, should_trigger[event_indices[position]], now)
+        }
+
+        return [
+            event_index
+            for event_index in triggered_event_indices
+            if event_index not in blocked_event_indices
+        ]
+
+    def _check(self, position: int, level: bool, now: float) -> bool:
+        """Update the state of a gated event, and return whether it fires."""
+
+        if not level:
+            self._levels[position] = 0
+            self._armed[position] = 0
+            self._met_since[position] = inf
+            return False
+
+        if not self._levels[position]:
+            self._levels[position] = 1
+            self._armed[position] = 1
+            self._met_since[position] = now
+
+        if self._edge_triggered[position] and not self._armed[position]:
+            return False
+
+        if (
+            now - self._met_since[position] < self._debounce_secs[position]
+            or now < self._ready_at[position]
+        ):
+            return False
+
+        self._armed[position] = 0
+        self._ready_at[position] = now + self._cooldown_secs[position]
+
+        return True
@@ -0,0 +1,211 @@
+"""Structured binary event log.
+
+Instead of formatted strings, each sensor reading and device update
+can be logged as a fixed-width binary record of
+(timestamp, uuid, kind, value), packed with `struct`.
+
+The names and physical quantities of the sensors and devices
+are stored once in a JSON catalog next to the log,
+so that the records can be rendered back into the familiar text format
+on demand, for example with
+
+```bash
+python -m src.event_log logs/event_logs.bin logs/event_logs.catalog.json
+```
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from datetime import datetime, timezone
+from enum import IntEnum
+from struct import Struct
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, TextIO
+
+from src.device import Device
+from src.physical_quantity import PhysicalQuantity
+from src.sensor import Sensor
+
+
+class RecordKind(IntEnum):
+    """The kind of entity a record belongs to."""
+
+    SENSOR = 1
+    DEVICE = 2
+
+
+class EventRecord(NamedTuple):
+    """A single sensor reading or device update.
+
+    Attributes
+    ----------
+    timestamp : float
+        The POSIX timestamp of the event, in seconds.
+    uuid : int
+        The unique identifier of the sensor or device.
+    kind : RecordKind
+        Whether the record belongs to a sensor or a device.
+    value : int
+        The sensor reading or the device value.
+    """
+
+    timestamp: float
+    uuid: int
+    kind: RecordKind
+    value: int
+
+
+# Little-endian: float64 timestamp, uint64 uuid, uint8 kind, int64 value,
+# wide enough for any uuid, sensor reading or device value.
+RECORD_STRUCT: Struct = Struct("<dQBq")
+
+
+class CatalogEntry(NamedTuple):
+    """The name and physical quantity of a sensor or device."""
+
+    name: str
+    physical_quantity: PhysicalQuantity
+
+
+class EventLogWriter:
+    """Writer that appends binary event records to a file."""
+
+    def __init__(self, log_file: BinaryIO) -> None:
+        self.log_file = log_file
+
+    def write_records(self, records: Iterable[EventRecord]) -> None:
+        """Pack the records and write them with a single `write` call."""
+
+        pack = RECORD_STRUCT.pack
+        self.log_file.write(
+            b"".join(
+                [
+                    pack(timestamp, uuid, kind, value)
+                    for timestamp, uuid, kind, value in records
+                ]
+            )
+        )
+
+    def flush(self) -> None:
+        """Flush the underlying file."""
+
+        self.log_file.flush()
+
+
+def read_event_log(log_file: BinaryIO) -> Iterator[EventRecord]:
+    """Read every record of a binary event log.
+
+    A trailing partial record, for example from an interrupted write, is ignored.
+    """
+
+    data: bytes = log_file.read()
+    usable_size: int = len(data) - len(data) % RECORD_STRUCT.size
+
+    for timestamp, uuid, kind, value in RECORD_STRUCT.iter_unpack(
+        memoryview(data)[:usable_size]
+    ):
+        yield EventRecord(timestamp, uuid, RecordKind(kind), value)
+
+
+def build_catalog(
+    sensors: Iterable[Sensor],
+    devices: Iterable[Device],
+) -> dict[int, CatalogEntry]:
+    """Return the names and physical quantities of sensors and devices by uuid."""
+
+    catalog: dict[int, CatalogEntry] = {}
+    for sensor in sensors:
+        catalog[sensor.uuid] = CatalogEntry(sensor.name, sensor.sensor_kind)
+    for device in devices:
+        catalog[device.uuid] = CatalogEntry(device.name, device.device_kind)
+
+    return catalog
+
+
+def dump_catalog(
+    catalog_file: TextIO,
+    sensors: Iterable[Sensor],
+    devices: Iterable[Device],
+) -> None:
+    """Write the names and physical quantities of sensors and devices as JSON."""
+
+    json.dump(
+        {
+            str(uuid): {
+                "name": name,
+                "physical_quantity": physical_quantity.name,
+            }
+            for uuid, (name, physical_quantity) in build_catalog(
+                sensors, devices
+            ).items()
+        },
+        catalog_file,
+        indent=2,
+    )
+
+
+def load_catalog(catalog_file: TextIO) -> dict[int, CatalogEntry]:
+    """Read a catalog written by `dump_catalog`."""
+
+    return {
+        int(uuid): CatalogEntry(
+            entry["name"],
+            PhysicalQuantity[entry["physical_quantity"]],
+        )
+        for uuid, entry in json.load(catalog_file).items()
+    }
+
+
+def render_event_record(
+    record: EventRecord,
+    catalog: dict[int, CatalogEntry],
+) -> str:
+    """Render a record in the text format of `get_loggable_text`.
+
+    Parameters
+    ----------
+    record : EventRecord
+        The record to render.
+    catalog : dict[int, CatalogEntry]
+        The names and physical quantities, keyed by uuid.
+
+    Returns
+    -------
+    str
+        The loggable text, with a UTC timestamp.
+    """
+
+    name, physical_quantity = catalog.get(
+        record.uuid,
+        CatalogEntry(f"#{record.uuid}", PhysicalQuantity.NONE),
+    )
+    timestamp: datetime = datetime.fromtimestamp(record.timestamp, timezone.utc)
+
+    if record.kind == RecordKind.SENSOR:
+        return (
+            f"[{timestamp}] {name}: current {physical_quantity} "
+            f"reading is {record.value}."
+        )
+
+    return f"[{timestamp}] {name}: current {physical_quantity} is {record.value}."
+
+
+def main(argv: list[str]) -> None:
+    """Print a binary event log in the text format."""
+
+    if len(argv) != 2:
+        print("usage: python -m src.event_log <event log> <catalog>")
+        return
+
+    log_path, catalog_path = argv
+    with open(catalog_path, encoding="utf-8") as catalog_file:
+        catalog: dict[int, CatalogEntry] = load_catalog(catalog_file)
+
+    with open(log_path, "rb") as log_file:
+        for record in read_event_log(log_file):
+            print(render_event_record(record, catalog))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,294 @@
+"""Headless front end serving the state of a scheduler over HTTP.
+
+The `Dashboard` needs a display.
+On servers without one, the `HeadlessServer` exposes the same state
+on a local HTTP endpoint instead:
+
+- `GET /state` returns the current state of every sensor and device as JSON.
+- `GET /events` is a server-sent events (SSE) stream.
+  It starts with a `state` event holding the full state,
+  followed by one `diff` event per tick with the sensors and devices that changed.
+
+Each diff is encoded once and pushed to every client,
+so adding clients does not add work to the scheduler,
+and clients never need to poll the full state.
+The SSE stream can be consumed with `EventSource` in a browser, or with
+
+```bash
+curl -N http://127.0.0.1:8000/events
+```
+"""
+
+from __future__ import annotations
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from types import TracebackType
+from typing import Any, Self
+
+from src.device import Device
+from src.event_log import EventRecord
+from src.scheduler import Scheduler
+from src.sensor import Sensor
+
+# Interval of the keep-alive comments sent to idle SSE clients.
+_KEEP_ALIVE_SEC: float = 15.0
+
+
+def _encode_sse(event: str, data: dict[str, Any]) -> bytes:
+    """Encode one server-sent event."""
+
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+class HeadlessServer:
+    """HTTP server streaming the state of a scheduler to many clients.
+
+    The server consumes the changes tracked by the scheduler
+    (see `Scheduler.pop_changed_uuids`),
+    so it should not be combined with a `Dashboard` on the same scheduler.
+
+    Attributes
+    ----------
+    scheduler : Scheduler
+        The scheduler whose sensors and devices are served.
+    max_pending_events : int
+        The number of events a client may lag behind before it is disconnected.
+        A disconnected client can reconnect and start again from the full state.
+    """
+
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        max_pending_events: int = 256,
+    ) -> None:
+        self.scheduler = scheduler
+        self.max_pending_events = max_pending_events
+
+        self._clients_lock: Lock = Lock()
+        self._clients: list[Queue[bytes | None]] = []
+
+        # The changes tracked so far are already part of the full state.
+        scheduler.pop_changed_uuids()
+        scheduler.subscribe_records(self._publish_diff)
+
+        self._http_server: ThreadingHTTPServer = ThreadingHTTPServer(
+            (host, port),
+            _make_request_handler(self),
+        )
+        self._http_server.daemon_threads = True
+        # Serving requests, once started.
+        self._thread: Thread | None = None
+
+    def __enter__(self) -> Self:
+        self.start()
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Serve requests in a background thread."""
+
+        self._thread = Thread(target=self._http_server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop serving requests and end every event stream."""
+
+        with self._clients_lock:
+            clients: list[Queue[bytes | None]] = self._clients
+            self._clients = []
+
+        for client in clients:
+            try:
+                client.put_nowait(None)
+            except Full:
+                pass
+
+        # Shutting down waits for `serve_forever`, which only runs once started.
+        if self._thread is not None:
+            self._http_server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._http_server.server_close()
+
+    def state(self) -> dict[str, Any]:
+        """Return the current state of every sensor and device."""
+
+        # The registry may change on the scheduler thread while serving,
+        # so the live views are copied before iterating.
+        return {
+            "timestamp": self.scheduler.clock.now().timestamp(),
+            "sensors": [
+                {
+                    "uuid": sensor.uuid,
+                    "name": sensor.name,
+                    "physical_quantity": str(sensor.sensor_kind),
+                    "value": sensor.sensor_reading,
+                }
+                for sensor in list(self.scheduler.sensors)
+            ],
+            "devices": [
+                {
+                    "uuid": device.uuid,
+                    "name": device.name,
+                    "physical_quantity": str(device.device_kind),
+                    "value": device.device_value,
+                }
+                for device in list(self.scheduler.devices)
+            ],
+        }
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Return the host and port the server listens on."""
+
+        host, port = self._http_server.server_address[:2]
+
+        return str(host), int(port)
+
+    @property
+    def client_count(self) -> int:
+        """Return the number of connected event stream clients."""
+
+        return len(self._clients)
+
+    def _publish_diff(self, records: list[EventRecord]) -> None:
+        """Push the sensors and devices that changed during a tick to every client."""
+
+        changed_uuids: set[int] = self.scheduler.pop_changed_uuids()
+        if not changed_uuids or not self._clients:
+            return
+
+        sensor_readings: dict[int, int] = {}
+        device_values: dict[int, int] = {}
+        for uuid in changed_uuids:
+            sensor: Sensor | None = self.scheduler.get_sensor(uuid)
+            if sensor is not None:
+                sensor_readings[uuid] = sensor.sensor_reading
+                continue
+
+            device: Device | None = self.scheduler.get_device(uuid)
+            if device is not None:
+                device_values[uuid] = device.device_value
+
+        event: bytes = _encode_sse(
+            "diff",
+            {
+                "timestamp": (
+                    records[0].timestamp
+                    if records
+                    else self.scheduler.clock.now().timestamp()
+                ),
+                "sensors": sensor_readings,
+                "devices": device_values,
+            },
+        )
+
+        with self._clients_lock:
+            lagging_clients: list[Queue[bytes | None]] = []
+            for client in self._clients:
+                try:
+                    client.put_nowait(event)
+                except Full:
+                    lagging_clients.append(client)
+
+            for client in lagging_clients:
+                self._clients.remove(client)
+
+    def _subscribe(self) -> Queue[bytes | None]:
+        """Register a new event stream client."""
+
+        client: Queue[bytes | None] = Queue(self.max_pending_events)
+        with self._clients_lock:
+            self._clients.append(client)
+
+        return client
+
+    def _is_subscribed(self, client: Queue[bytes | None]) -> bool:
+        """Return whether a client is still registered.
+
+        Lagging clients are unregistered when their queue is full.
+        """
+
+        with self._clients_lock:
+            return client in self._clients
+
+    def _unsubscribe(self, client: Queue[bytes | None]) -> None:
+        """Forget an event stream client."""
+
+        with self._clients_lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+
+def _make_request_handler(
+    server: HeadlessServer,
+) -> type[BaseHTTPRequestHandler]:
+    """Return a request handler class bound to the given server."""
+
+    class _RequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path == "/state":
+                self.__send_state()
+            elif self.path == "/events":
+                self.__stream_events()
+            else:
+                self.send_error(404)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Requests are not logged, the stream would flood the console.
+            pass
+
+        def __send_state(self) -> None:
+            body: bytes = json.dumps(server.state()).encode("utf-8")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def __stream_events(self) -> None:
+            # Subscribe before taking the state, so that no diff is missed.
+            client: Queue[bytes | None] = server._subscribe()
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+
+            try:
+                self.wfile.write(_encode_sse("state", server.state()))
+                self.wfile.flush()
+
+                while True:
+                    try:
+                        event: bytes | None = client.get(timeout=_KEEP_ALIVE_SEC)
+                    except Empty:
+                        if not server._is_subscribed(client):
+                            return
+                        event = b": keep-alive\n\n"
+
+                    if event is None:
+                        return
+
+                    self.wfile.write(event)
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                server._unsubscribe(client)
+
+    return _RequestHandler
@@ -0,0 +1,172 @@
+"""Instrumentation of the scheduler tick.
+
+A scheduler with an `Instrumentation` reports how long each phase
+of every tick took, and how long the actions of every triggered event took,
+so a slow tick can be attributed to sensor updates, requirement checks,
+actions or the dispatch callbacks.
+
+Without instrumentation, which is the default, the scheduler does not even
+read the clock: the only cost is one `None` check per phase.
+
+The `HistogramInstrumentation` keeps log2 histograms of the durations,
+which costs a few integer operations per sample and a fixed amount of memory,
+however long the simulation runs.
+"""
+
+from __future__ import annotations
+
+from enum import StrEnum
+from typing import Any
+
+
+class TickPhase(StrEnum):
+    """The phases of a scheduler tick."""
+
+    UPDATE_SENSORS = "UPDATE_SENSORS"
+    EVALUATE_REQUIREMENTS = "EVALUATE_REQUIREMENTS"
+    TRIGGER_ACTIONS = "TRIGGER_ACTIONS"
+    DISPATCH_LOGS = "DISPATCH_LOGS"
+    DISPATCH_RECORDS = "DISPATCH_RECORDS"
+
+
+class Instrumentation:
+    """Base class of the receivers of tick measurements.
+
+    Methods are called on the thread running the ticks,
+    and should return quickly.
+    """
+
+    def record_span(self, phase: TickPhase, duration_ns: int) -> None:
+        """Receive the duration of a phase of a tick."""
+
+    def record_event(self, event_index: int, duration_ns: int) -> None:
+        """Receive the duration of the actions of a triggered event.
+
+        `event_index` is the registration index of the event in the scheduler.
+        """
+
+
+# Durations up to 2**63 nanoseconds, which is more than enough.
+_BUCKET_COUNT: int = 64
+
+
+class DurationHistogram:
+    """Histogram of durations with power-of-two buckets.
+
+    Bucket `i` counts the durations `d` with `2**(i-1) <= d < 2**i` nanoseconds,
+    and bucket 0 counts the zero durations.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: list[int] = [0] * _BUCKET_COUNT
+        self._count: int = 0
+        self._total_ns: int = 0
+        self._max_ns: int = 0
+
+    def add(self, duration_ns: int) -> None:
+        """Add a duration to the histogram."""
+
+        self._buckets[min(duration_ns.bit_length(), _BUCKET_COUNT - 1)] += 1
+        self._count += 1
+        self._total_ns += duration_ns
+        if duration_ns > self._max_ns:
+            self._max_ns = duration_ns
+
+    def percentile_ns(self, percentile: float) -> int:
+        """Return an upper bound of a percentile of the durations.
+
+        The bound is the upper edge of the bucket holding the percentile,
+        so it is at most twice the exact value.
+        """
+
+        if self._count == 0:
+            return 0
+
+        rank: float = percentile / 100 * self._count
+        cumulative_count: int = 0
+        for bucket_index, bucket_count in enumerate(self._buckets):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank and bucket_count:
+                return min(self._max_ns, (1 << bucket_index) - 1)
+
+        return self._max_ns
+
+    def export(self) -> dict[str, Any]:
+        """Return a JSON-friendly summary of the histogram."""
+
+        return {
+            "count": self._count,
+            "total_ns": self._total_ns,
+            "mean_ns": self._total_ns / self._count if self._count else 0.0,
+            "max_ns": self._max_ns,
+            "p50_ns": self.percentile_ns(50),
+            "p99_ns": self.percentile_ns(99),
+            # Upper edge of each non empty bucket, with its count.
+            "buckets": {
+                str((1 << bucket_index) - 1): bucket_count
+                for bucket_index, bucket_count in enumerate(self._buckets)
+                if bucket_count
+            },
+        }
+
+    @property
+    def count(self) -> int:
+        """Return the number of durations added."""
+
+        return self._count
+
+    @property
+    def total_ns(self) -> int:
+        """Return the sum of the durations added."""
+
+        return self._total_ns
+
+
+class HistogramInstrumentation(Instrumentation):
+    """Instrumentation keeping a histogram per tick phase and per event."""
+
+    def __init__(self) -> None:
+        self._phases: dict[TickPhase, DurationHistogram] = {
+            phase: DurationHistogram() for phase in TickPhase
+        }
+        self._events: dict[int, DurationHistogram] = {}
+
+    def record_span(self, phase: TickPhase, duration_ns: int) -> None:
+        self._phases[phase].add(duration_ns)
+
+    def record_event(self, event_index: int, duration_ns: int) -> None:
+        histogram: DurationHistogram | None = self._events.get(event_index)
+        if histogram is None:
+            histogram = self._events[event_index] = DurationHistogram()
+
+        histogram.add(duration_ns)
+
+    def export(self) -> dict[str, Any]:
+        """Return a JSON-friendly summary of every phase and event.
+
+        Events are keyed by their registration index, and only the events
+        that triggered at least once are listed.
+        """
+
+        return {
+            "phases": {
+                str(phase): histogram.export()
+                for phase, histogram in self._phases.items()
+            },
+            "events": {
+                str(event_index): histogram.export()
+                for event_index, histogram in sorted(self._events.items())
+            },
+        }
+
+    @property
+    def phases(self) -> dict[TickPhase, DurationHistogram]:
+        """Return the histograms of the tick phases."""
+
+        return self._phases
+
+    @property
+    def events(self) -> dict[int, DurationHistogram]:
+        """Return the histograms of the events, by registration index."""
+
+        return self._events
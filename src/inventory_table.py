@@ -0,0 +1,292 @@
+"""Virtualized table of sensors or devices for the dashboard.
+
+A home may have thousands of sensors and devices,
+but only a few rows fit on the screen.
+The table creates widgets for the visible rows only,
+and binds them to other items as it is scrolled, searched or filtered,
+so startup time and memory do not grow with the size of the inventory.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable, Sequence, TypeAlias
+
+import tkinter as tk
+
+from src.device import Device
+from src.physical_quantity import PhysicalQuantity
+from src.sensor import Sensor
+
+InventoryItem: TypeAlias = Sensor | Device
+
+_ALL_KINDS: str = "ALL"
+
+
+def item_kind(item: InventoryItem) -> PhysicalQuantity:
+    """Return the physical quantity of a sensor or a device."""
+
+    if isinstance(item, Sensor):
+        return item.sensor_kind
+
+    return item.device_kind
+
+
+def filter_inventory(
+    items: Sequence[InventoryItem],
+    search_text: str = "",
+    kind: PhysicalQuantity | None = None,
+) -> list[InventoryItem]:
+    """Return the items whose name contains the search text and of the given kind.
+
+    The search is case insensitive, and an empty search text matches every item.
+    """
+
+    search_text = search_text.strip().casefold()
+
+    return [
+        item
+        for item in items
+        if (kind is None or item_kind(item) == kind)
+        and search_text in item.name.casefold()
+    ]
+
+
+class _TableRow:
+    """Widgets of one visible row, bound to one item at a time."""
+
+    def __init__(self, master: tk.Misc, with_slider: bool) -> None:
+        self.item: InventoryItem | None = None
+
+        self.label_text: tk.StringVar = tk.StringVar()
+        self.label: tk.Label = tk.Label(
+            master,
+            textvariable=self.label_text,
+            anchor=tk.W,
+        )
+        self.label.pack(fill=tk.X)
+
+        self.slider_value: tk.DoubleVar | None = None
+        self.slider: tk.Scale | None = None
+        if with_slider:
+            self.slider_value = tk.DoubleVar()
+            self.slider = tk.Scale(
+                master,
+                variable=self.slider_value,
+                orient=tk.HORIZONTAL,
+            )
+            self.slider.pack(fill=tk.X)
+
+    def bind_item(self, item: InventoryItem | None) -> None:
+        """Show the given item in the row, or clear the row if None."""
+
+        self.item = item
+
+        if item is None:
+            self.label_text.set("")
+            if self.slider is not None:
+                self.slider["state"] = tk.DISABLED
+            return
+
+        if isinstance(item, Device) and self.slider is not None:
+            range_min, range_max = item.device_value_range
+            self.slider.configure(from_=range_min, to=range_max, state=tk.NORMAL)
+
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Show the current state of the bound item."""
+
+        if self.item is None:
+            return
+
+        self.label_text.set(self.item.get_loggable_text(False))
+
+        if isinstance(self.item, Device) and self.slider_value is not None:
+            self.slider_value.set(self.item.device_value)
+
+
+class InventoryTable(tk.Frame):
+    """Scrollable table of sensors or devices with search and filter.
+
+    Attributes
+    ----------
+    row_count : int
+        The number of visible rows, which is the number of row widgets created.
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        items: Sequence[InventoryItem],
+        row_count: int = 10,
+        on_slider_release: Callable[[Device, int], None] | None = None,
+    ) -> None:
+        super().__init__(master)
+
+        self.row_count: int = row_count
+
+        self.__items: Sequence[InventoryItem] = items
+        self.__filtered_items: list[InventoryItem] = list(items)
+        self.__first_index: int = 0
+        self.__on_slider_release = on_slider_release
+
+        # Search and filter controls.
+        controls: tk.Frame = tk.Frame(self)
+        controls.pack(fill=tk.X)
+
+        self.__search_text: tk.StringVar = tk.StringVar()
+        self.__search_text.trace_add("write", lambda *_: self.__event_filter())
+        tk.Entry(controls, textvariable=self.__search_text).pack(
+            side=tk.LEFT,
+            fill=tk.X,
+            expand=True,
+        )
+
+        self.__kind_text: tk.StringVar = tk.StringVar(value=_ALL_KINDS)
+        tk.OptionMenu(
+            controls,
+            self.__kind_text,
+            _ALL_KINDS,
+            *sorted({item_kind(item) for item in items}),
+            command=lambda _: self.__event_filter(),
+        ).pack(side=tk.RIGHT)
+
+        # Rows and scrollbar.
+        self.__scrollbar: tk.Scrollbar = tk.Scrollbar(
+            self,
+            command=self.__event_scrollbar,
+        )
+        self.__scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        rows_frame: tk.Frame = tk.Frame(self)
+        rows_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        with_slider: bool = on_slider_release is not None
+        self.__rows: list[_TableRow] = [
+            _TableRow(rows_frame, with_slider) for _ in range(row_count)
+        ]
+        self.__row_by_uuid: dict[int, _TableRow] = {}
+
+        for row in self.__rows:
+            widgets: list[tk.Widget] = [row.label]
+            if row.slider is not None:
+                widgets.append(row.slider)
+
+                def _event_wrapper(
+                    table_row: _TableRow,
+                ) -> Callable[[tk.Event[tk.Scale]], None]:
+                    return lambda _: self.__event_slider_release(table_row)
+
+                row.slider.bind("<ButtonRelease-1>", _event_wrapper(row))
+
+            for widget in widgets:
+                widget.bind("<MouseWheel>", self.__event_mouse_wheel)
+                widget.bind("<Button-4>", lambda _: self.scroll_by(-1))
+                widget.bind("<Button-5>", lambda _: self.scroll_by(1))
+
+        self.__bind_rows()
+
+    def refresh(self, uuids: Iterable[int] | None = None) -> None:
+        """Show the current state of the visible items.
+
+        If `uuids` is given, only the visible rows bound to those items are updated.
+        """
+
+        if uuids is None:
+            for row in self.__rows:
+                row.refresh()
+            return
+
+        for uuid in uuids:
+            bound_row: _TableRow | None = self.__row_by_uuid.get(uuid)
+            if bound_row is not None:
+                bound_row.refresh()
+
+    def scroll_to(self, first_index: int) -> None:
+        """Show the items starting from the given index of the filtered items."""
+
+        first_index = min(first_index, len(self.__filtered_items) - self.row_count)
+        first_index = max(first_index, 0)
+
+        if first_index == self.__first_index:
+            return
+
+        self.__first_index = first_index
+        self.__bind_rows()
+
+    def scroll_by(self, row_count: int) -> None:
+        """Scroll the table by a number of rows."""
+
+        self.scroll_to(self.__first_index + row_count)
+
+    def __bind_rows(self) -> None:
+        """Bind the visible rows to the items in view and update the scrollbar."""
+
+        visible_items: list[InventoryItem] = self.__filtered_items[
+            self.__first_index : self.__first_index + self.row_count
+        ]
+
+        self.__row_by_uuid = {}
+        for row_index, row in enumerate(self.__rows):
+            item: InventoryItem | None = None
+            if row_index < len(visible_items):
+                item = visible_items[row_index]
+                self.__row_by_uuid[item.uuid] = row
+            row.bind_item(item)
+
+        item_count: int = len(self.__filtered_items)
+        if item_count == 0:
+            self.__scrollbar.set(0.0, 1.0)
+            return
+
+        self.__scrollbar.set(
+            self.__first_index / item_count,
+            min(1.0, (self.__first_index + self.row_count) / item_count),
+        )
+
+    def __event_filter(self) -> None:
+        """Apply the search text and the kind filter, and scroll back to the top."""
+
+        kind_text: str = self.__kind_text.get()
+
+        self.__filtered_items = filter_inventory(
+            self.__items,
+            self.__search_text.get(),
+            None if kind_text == _ALL_KINDS else PhysicalQuantity(kind_text),
+        )
+        self.__first_index = 0
+        self.__bind_rows()
+
+    def __event_scrollbar(self, action: str, amount: str, unit: str = "") -> None:
+        """Scroll the table from the scrollbar.
+
+        The scrollbar either asks to move to a fraction of the items,
+        or to scroll by a number of units (rows) or pages.
+        """
+
+        if action == tk.MOVETO:
+            self.scroll_to(round(float(amount) * len(self.__filtered_items)))
+            return
+
+        if unit == tk.PAGES:
+            self.scroll_by(int(amount) * self.row_count)
+            return
+
+        self.scroll_by(int(amount))
+
+    def __event_mouse_wheel(self, event: tk.Event[tk.Misc]) -> None:
+        """Scroll the table with the mouse wheel."""
+
+        self.scroll_by(-1 if event.delta > 0 else 1)
+
+    def __event_slider_release(self, row: _TableRow) -> None:
+        """Write the slider value of a row to its device."""
+
+        if (
+            self.__on_slider_release is None
+            or not isinstance(row.item, Device)
+            or row.slider_value is None
+        ):
+            return
+
+        self.__on_slider_release(row.item, int(row.slider_value.get()))
@@ -1,18 +1,68 @@
 """Module for logger."""
 
-from typing import Callable, TextIO
+from threading import Lock, Timer
+from time import monotonic
+from types import TracebackType
+from typing import Callable, Self, TextIO
+
+from src.event_log import EventLogWriter, EventRecord
 
 
 class Logger:
-    """Logger that can be used to log messages."""
+    """Logger that can be used to log messages.
+
+    By default, the log file is reopened in append mode for every batch of messages.
+
+    In buffered mode, the logger writes to the given file handle directly,
+    and keeps messages in memory until the buffer grows beyond `flush_size`
+    characters, `flush_interval_sec` seconds passed since the last flush,
+    or `flush`/`close` is called.
+    A timer flushes buffered messages once `flush_interval_sec` passed,
+    even if no other message is logged in the meantime.
+    Each batch passed to `log_texts` is joined into one chunk,
+    and each flush is a single `write` call.
+
+    If an `EventLogWriter` is given,
+    binary event records passed to `log_records` are written through it.
+
+    The logger can be used as a context manager,
+    in which case the buffer is flushed on exit.
+    """
 
     def __init__(
         self,
         log_file: TextIO,
         log_function: Callable[[str], None],
+        buffered: bool = False,
+        flush_size: int = 64 * 1024,
+        flush_interval_sec: float = 1.0,
+        event_log_writer: EventLogWriter | None = None,
     ) -> None:
         self.log_file = log_file
         self.log_function = log_function
+        self.event_log_writer = event_log_writer
+
+        self.buffered = buffered
+        self.flush_size = flush_size
+        self.flush_interval_sec = flush_interval_sec
+
+        # Messages can be logged from the autopilot thread and the dashboard.
+        self._lock: Lock = Lock()
+        self._buffer: list[str] = []
+        self._buffer_size: int = 0
+        self._last_flush: float = monotonic()
+        self._flush_timer: Timer | None = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
 
     def log_text(self, loggable_text: str) -> None:
         """Log a message to a file and a stream.
@@ -23,14 +73,7 @@ class Logger:
             The message to log.
         """
 
-        self.log_function(loggable_text)
-
-        with open(
-            self.log_file.name,
-            mode="a",
-            encoding="utf-8",
-        ) as file:
-            file.write(loggable_text + "\n")
+        self.log_texts([loggable_text])
 
     def log_texts(self, loggable_texts: list[str]) -> None:
         """Log a message to a file and a stream.
@@ -41,5 +84,99 @@ class Logger:
             A list of messages to log.
         """
 
+        if not loggable_texts:
+            return
+
         for loggable_text in loggable_texts:
-            self.log_text(loggable_text)
+            self.log_function(loggable_text)
+
+        chunk: str = "\n".join(loggable_texts) + "\n"
+
+        if not self.buffered:
+            with self._lock:
+                self._write(chunk)
+            return
+
+        with self._lock:
+            self._buffer.append(chunk)
+            self._buffer_size += len(chunk)
+
+            if (
+                self._buffer_size >= self.flush_size
+                or monotonic() - self._last_flush >= self.flush_interval_sec
+            ):
+                self._flush_buffer()
+            elif self._flush_timer is None:
+                self._flush_timer = Timer(self.flush_interval_sec, self._flush_on_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def log_records(self, records: list[EventRecord]) -> None:
+        """Log binary event records.
+
+        Records are discarded if the logger has no event log writer.
+
+        Parameters
+        ----------
+        records : list[EventRecord]
+            A list of records to log.
+        """
+
+        if self.event_log_writer is None or not records:
+            return
+
+        with self._lock:
+            self.event_log_writer.write_records(records)
+
+    def flush(self) -> None:
+        """Write the buffered messages to the log file."""
+
+        with self._lock:
+            self._flush_buffer()
+            if self.event_log_writer is not None:
+                self.event_log_writer.flush()
+
+    def close(self) -> None:
+        """Flush the buffered messages.
+
+        The log file itself is owned by the caller and is not closed.
+        """
+
+        self.flush()
+
+        with self._lock:
+            flush_timer: Timer | None = self._flush_timer
+            self._flush_timer = None
+        if flush_timer is not None:
+            flush_timer.cancel()
+
+    def _flush_on_timer(self) -> None:
+        """Flush the messages left in the buffer when the timer expires."""
+
+        with self._lock:
+            self._flush_timer = None
+            self._flush_buffer()
+
+    def _flush_buffer(self) -> None:
+        """Write the buffer to the log file, the lock must be held."""
+
+        self._last_flush = monotonic()
+        if not self._buffer:
+            return
+
+        chunk: str = "".join(self._buffer)
+        self._buffer = []
+        self._buffer_size = 0
+
+        self.log_file.write(chunk)
+        self.log_file.flush()
+
+    def _write(self, chunk: str) -> None:
+        """Append a chunk to the log file by reopening it."""
+
+        with open(
+            self.log_file.name,
+            mode="a",
+            encoding="utf-8",
+        ) as file:
+            file.write(chunk)
@@ -0,0 +1,203 @@
+"""Seedable noise for sensor readings.
+
+By default, sensors follow a bounded random walk (see `SensorFleet`).
+A `NoiseModel` replaces that walk for the sensors it is given to.
+Models compute the next readings of all their sensors at once,
+from lists of readings and ranges, so a fleet steps each model in one block.
+
+Randomness always comes from a `random.Random` owned by the fleet
+(or by the sensor, if it is not attached to a fleet),
+so runs seeded the same way produce the same readings.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from math import cos, pi
+from random import Random
+from typing import Sequence
+
+
+class UniformBlock:
+    """Uniform random numbers in [0, 1), generated in blocks.
+
+    Drawing a block at once from a bound method is cheaper
+    than one module level `random()` call per sensor.
+    """
+
+    def __init__(self, random_generator: Random, block_size: int = 4096) -> None:
+        self.random_generator = random_generator
+        self.block_size = block_size
+
+        self._block: list[float] = []
+        self._position: int = 0
+
+    def take(self, count: int) -> list[float]:
+        """Return the next `count` random numbers."""
+
+        if self._position + count > len(self._block):
+            rest: list[float] = self._block[self._position :]
+            generate = self.random_generator.random
+            self._block = rest + [
+                generate() for _ in range(max(self.block_size, count - len(rest)))
+            ]
+            self._position = 0
+
+        start: int = self._position
+        self._position += count
+
+        return self._block[start : self._position]
+
+    def reset(self) -> None:
+        """Discard the numbers generated in advance."""
+
+        self._block = []
+        self._position = 0
+
+    def pending(self) -> list[float]:
+        """Return the numbers generated in advance and not taken yet."""
+
+        return self._block[self._position :]
+
+    def set_pending(self, numbers: Sequence[float]) -> None:
+        """Replace the numbers generated in advance, to resume a random sequence."""
+
+        self._block = list(numbers)
+        self._position = 0
+
+
+class NoiseModel(ABC):
+    """Base class of the noise models of sensor readings."""
+
+    @abstractmethod
+    def next_readings(
+        self,
+        readings: Sequence[int],
+        range_mins: Sequence[int],
+        range_maxs: Sequence[int],
+        now: float,
+        random_generator: Random,
+    ) -> list[int]:
+        """Return the next readings of a block of sensors.
+
+        Parameters
+        ----------
+        readings : Sequence[int]
+            The current readings of the sensors.
+        range_mins : Sequence[int]
+            The lower bounds of the ranges of the sensors.
+        range_maxs : Sequence[int]
+            The upper bounds of the ranges of the sensors.
+        now : float
+            The POSIX timestamp of the update, in seconds.
+        random_generator : Random
+            The source of randomness.
+
+        Returns
+        -------
+        list[int]
+            The next readings, within the ranges of the sensors.
+        """
+
+
+class GaussianDrift(NoiseModel):
+    """Readings drift by normally distributed steps.
+
+    Attributes
+    ----------
+    sigma_percentage : float
+        The standard deviation of a step, as a fraction of the width of the range.
+    """
+
+    def __init__(self, sigma_percentage: float = 0.05) -> None:
+        self.sigma_percentage = sigma_percentage
+
+    def next_readings(
+        self,
+        readings: Sequence[int],
+        range_mins: Sequence[int],
+        range_maxs: Sequence[int],
+        now: float,
+        random_generator: Random,
+    ) -> list[int]:
+        gauss = random_generator.gauss
+        sigma_percentage: float = self.sigma_percentage
+
+        return [
+            min(
+                range_max,
+                max(
+                    range_min,
+                    round(
+                        reading + gauss(0.0, sigma_percentage * (range_max - range_min))
+                    ),
+                ),
+            )
+            for reading, range_min, range_max in zip(readings, range_mins, range_maxs)
+        ]
+
+
+class DiurnalCurve(NoiseModel):
+    """Readings follow a daily cosine curve, plus some uniform noise.
+
+    The curve is highest at `peak_sec` seconds after midnight (UTC),
+    and lowest half a period later,
+    which suits daylight, temperature or occupancy.
+
+    Attributes
+    ----------
+    period_sec : float
+        The length of a cycle, one day by default.
+    peak_sec : float
+        The time of the peak within a cycle.
+    amplitude_percentage : float
+        Half the distance between the peak and the trough,
+        as a fraction of the width of the range.
+    noise_percentage : float
+        The maximum uniform noise added to the curve,
+        as a fraction of the width of the range.
+    """
+
+    def __init__(
+        self,
+        period_sec: float = 86_400.0,
+        peak_sec: float = 14 * 3600.0,
+        amplitude_percentage: float = 0.5,
+        noise_percentage: float = 0.02,
+    ) -> None:
+        self.period_sec = period_sec
+        self.peak_sec = peak_sec
+        self.amplitude_percentage = amplitude_percentage
+        self.noise_percentage = noise_percentage
+
+    def next_readings(
+        self,
+        readings: Sequence[int],
+        range_mins: Sequence[int],
+        range_maxs: Sequence[int],
+        now: float,
+        random_generator: Random,
+    ) -> list[int]:
+        # The position on the curve is shared by every sensor of the block.
+        curve: float = cos(2 * pi * (now - self.peak_sec) / self.period_sec)
+        uniform = random_generator.uniform
+        amplitude_percentage: float = self.amplitude_percentage
+        noise_percentage: float = self.noise_percentage
+
+        return [
+            min(
+                range_max,
+                max(
+                    range_min,
+                    round(
+                        (range_min + range_max) / 2
+                        + (range_max - range_min)
+                        * (
+                            amplitude_percentage * curve
+                            + uniform(-noise_percentage, noise_percentage)
+                        )
+                    ),
+                ),
+            )
+            for range_min, range_max in zip(range_mins, range_maxs)
+        ]
@@ -20,3 +20,12 @@ class PhysicalQuantity(StrEnum):
     RELATIVE_TEMPARATURE = "RELATIVE_TEMPARATURE (%)"
     TEMPERATURE = "TEMPARATURE (Degrees Celsius)"
     MOTION = "MOTION (%)"
+
+
+# Physical quantities in declaration order,
+# so that struct-of-arrays storage can keep them as small integer codes.
+PHYSICAL_QUANTITIES: tuple[PhysicalQuantity, ...] = tuple(PhysicalQuantity)
+PHYSICAL_QUANTITY_CODES: dict[PhysicalQuantity, int] = {
+    physical_quantity: code
+    for code, physical_quantity in enumerate(PHYSICAL_QUANTITIES)
+}
@@ -0,0 +1,120 @@
+"""Declarative requirements for scheduler events.
+
+A requirement written as a lambda is opaque to the scheduler.
+A `SensorRequirement` describes the same check as data
+(sensor, comparison mode and threshold),
+so that the scheduler can compile many of them into arrays
+and evaluate them together.
+
+A `SensorRequirement` is still callable,
+so it can be used anywhere a `Callable[[], bool]` requirement is expected.
+
+With a hysteresis band, a satisfied requirement only stops being satisfied
+once the reading moved past the threshold by more than the band,
+so a reading hovering around the threshold does not flip it at every update.
+"""
+
+from src.sensor import ComparisonMode, Sensor
+
+
+class SensorRequirement:
+    """Requirement that compares the reading of a sensor to a threshold.
+
+    Attributes
+    ----------
+    sensor : Sensor
+        The sensor whose reading is compared.
+    sensor_uuid : int
+        The unique identifier of the sensor.
+    mode : ComparisonMode
+        The comparison mode, see `Sensor.compare_sensor_reading`.
+    threshold : int
+        The value the reading is compared to.
+    hysteresis : int
+        The width of the hysteresis band, 0 for none.
+        Once satisfied, the requirement is compared to `release_threshold`.
+        Only ordering comparison modes support a band.
+    """
+
+    def __init__(
+        self,
+        sensor: Sensor,
+        mode: ComparisonMode,
+        threshold: int,
+        hysteresis: int = 0,
+    ) -> None:
+        if hysteresis < 0:
+            raise ValueError("The hysteresis band cannot be negative.")
+        if hysteresis and mode in ("EQ", "NE"):
+            raise ValueError(f"Comparison mode {mode} does not support hysteresis.")
+
+        self._sensor = sensor
+        self._mode: ComparisonMode = mode
+        self._threshold = threshold
+        self._hysteresis = hysteresis
+        # Only used when the requirement is called directly,
+        # compiled requirements keep their state in the rule engine.
+        self._satisfied: bool = False
+
+    def __call__(self) -> bool:
+        """Check the requirement against the current sensor reading."""
+
+        if not self._hysteresis:
+            return self._sensor.compare_sensor_reading(self._mode, self._threshold)
+
+        self._satisfied = self._sensor.compare_sensor_reading(
+            self._mode,
+            self.release_threshold if self._satisfied else self._threshold,
+        )
+
+        return self._satisfied
+
+    def __repr__(self) -> str:
+        return (
+            f"SensorRequirement(sensor_uuid={self.sensor_uuid}, "
+            f"mode={self._mode!r}, threshold={self._threshold}, "
+            f"hysteresis={self._hysteresis})"
+        )
+
+    @property
+    def sensor(self) -> Sensor:
+        """Get the sensor whose reading is compared."""
+
+        return self._sensor
+
+    @property
+    def sensor_uuid(self) -> int:
+        """Get the unique identifier of the sensor."""
+
+        return self._sensor.uuid
+
+    @property
+    def mode(self) -> ComparisonMode:
+        """Get the comparison mode."""
+
+        return self._mode
+
+    @property
+    def threshold(self) -> int:
+        """Get the value the reading is compared to."""
+
+        return self._threshold
+
+    @property
+    def hysteresis(self) -> int:
+        """Get the width of the hysteresis band."""
+
+        return self._hysteresis
+
+    @property
+    def release_threshold(self) -> int:
+        """Get the threshold a satisfied requirement is compared to.
+
+        It is the threshold moved back by the hysteresis band,
+        so that the requirement is released later than it was satisfied.
+        """
+
+        if self._mode in ("GT", "GE"):
+            return self._threshold - self._hysteresis
+
+        return self._threshold + self._hysteresis
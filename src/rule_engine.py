@@ -0,0 +1,424 @@
+"""Rule engine that evaluates the requirements of scheduler events in bulk.
+
+The rule engine compiles every `SensorRequirement` of the registered events
+into per-mode arrays of fleet slots and thresholds.
+The first evaluation is a handful of bulk comparisons,
+one per comparison mode, instead of one Python call per requirement.
+
+After that, evaluation is incremental.
+The engine remembers which requirements are satisfied,
+and how many unsatisfied requirements each event has.
+The requirements of each fleet slot are grouped into a sorted threshold index,
+so when a reading moves from `old` to `new`,
+the requirements whose result flipped are exactly those with a threshold
+between the two readings.
+They are found with a binary search in O(log n + k),
+where k is the number of flipped requirements.
+
+Requirements with a hysteresis band are stateful,
+since their threshold depends on whether they are satisfied.
+They are kept out of the threshold index and checked one by one,
+but only when the reading of their slot changed.
+
+Events with opaque requirements (plain callables, or sensors that are not
+part of the fleet) cannot be compiled.
+They fall back to `SchedulerEvent.should_trigger` on every evaluation.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import eq, ge, gt, le, lt, ne
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
+
+from src.requirement import SensorRequirement
+from src.sensor import ComparisonMode
+from src.sensor_fleet import SensorFleet
+
+if TYPE_CHECKING:
+    from src.scheduler import SchedulerEvent
+
+
+_COMPARISON_OPERATORS: dict[ComparisonMode, Callable[[int, int], bool]] = {
+    "EQ": eq,
+    "NE": ne,
+    "LE": le,
+    "GE": ge,
+    "LT": lt,
+    "GT": gt,
+}
+
+
+class _CompiledComparisons:
+    """Requirements sharing one comparison mode, stored as parallel arrays."""
+
+    def __init__(self, operator: Callable[[int, int], bool]) -> None:
+        self.operator = operator
+        self.slots: array[int] = array("q")
+        self.thresholds: array[int] = array("q")
+        self.requirement_ids: array[int] = array("q")
+
+
+class _ThresholdIndex:
+    """Requirements of one fleet slot, sorted by threshold for each mode.
+
+    For a reading moving between `low` and `high` (`low < high`):
+    - "GT" and "LE" requirements flip when `low <= threshold < high`,
+    - "GE" and "LT" requirements flip when `low < threshold <= high`,
+    - "EQ" and "NE" requirements flip when the threshold is `low` or `high`.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[ComparisonMode, list[tuple[int, int]]] = {}
+
+        # (sorted thresholds, requirement ids in the same order)
+        self.left_closed: tuple[array[int], array[int]] = (array("q"), array("q"))
+        self.right_closed: tuple[array[int], array[int]] = (array("q"), array("q"))
+        self.equalities: dict[int, list[int]] = {}
+
+    def add(self, mode: ComparisonMode, threshold: int, requirement_id: int) -> None:
+        """Add a requirement to the index, `build` must be called afterwards."""
+
+        self._pending.setdefault(mode, []).append((threshold, requirement_id))
+
+    def build(self) -> None:
+        """Sort the added requirements."""
+
+        left_closed: list[tuple[int, int]] = sorted(
+            self._pending.get("GT", []) + self._pending.get("LE", [])
+        )
+        right_closed: list[tuple[int, int]] = sorted(
+            self._pending.get("GE", []) + self._pending.get("LT", [])
+        )
+
+        self.left_closed = (
+            array("q", [threshold for threshold, _ in left_closed]),
+            array("q", [requirement_id for _, requirement_id in left_closed]),
+        )
+        self.right_closed = (
+            array("q", [threshold for threshold, _ in right_closed]),
+            array("q", [requirement_id for _, requirement_id in right_closed]),
+        )
+
+        self.equalities = {}
+        for threshold, requirement_id in self._pending.get(
+            "EQ", []
+        ) + self._pending.get("NE", []):
+            self.equalities.setdefault(threshold, []).append(requirement_id)
+
+        self._pending = {}
+
+    def flipped(self, old_reading: int, new_reading: int) -> list[int]:
+        """Return the requirements whose result changes between two readings."""
+
+        low, high = sorted((old_reading, new_reading))
+
+        thresholds, requirement_ids = self.left_closed
+        flipped: list[int] = requirement_ids[
+            bisect_left(thresholds, low) : bisect_left(thresholds, high)
+        ].tolist()
+
+        thresholds, requirement_ids = self.right_closed
+        flipped.extend(
+            requirement_ids[
+                bisect_right(thresholds, low) : bisect_right(thresholds, high)
+            ]
+        )
+
+        flipped.extend(self.equalities.get(low, ()))
+        flipped.extend(self.equalities.get(high, ()))
+
+        return flipped
+
+
+class _HysteresisRequirement(NamedTuple):
+    """Compiled requirement with a hysteresis band."""
+
+    requirement_id: int
+    operator: Callable[[int, int], bool]
+    threshold: int
+    release_threshold: int
+
+
+class RuleEngine:
+    """Compile and evaluate the requirements of scheduler events."""
+
+    def __init__(self) -> None:
+        self._fleet: SensorFleet = SensorFleet()
+        self._event_count: int = 0
+        self._comparisons: list[_CompiledComparisons] = []
+        self._fallback_events: list[tuple[int, SchedulerEvent]] = []
+
+        # Per-slot threshold indices and the readings they were last evaluated at.
+        self._threshold_indices: dict[int, _ThresholdIndex] = {}
+        self._evaluated_readings: dict[int, int] = {}
+        # Per-slot requirements with a hysteresis band.
+        self._hysteresis_requirements: dict[int, list[_HysteresisRequirement]] = {}
+
+        # Incremental state: the event of each requirement,
+        # whether each requirement is satisfied,
+        # and the number of unsatisfied requirements of each event.
+        self._requirement_events: array[int] = array("q")
+        self._satisfied: bytearray = bytearray()
+        self._unsatisfied_counts: array[int] = array("q")
+
+        self._should_trigger: list[bool] = []
+        self._needs_full_evaluation: bool = True
+
+    def compile(
+        self,
+        events: list[SchedulerEvent],
+        fleet: SensorFleet,
+    ) -> None:
+        """Compile the requirements of the events against a sensor fleet.
+
+        Parameters
+        ----------
+        events : list[SchedulerEvent]
+            The events to compile, in evaluation order.
+        fleet : SensorFleet
+            The fleet that stores the readings of the required sensors.
+        """
+
+        comparisons: dict[ComparisonMode, _CompiledComparisons] = {}
+        fallback_events: list[tuple[int, SchedulerEvent]] = []
+        threshold_indices: dict[int, _ThresholdIndex] = {}
+        hysteresis_requirements: dict[int, list[_HysteresisRequirement]] = {}
+        requirement_events: array[int] = array("q")
+
+        for event_index, event in enumerate(events):
+            requirements = event.requirements
+            if not all(
+                isinstance(requirement, SensorRequirement)
+                and requirement.sensor._fleet is fleet
+                for requirement in requirements
+            ):
+                fallback_events.append((event_index, event))
+                continue
+
+            for requirement in requirements:
+                assert isinstance(requirement, SensorRequirement)
+                mode: ComparisonMode = requirement.mode
+                if mode not in _COMPARISON_OPERATORS:
+                    # Mirror `Sensor.compare_sensor_reading`,
+                    # which treats unknown modes as "LE".
+                    mode = "LE"
+
+                requirement_id: int = len(requirement_events)
+                requirement_events.append(event_index)
+
+                slot: int = requirement.sensor._fleet_index
+                if requirement.hysteresis:
+                    hysteresis_requirements.setdefault(slot, []).append(
+                        _HysteresisRequirement(
+                            requirement_id,
+                            _COMPARISON_OPERATORS[mode],
+                            requirement.threshold,
+                            requirement.release_threshold,
+                        )
+                    )
+                    continue
+
+                if mode not in comparisons:
+                    comparisons[mode] = _CompiledComparisons(
+                        _COMPARISON_OPERATORS[mode]
+                    )
+                compiled: _CompiledComparisons = comparisons[mode]
+                compiled.slots.append(slot)
+                compiled.thresholds.append(requirement.threshold)
+                compiled.requirement_ids.append(requirement_id)
+
+                if slot not in threshold_indices:
+                    threshold_indices[slot] = _ThresholdIndex()
+                threshold_indices[slot].add(mode, requirement.threshold, requirement_id)
+
+        for threshold_index in threshold_indices.values():
+            threshold_index.build()
+
+        self._fleet = fleet
+        self._event_count = len(events)
+        self._comparisons = list(comparisons.values())
+        self._fallback_events = fallback_events
+        self._threshold_indices = threshold_indices
+        self._hysteresis_requirements = hysteresis_requirements
+        self._evaluated_readings = {}
+        self._requirement_events = requirement_events
+        self._satisfied = bytearray(len(requirement_events))
+        self._unsatisfied_counts = array("q", bytes(8 * len(events)))
+        self._should_trigger = [True] * len(events)
+        self._needs_full_evaluation = True
+
+    def evaluate(self, changed_slots: Iterable[int] | None = None) -> list[bool]:
+        """Evaluate the compiled events.
+
+        The first evaluation after `compile` always checks every event.
+        After that, only the requirements on `changed_slots` whose result
+        flipped are updated, and the other events keep their previous result.
+        Events with opaque requirements are checked every time.
+
+        Parameters
+        ----------
+        changed_slots : Iterable[int] | None, optional
+            The fleet slots whose reading changed since the last evaluation.
+            If None, every event is checked, by default None
+
+        Returns
+        -------
+        list[bool]
+            Whether each event should trigger, in compilation order.
+            The list is owned by the engine and must not be modified by the caller.
+        """
+
+        if changed_slots is None or self._needs_full_evaluation:
+            self._evaluate_all()
+            self._needs_full_evaluation = False
+        else:
+            self._evaluate_changed(changed_slots)
+
+        should_trigger: list[bool] = self._should_trigger
+        for event_index, event in self._fallback_events:
+            should_trigger[event_index] = event.should_trigger()
+
+        return should_trigger
+
+    def _evaluate_all(self) -> None:
+        """Check every compiled requirement in bulk, one pass per mode."""
+
+        readings = self._fleet.readings
+        requirement_events: array[int] = self._requirement_events
+        # Requirements with a hysteresis band depend on their previous state.
+        was_satisfied: bytearray = self._satisfied
+        satisfied: bytearray = bytearray(len(requirement_events))
+        unsatisfied_counts: array[int] = array("q", bytes(8 * self._event_count))
+
+        for compiled in self._comparisons:
+            results = map(
+                compiled.operator,
+                map(readings.__getitem__, compiled.slots),
+                compiled.thresholds,
+            )
+            for requirement_id, result in zip(compiled.requirement_ids, results):
+                if result:
+                    satisfied[requirement_id] = 1
+                else:
+                    unsatisfied_counts[requirement_events[requirement_id]] += 1
+
+        for slot, requirements in self._hysteresis_requirements.items():
+            reading: int = readings[slot]
+            for requirement in requirements:
+                requirement_id = requirement.requirement_id
+                if requirement.operator(
+                    reading,
+                    (
+                        requirement.release_threshold
+                        if was_satisfied[requirement_id]
+                        else requirement.threshold
+                    ),
+                ):
+                    satisfied[requirement_id] = 1
+                else:
+                    unsatisfied_counts[requirement_events[requirement_id]] += 1
+
+        self._satisfied = satisfied
+        self._unsatisfied_counts = unsatisfied_counts
+        self._should_trigger = [count == 0 for count in unsatisfied_counts]
+        self._evaluated_readings = {
+            slot: readings[slot] for slot in self._threshold_indices
+        }
+
+    def _evaluate_changed(self, changed_slots: Iterable[int]) -> None:
+        """Flip the requirements whose threshold lies between old and new readings."""
+
+        readings = self._fleet.readings
+        threshold_indices: dict[int, _ThresholdIndex] = self._threshold_indices
+        evaluated_readings: dict[int, int] = self._evaluated_readings
+        requirement_events: array[int] = self._requirement_events
+        satisfied: bytearray = self._satisfied
+        unsatisfied_counts: array[int] = self._unsatisfied_counts
+        should_trigger: list[bool] = self._should_trigger
+        hysteresis_requirements: dict[
+            int, list[_HysteresisRequirement]
+        ] = self._hysteresis_requirements
+
+        for slot in changed_slots:
+            if slot in hysteresis_requirements:
+                self._evaluate_hysteresis(hysteresis_requirements[slot], slot)
+
+            threshold_index: _ThresholdIndex | None = threshold_indices.get(slot)
+            if threshold_index is None:
+                continue
+
+            old_reading: int = evaluated_readings[slot]
+            new_reading: int = readings[slot]
+            if old_reading == new_reading:
+                continue
+            evaluated_readings[slot] = new_reading
+
+            for requirement_id in threshold_index.flipped(old_reading, new_reading):
+                event_index: int = requirement_events[requirement_id]
+                if satisfied[requirement_id]:
+                    satisfied[requirement_id] = 0
+                    unsatisfied_counts[event_index] += 1
+                else:
+                    satisfied[requirement_id] = 1
+                    unsatisfied_counts[event_index] -= 1
+                should_trigger[event_index] = unsatisfied_counts[event_index] == 0
+
+    def _evaluate_hysteresis(
+        self,
+        requirements: list[_HysteresisRequirement],
+        slot: int,
+    ) -> None:
+        """Check the requirements with a hysteresis band on a changed slot."""
+
+        reading: int = self._fleet.readings[slot]
+        requirement_events: array[int] = self._requirement_events
+        satisfied: bytearray = self._satisfied
+        unsatisfied_counts: array[int] = self._unsatisfied_counts
+
+        for requirement in requirements:
+            requirement_id: int = requirement.requirement_id
+            was_satisfied: int = satisfied[requirement_id]
+            is_satisfied: bool = requirement.operator(
+                reading,
+                requirement.release_threshold
+                if was_satisfied
+                else requirement.threshold,
+            )
+            if is_satisfied == bool(was_satisfied):
+                continue
+
+            event_index: int = requirement_events[requirement_id]
+            satisfied[requirement_id] = is_satisfied
+            unsatisfied_counts[event_index] += -1 if is_satisfied else 1
+            self._should_trigger[event_index] = unsatisfied_counts[event_index] == 0
+
+    def restore_satisfied(self, satisfied: bytes | memoryview) -> None:
+        """Restore which compiled requirements are satisfied, one byte each.
+
+        Only the requirements with a hysteresis band depend on it,
+        the others are evaluated again at the next evaluation,
+        which checks every event.
+        """
+
+        if len(satisfied) != len(self._requirement_events):
+            raise ValueError("The number of requirements does not match.")
+
+        self._satisfied = bytearray(satisfied)
+        self._needs_full_evaluation = True
+
+    @property
+    def satisfied(self) -> bytearray:
+        """Return whether each compiled requirement is satisfied, one byte each.
+
+        The array is owned by the engine and must not be modified by the caller.
+        """
+
+        return self._satisfied
+
+    @property
+    def compiled_requirement_count(self) -> int:
+        """Return the number of requirements evaluated in bulk."""
+
+        return len(self._requirement_events)
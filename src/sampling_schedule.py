@@ -0,0 +1,130 @@
+"""Per-sensor and per-event sampling schedule.
+
+Sensors and events may have their own sampling interval.
+Everything sharing an interval forms one sampling group,
+and the groups are kept in a priority queue ordered by their next due time.
+The scheduler wakes up only for the group that is due next,
+so slow sensors are not polled at the rate of fast ones,
+and the size of the queue depends on the number of distinct intervals,
+not on the number of sensors.
+"""
+
+from __future__ import annotations
+
+from heapq import heapify, heappop, heappush
+from typing import TYPE_CHECKING, Iterable
+
+from src.sensor import Sensor
+
+if TYPE_CHECKING:
+    from src.scheduler import SchedulerEvent
+
+
+# Clocks have microsecond resolution,
+# so due times within a microsecond of now are considered due.
+_DUE_TOLERANCE_SEC: float = 1e-6
+
+
+class SamplingGroup:
+    """Sensors and events sharing a sampling interval.
+
+    Attributes
+    ----------
+    interval_sec : float
+        The sampling interval of the group.
+    sensors : list[Sensor]
+        The sensors updated when the group is due.
+    event_indices : list[int]
+        The registration indices of the events that may trigger when the group is due.
+    """
+
+    def __init__(self, interval_sec: float) -> None:
+        self.interval_sec = interval_sec
+        self.sensors: list[Sensor] = []
+        self.event_indices: list[int] = []
+
+
+class SamplingSchedule:
+    """Priority queue of sampling groups ordered by their next due time."""
+
+    def __init__(self) -> None:
+        self._groups: list[SamplingGroup] = []
+        # (due time, group index) pairs.
+        self._heap: list[tuple[float, int]] = []
+
+    def build(
+        self,
+        sensors: Iterable[Sensor],
+        events: list[SchedulerEvent],
+        default_interval_sec: float,
+        start: float,
+    ) -> None:
+        """Group sensors and events by interval, all of them due at `start`.
+
+        Parameters
+        ----------
+        sensors : Iterable[Sensor]
+            The sensors to schedule.
+        events : list[SchedulerEvent]
+            The events to schedule, in registration order.
+        default_interval_sec : float
+            The interval of sensors and events without their own.
+        start : float
+            The timestamp at which every group is first due.
+        """
+
+        groups: dict[float, SamplingGroup] = {}
+
+        for sensor in sensors:
+            interval_sec: float = sensor.sampling_interval_sec or default_interval_sec
+            if interval_sec not in groups:
+                groups[interval_sec] = SamplingGroup(interval_sec)
+            groups[interval_sec].sensors.append(sensor)
+
+        for event_index, event in enumerate(events):
+            interval_sec = event.interval_sec or default_interval_sec
+            if interval_sec not in groups:
+                groups[interval_sec] = SamplingGroup(interval_sec)
+            groups[interval_sec].event_indices.append(event_index)
+
+        self._groups = list(groups.values())
+        self._heap = [(start, group_index) for group_index in range(len(self._groups))]
+        heapify(self._heap)
+
+    def pop_due(self, now: float) -> list[SamplingGroup]:
+        """Return the groups due at `now` and schedule their next due time.
+
+        A group that fell behind by more than one interval
+        is rescheduled one interval after `now` instead of catching up.
+        """
+
+        heap: list[tuple[float, int]] = self._heap
+        due_entries: list[tuple[float, int]] = []
+        while heap and heap[0][0] <= now + _DUE_TOLERANCE_SEC:
+            due_entries.append(heappop(heap))
+
+        due_groups: list[SamplingGroup] = []
+        for due_time, group_index in due_entries:
+            group: SamplingGroup = self._groups[group_index]
+            due_groups.append(group)
+
+            next_due_time: float = due_time + group.interval_sec
+            if next_due_time <= now:
+                next_due_time = now + group.interval_sec
+            heappush(heap, (next_due_time, group_index))
+
+        return due_groups
+
+    def next_due_time(self) -> float | None:
+        """Return the time at which the next group is due, if any."""
+
+        if not self._heap:
+            return None
+
+        return self._heap[0][0]
+
+    @property
+    def groups(self) -> list[SamplingGroup]:
+        """Return the sampling groups."""
+
+        return self._groups
@@ -1,41 +1,167 @@
 """Scheduler that can be used to schedule events and update sensors."""
 
 
-from time import sleep
-from typing import Callable
-
+from array import array
+from enum import StrEnum
+from itertools import compress
+from threading import Lock
+from time import perf_counter_ns
+from typing import Callable, Iterable, Sequence, ValuesView
+
+from src.clock import WALL_CLOCK, Clock
 from src.sensor import Sensor
+from src.sensor_fleet import SensorFleet
 from src.device import Device
+from src.device_command import CoalescePolicy, CommandBuffer, DeviceCommand
+from src.physical_quantity import PhysicalQuantity
+from src.event_gate import EventGates
+from src.event_log import EventRecord, RecordKind
+from src.instrumentation import Instrumentation, TickPhase
+from src.rule_engine import RuleEngine
+from src.sampling_schedule import SamplingGroup, SamplingSchedule
+
+
+class LogMode(StrEnum):
+    """What the scheduler logs and records at every tick.
+
+    - FULL: every updated sensor and every device write.
+    - DELTA: only the sensors and devices whose value changed.
+      The log of an action that is not a `DeviceCommand` is left out
+      if it wrote devices and none of them changed,
+      an action that wrote no device is always logged.
+    """
+
+    FULL = "FULL"
+    DELTA = "DELTA"
 
 
 class SchedulerEvent:
-    """Scheduler event that can be triggered by a set of requirements and actions."""
+    """Scheduler event that can be triggered by a set of requirements and actions.
+
+    Requirements are usually `SensorRequirement` instances,
+    which the scheduler can compile and evaluate in bulk.
+    Any other callable returning a boolean is accepted as well,
+    but it has to be called one by one.
+
+    By default, the event may trigger at every update of the scheduler.
+    With `interval_sec`, it may only trigger at its own interval.
+
+    Actions that are `DeviceCommand` instances are merged by the scheduler
+    with the commands of the other events triggered in the same tick,
+    and applied after the other actions of the tick.
+    An action that writes a device overrides the commands added for it before,
+    so the last declared write of a device still wins.
+    `priority` decides between conflicting commands
+    when the scheduler uses `CoalescePolicy.PRIORITY`.
+
+    An event fires whenever its requirements are met, unless it is gated,
+    see `EventGates`: with `edge_triggered`, it only fires when they become met,
+    with `debounce_sec`, they must have been met for that long,
+    and with `cooldown_sec`, it waits that long before firing again.
+    """
 
     def __init__(
         self,
         *,
         actions: list[Callable[[], str]],
         requirements: list[Callable[[], bool]],
+        interval_sec: float | None = None,
+        priority: int = 0,
+        edge_triggered: bool = False,
+        debounce_sec: float | None = None,
+        cooldown_sec: float | None = None,
     ) -> None:
         self.__actions = actions
         self.__requirements = requirements
+        self.interval_sec = interval_sec
+        self.priority = priority
+        self.edge_triggered = edge_triggered
+        self.debounce_sec = debounce_sec
+        self.cooldown_sec = cooldown_sec
 
     def should_trigger(self) -> bool:
         """Check if all requirements are met."""
 
         return all(req() for req in self.__requirements)
 
-    def trigger_actions(self) -> list[str]:
-        """Trigger all actions and return the log."""
+    def trigger_actions(
+        self,
+        commands: CommandBuffer | None = None,
+        run_action: Callable[[Callable[[], str]], str | None] | None = None,
+        event_index: int = -1,
+    ) -> list[str]:
+        """Trigger all actions and return the log.
+
+        If `commands` is given, device commands are added to it
+        instead of being applied, and are not part of the log,
+        `event_index` identifies the event in the buffer.
+        If `run_action` is given, the other actions are called through it,
+        and the logs it returns as None are left out.
+        """
+
+        if commands is None:
+            return [action() for action in self.__actions]
+
+        action_logs: list[str] = []
+        for action in self.__actions:
+            if isinstance(action, DeviceCommand):
+                commands.add(action, self.priority, event_index)
+            elif run_action is None:
+                action_logs.append(action())
+            else:
+                action_log: str | None = run_action(action)
+                if action_log is not None:
+                    action_logs.append(action_log)
 
-        return [action() for action in self.__actions]
+        return action_logs
+
+    @property
+    def requirements(self) -> list[Callable[[], bool]]:
+        """Return the requirements of the event."""
+
+        return self.__requirements
 
 
 class Scheduler:
-    """Scheduler that can be used to schedule events and update sensors."""
+    """Scheduler that can be used to schedule events and update sensors.
+
+    The scheduler paces itself and timestamps its records with its clock.
+    Registered sensors and devices share the same clock.
+    With a `VirtualClock`, the autopilot and `simulate` run as fast as the CPU
+    allows (or at the speed-up of the clock), stamped with simulated time.
+
+    Sensors and events may have their own sampling interval,
+    otherwise `update_interval_sec` is used.
+    The autopilot wakes up whenever the next sampling group is due,
+    and only updates the sensors and events of the groups that are due.
+    A manual update always updates everything.
+
+    User interfaces running on another thread should not redraw from the
+    dispatch callback, but poll `pop_changed_uuids` at their own pace.
+
+    If `instrumentation` is set, every phase of every tick is timed,
+    as well as the actions of every triggered event.
+
+    The device commands of the events triggered in one tick are merged
+    according to `coalesce_policy`, then each device is written once.
+
+    With `LogMode.DELTA`, repeated values are neither logged nor recorded.
+    If `keyframe_interval_sec` is also set, a keyframe with the full state
+    of every sensor and device is emitted at that interval,
+    starting with the first tick.
+    """
 
-    def __init__(self, update_interval_sec: int = 5) -> None:
+    def __init__(
+        self,
+        update_interval_sec: float = 5,
+        clock: Clock = WALL_CLOCK,
+    ) -> None:
         self.update_interval_sec = update_interval_sec
+        self.clock = clock
+        self.instrumentation: Instrumentation | None = None
+        self.coalesce_policy: CoalescePolicy = CoalescePolicy.LAST_WRITER
+        self.log_mode: LogMode = LogMode.FULL
+        self.keyframe_interval_sec: float | None = None
 
         self._running: bool = False
 
@@ -43,16 +169,169 @@ class Scheduler:
         self._record_sensors: dict[int, Sensor] = {}
         self._record_devices: dict[int, Device] = {}
 
+        # Secondary indexes of the registry, by physical quantity and by name.
+        # Every physical quantity has an entry, so that views of them stay live.
+        self._sensors_by_kind: dict[PhysicalQuantity, dict[int, Sensor]] = {
+            physical_quantity: {} for physical_quantity in PhysicalQuantity
+        }
+        self._devices_by_kind: dict[PhysicalQuantity, dict[int, Device]] = {
+            physical_quantity: {} for physical_quantity in PhysicalQuantity
+        }
+        self._sensors_by_name: dict[str, list[Sensor]] = {}
+        self._devices_by_name: dict[str, list[Device]] = {}
+
+        # Registered sensors are attached to the fleet,
+        # so that they can be updated in one batched step.
+        self._sensor_fleet: SensorFleet = SensorFleet()
+
+        # Requirements of the events are compiled lazily,
+        # and recompiled whenever the registry changes.
+        self._rule_engine: RuleEngine = RuleEngine()
+        self._rules_compiled: bool = False
+        # Rebuilt along with the rules.
+        self._event_gates: EventGates = EventGates()
+
+        # The sampling schedule is also built lazily.
+        self._sampling_schedule: SamplingSchedule = SamplingSchedule()
+        self._sampling_scheduled: bool = False
+
+        # (uuid, value) of every device write since the last tick,
+        # reported to the record listeners.
+        self._device_updates: list[tuple[int, int]] = []
+        # Last recorded value of every device, to leave out repeats in delta mode.
+        self._recorded_device_values: dict[int, int] = {}
+        # Last written value of every device, and the number of writes
+        # that changed a value, to leave out the logs of idle actions.
+        self._device_values: dict[int, int] = {}
+        self._device_change_count: int = 0
+        self._next_keyframe_time: float | None = None
+        self._record_listeners: list[Callable[[list[EventRecord]], None]] = []
+
+        # Uuids of the sensors and devices that changed since the last
+        # `pop_changed_uuids`, only tracked once someone asked for them.
+        self._changed_uuids: set[int] | None = None
+        self._changed_uuids_lock: Lock = Lock()
+
+    def seed(self, seed: int | None) -> None:
+        """Seed the random generator of the sensors, for reproducible runs.
+
+        Registered sensors draw from it whenever they are updated,
+        including through `Sensor.update_sensor_value`,
+        actions keep their own randomness.
+        """
+
+        self._sensor_fleet.seed(seed)
+
+    def event_state(self) -> tuple[bytes, bytes, bytes, bytes, bytes]:
+        """Return the state of the events as native bytes.
+
+        Returns
+        -------
+        tuple[bytes, bytes, bytes, bytes, bytes]
+            Whether each compiled requirement is satisfied, one byte each,
+            followed by the state of the gated events, see `EventGates.state`.
+        """
+
+        self._compile_rules()
+
+        return (bytes(self._rule_engine.satisfied), *self._event_gates.state())
+
+    def restore_event_state(
+        self,
+        satisfied: bytes | memoryview,
+        gate_levels: bytes | memoryview,
+        gate_armed: bytes | memoryview,
+        gate_met_since: bytes | memoryview,
+        gate_ready_at: bytes | memoryview,
+    ) -> None:
+        """Restore the state returned by `event_state`, for the same events.
+
+        Raises
+        ------
+        ValueError
+            If the scheduler does not have the same events.
+        """
+
+        self._compile_rules()
+
+        self._rule_engine.restore_satisfied(satisfied)
+        self._event_gates.restore_state(
+            gate_levels, gate_armed, gate_met_since, gate_ready_at
+        )
+
+    def restore_device_values(self, device_values: Sequence[int]) -> None:
+        """Restore the values of the registered devices, in registration order.
+
+        The restored values are not reported as writes.
+
+        Raises
+        ------
+        ValueError
+            If the number of values does not match the registered devices.
+        """
+
+        if len(device_values) != len(self._record_devices):
+            raise ValueError("The number of devices does not match.")
+
+        for device, device_value in zip(self._record_devices.values(), device_values):
+            device.restore_device_value(device_value)
+            self._recorded_device_values[device.uuid] = device_value
+            self._device_values[device.uuid] = device_value
+
+    def resume_from_restored_state(self) -> None:
+        """Start over from a restored state at the next tick.
+
+        The sampling schedule is rebuilt from the current time,
+        the next tick is a keyframe if keyframes are enabled,
+        and every sensor and device counts as changed.
+        """
+
+        self._sampling_scheduled = False
+        self._next_keyframe_time = None
+        if self._changed_uuids is not None:
+            with self._changed_uuids_lock:
+                self._changed_uuids.update(self._record_sensors)
+                self._changed_uuids.update(self._record_devices)
+
+    def subscribe_records(
+        self,
+        listener: Callable[[list[EventRecord]], None],
+    ) -> None:
+        """Receive the binary event records of every tick.
+
+        After each tick, the listener is called with one record per sensor
+        and one record per device write since the previous tick.
+        """
+
+        self._record_listeners.append(listener)
+
+    def pop_changed_uuids(self) -> set[int]:
+        """Return the uuids of the sensors and devices that changed, and reset them.
+
+        Tracking starts with the first call, which returns every registered uuid.
+        This may be called from another thread than the one running the ticks.
+        """
+
+        with self._changed_uuids_lock:
+            changed_uuids: set[int] | None = self._changed_uuids
+            self._changed_uuids = set()
+
+        if changed_uuids is None:
+            return set(self._record_sensors) | set(self._record_devices)
+
+        return changed_uuids
+
     def manual_update(
         self,
-        dispatch_event: Callable[[list[str]], None],
+        dispatch_event: Callable[[list[str]], None] | None = None,
     ) -> None:
-        """Manually update the sensors and evaluate the events."""
+        """Manually update the sensors and evaluate the events.
 
-        sensor_logs: list[str] = self.__update_sensors()
-        event_logs: list[str] = self.__evaluate_events()
+        If `dispatch_event` is None, no sensor log text is formatted,
+        which is useful when only binary event records are consumed.
+        """
 
-        dispatch_event(sensor_logs + event_logs)
+        self._run_tick(dispatch_event)
 
     def stop(self) -> None:
         """Stop the scheduler."""
@@ -64,7 +343,7 @@ class Scheduler:
 
     def autopilot(
         self,
-        dispatch_event: Callable[[list[str]], None],
+        dispatch_event: Callable[[list[str]], None] | None,
         debug: bool = False,
     ) -> None:
         """Start the scheduler.
@@ -75,40 +354,454 @@ class Scheduler:
         """
 
         while self._running:
-            sensor_logs: list[str] = self.__update_sensors()
-            event_logs: list[str] = self.__evaluate_events()
+            self.clock.sleep(self.__run_due_groups(dispatch_event))
 
+            if debug:
+                break
+
+    def simulate(
+        self,
+        step_count: int,
+        dispatch_event: Callable[[list[str]], None] | None = None,
+    ) -> None:
+        """Run a fixed number of autopilot steps, sleeping on the clock between them.
+
+        Unlike the autopilot, this does not depend on the running state.
+        It is meant to replay automation behavior with a `VirtualClock`.
+        """
+
+        for _ in range(step_count):
+            self.clock.sleep(self.__run_due_groups(dispatch_event))
+
+    def __run_due_groups(
+        self,
+        dispatch_event: Callable[[list[str]], None] | None,
+    ) -> float:
+        """Run the sampling groups that are due.
+
+        Returns
+        -------
+        float
+            The number of seconds until the next group is due.
+        """
+
+        now: float = self.clock.now().timestamp()
+
+        due_groups: list[SamplingGroup] | None = self._pop_due_groups(now)
+        if due_groups is None or due_groups:
+            self._run_tick(dispatch_event, due_groups)
+
+        return self._delay_until_next_group(now)
+
+    def _pop_due_groups(self, now: float) -> list[SamplingGroup] | None:
+        """Pop the sampling groups that are due at `now`.
+
+        Returns
+        -------
+        list[SamplingGroup] | None
+            The due groups, or None if every group is due,
+            which is the common case and allows updating the whole fleet at once.
+        """
+
+        if not self._sampling_scheduled:
+            self._sampling_schedule.build(
+                self._record_sensors.values(),
+                self._scheduler_events,
+                self.update_interval_sec,
+                now,
+            )
+            self._sampling_scheduled = True
+
+        due_groups: list[SamplingGroup] = self._sampling_schedule.pop_due(now)
+        if len(due_groups) == len(self._sampling_schedule.groups):
+            return None
+
+        return due_groups
+
+    def _delay_until_next_group(self, now: float) -> float:
+        """Return the number of seconds from `now` until the next group is due."""
+
+        next_due_time: float | None = self._sampling_schedule.next_due_time()
+        if next_due_time is None:
+            return self.update_interval_sec
+
+        return max(0.0, next_due_time - now)
+
+    def _run_tick(
+        self,
+        dispatch_event: Callable[[list[str]], None] | None,
+        due_groups: list[SamplingGroup] | None = None,
+    ) -> None:
+        """Update the sensors, evaluate the events and dispatch the logs.
+
+        If `due_groups` is given, only the sensors and events of those groups
+        are updated and allowed to trigger.
+        """
+
+        due_sensors: list[Sensor] | None = None
+        due_event_indices: list[int] | None = None
+        if due_groups is not None:
+            due_sensors = [sensor for group in due_groups for sensor in group.sensors]
+            due_event_indices = sorted(
+                event_index
+                for group in due_groups
+                for event_index in group.event_indices
+            )
+
+        changes_only: bool = False
+        keyframe: bool = False
+        if self.log_mode is LogMode.DELTA:
+            keyframe = self._pop_keyframe_due()
+            changes_only = not keyframe
+
+        sensor_logs: list[str]
+        reported_sensors: list[Sensor] | None
+        instrumentation: Instrumentation | None = self.instrumentation
+        if instrumentation is None:
+            sensor_logs, reported_sensors = self.__update_sensors(
+                dispatch_event is not None,
+                due_sensors,
+                changes_only,
+                keyframe,
+            )
+            event_logs: list[str] = self.__trigger_events(
+                self.__evaluate_events(due_event_indices),
+                None,
+                changes_only,
+                keyframe,
+            )
+
+            if dispatch_event is not None:
+                dispatch_event(sensor_logs + event_logs)
+
+            self.__dispatch_records(reported_sensors, changes_only, keyframe)
+            return
+
+        # Same as above, with every phase timed.
+        started_at: int = perf_counter_ns()
+        sensor_logs, reported_sensors = self.__update_sensors(
+            dispatch_event is not None,
+            due_sensors,
+            changes_only,
+            keyframe,
+        )
+        finished_at: int = perf_counter_ns()
+        instrumentation.record_span(TickPhase.UPDATE_SENSORS, finished_at - started_at)
+
+        started_at = finished_at
+        triggered_event_indices: list[int] = self.__evaluate_events(due_event_indices)
+        finished_at = perf_counter_ns()
+        instrumentation.record_span(
+            TickPhase.EVALUATE_REQUIREMENTS,
+            finished_at - started_at,
+        )
+
+        started_at = finished_at
+        event_logs = self.__trigger_events(
+            triggered_event_indices,
+            instrumentation,
+            changes_only,
+            keyframe,
+        )
+        finished_at = perf_counter_ns()
+        instrumentation.record_span(TickPhase.TRIGGER_ACTIONS, finished_at - started_at)
+
+        if dispatch_event is not None:
+            started_at = finished_at
             dispatch_event(sensor_logs + event_logs)
+            finished_at = perf_counter_ns()
+            instrumentation.record_span(
+                TickPhase.DISPATCH_LOGS,
+                finished_at - started_at,
+            )
 
-            sleep(self.update_interval_sec)
+        started_at = finished_at
+        self.__dispatch_records(reported_sensors, changes_only, keyframe)
+        instrumentation.record_span(
+            TickPhase.DISPATCH_RECORDS,
+            perf_counter_ns() - started_at,
+        )
 
-            if debug:
-                break
+    def _pop_keyframe_due(self) -> bool:
+        """Return whether a keyframe is due, and schedule the next one if so."""
+
+        if self.keyframe_interval_sec is None:
+            return False
 
-    def __update_sensors(self) -> list[str]:
-        """Update registered sensors."""
+        now: float = self.clock.now().timestamp()
+        if self._next_keyframe_time is not None and now < self._next_keyframe_time:
+            return False
 
-        loggable_texts: list[str] = []
-        for _, sensor in self._record_sensors.items():
-            loggable_text: str = sensor.update_sensor_value()
-            loggable_texts.append(loggable_text)
+        self._next_keyframe_time = now + self.keyframe_interval_sec
 
-        return loggable_texts
+        return True
 
-    def __evaluate_events(self) -> list[str]:
+    def _compile_rules(self) -> None:
+        """Compile the requirements and gates of the events, if the registry changed."""
+
+        if self._rules_compiled:
+            return
+
+        self._rule_engine.compile(self._scheduler_events, self._sensor_fleet)
+        self._event_gates.build(self._scheduler_events)
+        self._rules_compiled = True
+
+    def __update_sensors(
+        self,
+        format_logs: bool = True,
+        due_sensors: list[Sensor] | None = None,
+        changes_only: bool = False,
+        keyframe: bool = False,
+    ) -> tuple[list[str], list[Sensor] | None]:
+        """Update registered sensors, or only the due sensors if given.
+
+        Returns
+        -------
+        tuple[list[str], list[Sensor] | None]
+            The logs of the sensors to report,
+            and those sensors, or None if every sensor is reported.
+            Only the sensors whose reading changed are reported if
+            `changes_only` is True, and every sensor is reported on a keyframe.
+        """
+
+        now: float = self.clock.now().timestamp()
+        if due_sensors is None:
+            self._sensor_fleet.step(now)
+        else:
+            self._sensor_fleet.step_slots(
+                (sensor._fleet_index for sensor in due_sensors),
+                now,
+            )
+
+        reported_sensors: list[Sensor] | None = due_sensors
+        if keyframe:
+            reported_sensors = None
+        elif changes_only:
+            # The dirty slots are popped when the events are evaluated.
+            fleet: SensorFleet = self._sensor_fleet
+            reported_sensors = [
+                sensor
+                for slot in fleet.peek_dirty()
+                if (sensor := fleet.sensor(slot)) is not None
+            ]
+
+        if not format_logs:
+            return [], reported_sensors
+
+        sensors: Iterable[Sensor] = (
+            self._record_sensors.values()
+            if reported_sensors is None
+            else reported_sensors
+        )
+
+        return [sensor.get_loggable_text(False) for sensor in sensors], reported_sensors
+
+    def __evaluate_events(
+        self, due_event_indices: list[int] | None = None
+    ) -> list[int]:
         """Check the requirements of the events in the scheduler.
 
-        If an event should be triggered,
-        the actions of the event are executed and logged.
+        If `due_event_indices` is given, only those events may trigger.
+
+        Returns
+        -------
+        list[int]
+            The indices of the events that should be triggered, in order.
+        """
+        self._compile_rules()
+
+        # Only the events depending on sensors that changed are checked again,
+        # and the slots of detached sensors are left out.
+        fleet: SensorFleet = self._sensor_fleet
+        live: bytearray = fleet.live
+        changed_slots: set[int] = {slot for slot in fleet.pop_dirty() if live[slot]}
+        if self._changed_uuids is not None:
+            uuids: array[int] = fleet.uuids
+            with self._changed_uuids_lock:
+                self._changed_uuids.update(uuids[slot] for slot in changed_slots)
+
+        should_trigger: list[bool] = self._rule_engine.evaluate(changed_slots)
+
+        triggered_event_indices: list[int]
+        if due_event_indices is None:
+            triggered_event_indices = list(
+                compress(range(len(should_trigger)), should_trigger)
+            )
+        else:
+            triggered_event_indices = [
+                event_index
+                for event_index in due_event_indices
+                if should_trigger[event_index]
+            ]
+
+        if not self._event_gates:
+            return triggered_event_indices
+
+        return self._event_gates.filter(
+            triggered_event_indices,
+            should_trigger,
+            due_event_indices,
+            self.clock.now().timestamp(),
+        )
+
+    def __trigger_events(
+        self,
+        event_indices: Iterable[int],
+        instrumentation: Instrumentation | None = None,
+        changes_only: bool = False,
+        keyframe: bool = False,
+    ) -> list[str]:
+        """Execute the actions of the given events and return their logs.
+
+        Device commands are collected from every event first,
+        and applied once per device after the other actions.
+        An action that writes a device drops the commands added for it before.
+        With instrumentation, the duration of each command write
+        is counted in the duration of the event of the command.
+        If `changes_only` is True, commands that did not change their device
+        are not logged, nor are other actions that only wrote unchanged devices.
+        On a keyframe, the devices that were neither commanded
+        nor written by another action are logged as well.
         """
+
+        events: list[SchedulerEvent] = self._scheduler_events
+        commands: CommandBuffer = CommandBuffer(self.coalesce_policy)
         event_logs: list[str] = []
-        for event in self._scheduler_events:
-            if not event.should_trigger():
-                continue
-            event_logs.extend(event.trigger_actions())
+        first_write_index: int = len(self._device_updates)
+        record_devices: dict[int, Device] = self._record_devices
+
+        def run_action(action: Callable[[], str]) -> str | None:
+            """Call an action and return its log,
+            or None if it only wrote devices without changing them."""
+
+            write_count: int = len(self._device_updates)
+            change_count: int = self._device_change_count
+
+            action_log: str = action()
+            if len(self._device_updates) == write_count:
+                return action_log
+
+            # The action writes after the commands added so far.
+            if commands:
+                for uuid, _ in self._device_updates[write_count:]:
+                    device: Device | None = record_devices.get(uuid)
+                    if device is not None:
+                        commands.discard(device)
+
+            if changes_only and self._device_change_count == change_count:
+                return None
+
+            return action_log
+
+        event_durations: dict[int, int] | None = None
+        if instrumentation is None:
+            for event_index in event_indices:
+                event_logs.extend(
+                    events[event_index].trigger_actions(
+                        commands, run_action, event_index
+                    )
+                )
+        else:
+            event_durations = {}
+            for event_index in event_indices:
+                started_at: int = perf_counter_ns()
+                event_logs.extend(
+                    events[event_index].trigger_actions(
+                        commands, run_action, event_index
+                    )
+                )
+                event_durations[event_index] = perf_counter_ns() - started_at
+
+        if keyframe:
+            # The actions already logged the devices they wrote.
+            written_uuids: set[int] = {
+                uuid for uuid, _ in self._device_updates[first_write_index:]
+            }
+            event_logs.extend(
+                device.get_loggable_text(False)
+                for uuid, device in self._record_devices.items()
+                if device not in commands and uuid not in written_uuids
+            )
+
+        if commands:
+            event_logs.extend(commands.apply(changes_only, event_durations))
+
+        if instrumentation is not None and event_durations is not None:
+            for event_index, duration_ns in event_durations.items():
+                instrumentation.record_event(event_index, duration_ns)
 
         return event_logs
 
+    def __dispatch_records(
+        self,
+        reported_sensors: list[Sensor] | None = None,
+        changes_only: bool = False,
+        keyframe: bool = False,
+    ) -> None:
+        """Send the binary event records of the tick to the record listeners.
+
+        If `reported_sensors` is None, every sensor is recorded.
+        Device writes that repeat the last recorded value are left out
+        if `changes_only` is True, and every device is recorded on a keyframe.
+        """
+
+        device_updates: list[tuple[int, int]] = self._device_updates
+        self._device_updates = []
+
+        recorded_device_values: dict[int, int] = self._recorded_device_values
+        if keyframe:
+            device_updates = [
+                (uuid, device.device_value)
+                for uuid, device in self._record_devices.items()
+            ]
+        elif changes_only:
+            # Only the last write of each device in the tick matters.
+            device_updates = [
+                (uuid, value)
+                for uuid, value in dict(device_updates).items()
+                if recorded_device_values.get(uuid) != value
+            ]
+        recorded_device_values.update(device_updates)
+
+        if not self._record_listeners:
+            return
+
+        timestamp: float = self.clock.now().timestamp()
+        records: list[EventRecord]
+        if reported_sensors is None:
+            records = [
+                EventRecord(timestamp, uuid, RecordKind.SENSOR, reading)
+                for uuid, reading in self._sensor_fleet.iter_readings()
+            ]
+        else:
+            records = [
+                EventRecord(
+                    timestamp, sensor.uuid, RecordKind.SENSOR, sensor.sensor_reading
+                )
+                for sensor in reported_sensors
+            ]
+        records.extend(
+            EventRecord(timestamp, uuid, RecordKind.DEVICE, value)
+            for uuid, value in device_updates
+        )
+
+        for listener in self._record_listeners:
+            listener(records)
+
+    def __on_device_value(self, device: Device) -> None:
+        """Remember a device write for the record listeners."""
+
+        uuid: int = device.uuid
+        value: int = device.device_value
+        self._device_updates.append((uuid, value))
+        if self._device_values.get(uuid) != value:
+            self._device_values[uuid] = value
+            self._device_change_count += 1
+
+        if self._changed_uuids is not None:
+            with self._changed_uuids_lock:
+                self._changed_uuids.add(uuid)
+
     # registry methods
     def register_events(
         self,
@@ -117,18 +810,32 @@ class Scheduler:
         """Register events to the scheduler."""
 
         self._scheduler_events.extend(events)
+        self._rules_compiled = False
+        self._sampling_scheduled = False
 
     def register_sensors(
         self,
         sensors: list[Sensor],
     ) -> None:
-        """Register sensors to the scheduler."""
+        """Register sensors to the scheduler.
+
+        Raises
+        ------
+        ValueError
+            If a sensor is registered to another scheduler.
+        """
 
         for sensor in sensors:
             uuid: int = sensor.uuid
             if uuid in self._record_sensors:
                 continue
+            self._sensor_fleet.attach(sensor)
             self._record_sensors[uuid] = sensor
+            self._sensors_by_kind[sensor.sensor_kind][uuid] = sensor
+            self._sensors_by_name.setdefault(sensor.name, []).append(sensor)
+            sensor.clock = self.clock
+            self._rules_compiled = False
+            self._sampling_scheduled = False
 
     def register_devices(
         self,
@@ -141,18 +848,76 @@ class Scheduler:
             if uuid in self._record_devices:
                 continue
             self._record_devices[uuid] = device
+            self._devices_by_kind[device.device_kind][uuid] = device
+            self._devices_by_name.setdefault(device.name, []).append(device)
+            self._recorded_device_values[uuid] = device.device_value
+            self._device_values[uuid] = device.device_value
+            device._value_listener = self.__on_device_value
+            device.clock = self.clock
+
+    def get_sensor(self, uuid: int) -> Sensor | None:
+        """Return the registered sensor with the given uuid, if any."""
+
+        return self._record_sensors.get(uuid)
+
+    def get_device(self, uuid: int) -> Device | None:
+        """Return the registered smart device with the given uuid, if any."""
+
+        return self._record_devices.get(uuid)
+
+    def sensors_of_kind(self, kind: PhysicalQuantity) -> ValuesView[Sensor]:
+        """Return a live view of the registered sensors measuring a physical quantity."""
+
+        return self._sensors_by_kind[kind].values()
+
+    def devices_of_kind(self, kind: PhysicalQuantity) -> ValuesView[Device]:
+        """Return a live view of the registered smart devices of a physical quantity."""
+
+        return self._devices_by_kind[kind].values()
+
+    def sensors_named(self, name: str) -> list[Sensor]:
+        """Return the registered sensors with the given name.
+
+        Names are indexed as they were when the sensors were registered.
+        """
+
+        return list(self._sensors_by_name.get(name, []))
+
+    def devices_named(self, name: str) -> list[Device]:
+        """Return the registered smart devices with the given name.
+
+        Names are indexed as they were when the devices were registered.
+        """
+
+        return list(self._devices_by_name.get(name, []))
 
     @property
-    def devices(self) -> list[Device]:
-        """Return the registered smart devices."""
+    def devices(self) -> ValuesView[Device]:
+        """Return a live, read-only view of the registered smart devices.
 
-        return list(self._record_devices.values())
+        The view is not copied, and reflects later registrations.
+        """
+
+        return self._record_devices.values()
+
+    @property
+    def sensors(self) -> ValuesView[Sensor]:
+        """Return a live, read-only view of the registered sensors.
+
+        The view is not copied, and reflects later registrations.
+        """
+
+        return self._record_sensors.values()
 
     @property
-    def sensors(self) -> list[Sensor]:
-        """Return the registered smart devices."""
+    def sensor_fleet(self) -> SensorFleet:
+        """Return the fleet holding the state of the registered sensors.
+
+        The fleet is owned by the scheduler, and should only be modified
+        to restore a saved state.
+        """
 
-        return list(self._record_sensors.values())
+        return self._sensor_fleet
 
     @property
     def running(self) -> bool:
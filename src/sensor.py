@@ -10,19 +10,34 @@ by the user of the sensor module.
 """
 
 
-from datetime import datetime, timezone
-from typing import Literal
-from random import randrange
+from __future__ import annotations
+
+from datetime import datetime
+from sys import intern
+from typing import TYPE_CHECKING, Literal
+from random import Random, randrange
 from math import floor
 
+from src.clock import WALL_CLOCK, Clock
 from src.physical_quantity import PhysicalQuantity
 
+if TYPE_CHECKING:
+    from src.noise import NoiseModel
+    from src.sensor_fleet import SensorFleet
+
+
+ComparisonMode = Literal["EQ", "NE", "LE", "GE", "LT", "GT"]
+
+# Used by noise models of sensors without their own generator.
+_RANDOM_GENERATOR: Random = Random()
+
 
 def _randomize_sensor_data_value(
     sensor_reading: int,
     sensor_reading_range: tuple[int, int],
     variation_percentage: float = 0.1,
     step: int = 1,
+    random_generator: Random | None = None,
 ) -> int:
     """Randomize sensor data based on previous value and variation percentage
     The function `randomize_sensor_data_value` is used only by the `Sensor` class.
@@ -37,6 +52,8 @@ def _randomize_sensor_data_value(
         The percentage of variation from the previous value, by default 0.1
     step : int, optional
         The step of the range, by default 1
+    random_generator : Random | None, optional
+        The source of randomness, by default the global one of the `random` module
 
     Returns
     -------
@@ -53,7 +70,14 @@ def _randomize_sensor_data_value(
     random_min_value: int = max(range_min, sensor_reading - variant_allowed)
     random_max_value: int = min(range_max, sensor_reading + variant_allowed)
 
-    return randrange(random_min_value, random_max_value, step)
+    # Like the fleet, an empty interval keeps the reading at its lower bound.
+    if random_max_value <= random_min_value:
+        return random_min_value
+
+    if random_generator is None:
+        return randrange(random_min_value, random_max_value, step)
+
+    return random_generator.randrange(random_min_value, random_max_value, step)
 
 
 class Sensor:
@@ -71,8 +95,47 @@ class Sensor:
         The range of values that the sensor can measure.
     sensor_reading : int
         The current value of the sensor.
+    variation_percentage : float
+        The percentage of variation allowed between two consecutive readings.
+    sampling_interval_sec : float | None
+        How often the scheduler updates the sensor.
+        If None, the update interval of the scheduler is used.
+    clock : Clock
+        The clock used for timestamps, set by the scheduler the sensor is registered to.
+    noise_model : NoiseModel | None
+        The noise model of the readings, instead of the default random walk.
+    random_generator : Random | None
+        The source of randomness of the sensor when it is not attached to a fleet,
+        for reproducible readings. If None, the global one of the `random` module.
+        Attached sensors use the generator of their fleet,
+        so that seeding the fleet also makes `update_sensor_value`
+        and `sample_next_reading` reproducible.
+
+    A sensor may be attached to a `SensorFleet`.
+    In that case, the reading is stored in the fleet,
+    and the sensor acts as a view into it.
+
+    Sensors have no instance `__dict__`, and their names are interned,
+    since scenarios may hold a very large number of them.
     """
 
+    __slots__ = (
+        "_name",
+        "sensor_reading_range",
+        "variation_percentage",
+        "sampling_interval_sec",
+        "clock",
+        "noise_model",
+        "random_generator",
+        "_sensor_reading",
+        "_sensor_kind",
+        "_fleet",
+        "_fleet_index",
+        "_uuid",
+        "_loggable_text",
+        "_loggable_text_reading",
+    )
+
     _uuid_tracker: int = 1
 
     def __init__(
@@ -80,14 +143,32 @@ class Sensor:
         name: str,
         sensor_kind: PhysicalQuantity,
         sensor_reading_range: tuple[int, int],
+        variation_percentage: float = 0.1,
+        sampling_interval_sec: float | None = None,
+        noise_model: NoiseModel | None = None,
+        random_generator: Random | None = None,
     ) -> None:
-        self.name = name
+        self._name: str = intern(name)
         self.sensor_reading_range = sensor_reading_range
+        self.variation_percentage = variation_percentage
+        self.sampling_interval_sec = sampling_interval_sec
+        self.noise_model = noise_model
+        self.random_generator = random_generator
 
         range_min, _ = self.sensor_reading_range
         self._sensor_reading: int = range_min
         self._sensor_kind = sensor_kind
 
+        self._fleet: SensorFleet | None = None
+        self._fleet_index: int = -1
+
+        self.clock: Clock = WALL_CLOCK
+
+        # The loggable text and the reading it was formatted with,
+        # the text is reset when the name changes.
+        self._loggable_text: str | None = None
+        self._loggable_text_reading: int = range_min
+
         self._uuid = self.__class__._uuid_tracker
         self.__class__._uuid_tracker += 1
 
@@ -106,22 +187,59 @@ class Sensor:
             A loggable string representation of the current state of the sensor.
         """
 
-        self._sensor_reading = _randomize_sensor_data_value(
-            self._sensor_reading,
-            self.sensor_reading_range,
-        )
+        next_reading: int = self.sample_next_reading()
+
+        if self._fleet is None:
+            self._sensor_reading = next_reading
+        else:
+            self._fleet.set_reading(self._fleet_index, next_reading)
 
         return self.get_loggable_text(include_timestamp)
 
-    def get_loggable_text(self, include_timestamp: bool = True) -> str:
+    def sample_next_reading(self) -> int:
+        """Return a randomized next reading without storing it."""
+
+        random_generator: Random | None = (
+            self.random_generator
+            if self._fleet is None
+            else self._fleet.random_generator
+        )
+
+        if self.noise_model is None:
+            return _randomize_sensor_data_value(
+                self.sensor_reading,
+                self.sensor_reading_range,
+                self.variation_percentage,
+                random_generator=random_generator,
+            )
+
+        range_min, range_max = self.sensor_reading_range
+
+        return self.noise_model.next_readings(
+            [self.sensor_reading],
+            [range_min],
+            [range_max],
+            self.clock.now().timestamp(),
+            random_generator or _RANDOM_GENERATOR,
+        )[0]
+
+    def get_loggable_text(
+        self,
+        include_timestamp: bool = True,
+        timestamp: datetime | None = None,
+    ) -> str:
         """Return a loggable string representation of the current state of the sensor.\
-        If include_timestamp is True, the timestamp will be in UTC.
+        If include_timestamp is True, the timestamp is taken from the clock of the sensor,
+        unless a timestamp is given, so that many sensors can share one timestamp.
 
+        The text is cached until the reading changes.
 
         Parameters
         ----------
         include_timestamp : bool, optional
             Whether to include a timestamp in the loggable string, by default True
+        timestamp : datetime | None, optional
+            The timestamp to use instead of the clock, by default None
 
         Returns
         -------
@@ -129,14 +247,33 @@ class Sensor:
             The loggable string representation of the current state of the sensor.
         """
 
-        loggable_text: str = f"{self.name}: current {self._sensor_kind} reading is {self._sensor_reading}."
+        sensor_reading: int = self.sensor_reading
+        if self._loggable_text is None or self._loggable_text_reading != sensor_reading:
+            self._loggable_text = f"{self._name}: current {self._sensor_kind} reading is {sensor_reading}."
+            self._loggable_text_reading = sensor_reading
 
         if not include_timestamp:
-            return loggable_text
+            return self._loggable_text
+
+        if timestamp is None:
+            timestamp = self.clock.now()
 
-        timestamp: datetime = datetime.now(timezone.utc)
+        return f"[{timestamp}] {self._loggable_text}"
 
-        return f"[{timestamp}] {loggable_text}"
+    @property
+    def name(self) -> str:
+        """Get the name of the sensor."""
+
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        """Set the name of the sensor, which is interned."""
+
+        name = intern(name)
+        if name is not self._name:
+            self._name = name
+            self._loggable_text = None
 
     @property
     def uuid(self) -> int:
@@ -144,6 +281,21 @@ class Sensor:
 
         return self._uuid
 
+    @classmethod
+    def next_uuid(cls) -> int:
+        """Return the uuid the next sensor will get."""
+
+        return cls._uuid_tracker
+
+    @classmethod
+    def reserve_uuids(cls, next_uuid: int) -> None:
+        """Make sensors created from now on get uuids from `next_uuid` on.
+
+        The uuids never move backwards, so they stay unique.
+        """
+
+        cls._uuid_tracker = max(cls._uuid_tracker, next_uuid)
+
     @property
     def sensor_kind(self) -> PhysicalQuantity:
         """Get the physical quantity that the sensor measures."""
@@ -154,11 +306,33 @@ class Sensor:
     def sensor_reading(self) -> int:
         """Get the current value of the sensor."""
 
-        return self._sensor_reading
+        if self._fleet is None:
+            return self._sensor_reading
+
+        return self._fleet.reading(self._fleet_index)
+
+    def _bind_fleet(self, fleet: SensorFleet, index: int) -> None:
+        """Make the sensor a view into a slot of the given fleet.
+
+        This method is called by `SensorFleet.attach`.
+        """
+
+        self._fleet = fleet
+        self._fleet_index = index
+
+    def _unbind_fleet(self, sensor_reading: int) -> None:
+        """Take the reading back from the fleet the sensor was attached to.
+
+        This method is called by `SensorFleet` when the sensor is detached.
+        """
+
+        self._fleet = None
+        self._fleet_index = -1
+        self._sensor_reading = sensor_reading
 
     def compare_sensor_reading(
         self,
-        mode: Literal["EQ", "NE", "LE", "GE", "LT", "GT"],
+        mode: ComparisonMode,
         value: int,
     ) -> bool:
         """Compare the current sensor reading to a value.
@@ -173,7 +347,7 @@ class Sensor:
 
         Parameters
         ----------
-        mode : Literal["EQ", "NE", "LE", "GE", "LT", "GT"]
+        mode : ComparisonMode
             The comparison mode.
         value : int
             The value to compare to.
@@ -183,7 +357,7 @@ class Sensor:
         bool
             The result of the comparison.
         """
-        curr_reading: int = self._sensor_reading
+        curr_reading: int = self.sensor_reading
 
         match mode:
             case "EQ":
@@ -0,0 +1,511 @@
+"""Sensor fleet that stores sensor state in contiguous arrays.
+
+A fleet keeps the readings, reading ranges and variation percentages
+of many sensors in typed arrays from the standard library `array` module,
+so that the whole fleet can be advanced in one batched random-walk step
+instead of one `Sensor.update_sensor_value` call per sensor.
+
+Sensors attached to a fleet become lightweight views into it.
+Their `sensor_reading` and `compare_sensor_reading` read from the fleet,
+so existing callers keep working.
+
+The fleet also remembers which slots changed their reading,
+so that consumers such as the rule engine only need to look at those.
+
+Each slot stores the kind of its sensor as a one byte code,
+so that checkpoints can check the layout of the fleet.
+
+The fleet owns a seedable random generator, and draws its noise in blocks,
+so that seeded runs are reproducible.
+Sensors may follow a `NoiseModel` instead of the random walk,
+in which case the fleet steps each model once for all of its sensors.
+"""
+
+from __future__ import annotations
+
+from array import array
+from itertools import compress
+from math import floor
+from random import Random
+from time import time
+from typing import Any, Iterable, Iterator, Sequence
+
+from src.noise import NoiseModel, UniformBlock
+
+from src.physical_quantity import (
+    PHYSICAL_QUANTITIES,
+    PHYSICAL_QUANTITY_CODES,
+    PhysicalQuantity,
+)
+from src.sensor import Sensor
+
+
+class SensorFleet:
+    """Struct-of-arrays storage for a collection of sensors.
+
+    The random walk applied by `step` uses the same clamping rules as
+    `Sensor.update_sensor_value`: the allowed variation is derived from the
+    previous reading and the width of the range, and the next reading is
+    drawn from `[max(min, reading - variation), min(max, reading + variation))`.
+    When that interval is empty the reading stays at its lower bound.
+
+    Parameters
+    ----------
+    seed : int | None
+        The seed of the random generator of the fleet.
+        If None, the generator is seeded from the operating system.
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        self._uuids: array[int] = array("q")
+        self._readings: array[int] = array("q")
+        self._range_mins: array[int] = array("q")
+        self._range_maxs: array[int] = array("q")
+        self._variation_percentages: array[float] = array("d")
+        # Precomputed `floor((range_max - range_min) * variation_percentage)`,
+        # which is the part of the allowed variation that never changes.
+        self._range_variations: array[int] = array("q")
+        self._kinds: array[int] = array("B")
+        # 1 for the slots in use, 0 for the slots of detached sensors.
+        self._live: bytearray = bytearray()
+        # Detached slots are left out of the steps, which is slower.
+        self._detached_count: int = 0
+        # The sensor viewing each slot, None for the slots of detached sensors.
+        self._sensors: list[Sensor | None] = []
+        # Indices of the slots whose reading changed since the last `pop_dirty`.
+        self._dirty: set[int] = set()
+
+        self._random: Random = Random(seed)
+        self._uniforms: UniformBlock = UniformBlock(self._random)
+        # Slots following a noise model instead of the random walk, by model.
+        self._noise_model_slots: dict[NoiseModel, list[int]] = {}
+        self._noise_models: dict[int, NoiseModel] = {}
+
+    def __len__(self) -> int:
+        return len(self._readings)
+
+    def attach(self, sensor: Sensor) -> int:
+        """Move the state of a sensor into the fleet.
+
+        A sensor belongs to at most one fleet,
+        it has to be detached from its fleet before it can move to another one.
+
+        Parameters
+        ----------
+        sensor : Sensor
+            The sensor to attach.
+
+        Returns
+        -------
+        int
+            The index of the sensor in the fleet.
+
+        Raises
+        ------
+        ValueError
+            If the sensor belongs to another fleet.
+        """
+
+        if sensor._fleet is self:
+            return sensor._fleet_index
+
+        if sensor._fleet is not None:
+            raise ValueError(
+                f"Sensor {sensor.uuid} already belongs to another fleet, "
+                "detach it first."
+            )
+
+        reading: int = sensor.sensor_reading
+
+        index: int = self._append(
+            sensor.uuid,
+            sensor.sensor_kind,
+            sensor.sensor_reading_range,
+            sensor.variation_percentage,
+            reading,
+        )
+        self._sensors[index] = sensor
+        if sensor.noise_model is not None:
+            self.set_noise_model(index, sensor.noise_model)
+
+        sensor._bind_fleet(self, index)
+
+        return index
+
+    def _append(
+        self,
+        uuid: int,
+        sensor_kind: PhysicalQuantity,
+        sensor_reading_range: tuple[int, int],
+        variation_percentage: float,
+        reading: int,
+    ) -> int:
+        """Append a slot and return its index."""
+
+        range_min, range_max = sensor_reading_range
+
+        index: int = len(self._readings)
+        self._uuids.append(uuid)
+        self._readings.append(reading)
+        self._range_mins.append(range_min)
+        self._range_maxs.append(range_max)
+        self._variation_percentages.append(variation_percentage)
+        self._range_variations.append(
+            floor((range_max - range_min) * variation_percentage)
+        )
+        self._kinds.append(PHYSICAL_QUANTITY_CODES[sensor_kind])
+        self._live.append(1)
+        self._sensors.append(None)
+        self._dirty.add(index)
+
+        return index
+
+    def detach(self, sensor: Sensor) -> None:
+        """Give the state of an attached sensor back to the sensor.
+
+        The slot of the sensor is no longer updated.
+
+        Raises
+        ------
+        ValueError
+            If the sensor does not belong to the fleet.
+        """
+
+        if sensor._fleet is not self:
+            raise ValueError(f"Sensor {sensor.uuid} does not belong to this fleet.")
+
+        self._detach(sensor._fleet_index)
+
+    def _detach(self, index: int) -> None:
+        """Forget the sensor at the given index.
+
+        The slot itself is kept so that the indices of other sensors stay valid,
+        but it is no longer stepped nor reported as dirty.
+        """
+
+        if not self._live[index]:
+            return
+
+        self._live[index] = 0
+        self._detached_count += 1
+        self._dirty.discard(index)
+        self.set_noise_model(index, None)
+
+        sensor: Sensor | None = self._sensors[index]
+        if sensor is None:
+            return
+
+        self._sensors[index] = None
+        sensor._unbind_fleet(self._readings[index])
+
+    def set_external(self, index: int) -> None:
+        """Exclude a slot from the random walk.
+
+        The reading of an external slot only changes through `set_reading`,
+        for example when it is read from a sensor driver.
+        """
+
+        self.set_noise_model(index, None)
+        self._variation_percentages[index] = 0.0
+        self._range_variations[index] = 0
+
+    def set_noise_model(self, index: int, noise_model: NoiseModel | None) -> None:
+        """Make a slot follow a noise model, or the random walk if None."""
+
+        previous_model: NoiseModel | None = self._noise_models.pop(index, None)
+        if previous_model is not None:
+            previous_slots: list[int] = self._noise_model_slots[previous_model]
+            previous_slots.remove(index)
+            if not previous_slots:
+                del self._noise_model_slots[previous_model]
+
+        if noise_model is None:
+            return
+
+        self._noise_models[index] = noise_model
+        self._noise_model_slots.setdefault(noise_model, []).append(index)
+
+    def seed(self, seed: int | None) -> None:
+        """Seed the random generator of the fleet."""
+
+        self._random.seed(seed)
+        self._uniforms.reset()
+
+    @property
+    def random_generator(self) -> Random:
+        """Return the random generator of the fleet, shared by its sensors."""
+
+        return self._random
+
+    def random_state(self) -> tuple[tuple[Any, ...], list[float]]:
+        """Return the state of the random generator of the fleet.
+
+        Returns
+        -------
+        tuple[tuple[Any, ...], list[float]]
+            The state of the generator, see `Random.getstate`,
+            and the numbers it generated in advance and the fleet did not use yet.
+        """
+
+        return self._random.getstate(), self._uniforms.pending()
+
+    def restore_random_state(
+        self,
+        generator_state: tuple[Any, ...],
+        pending_uniforms: Sequence[float],
+    ) -> None:
+        """Restore the state returned by `random_state`."""
+
+        self._random.setstate(generator_state)
+        self._uniforms.set_pending(pending_uniforms)
+
+    def reading(self, index: int) -> int:
+        """Return the reading stored at the given index."""
+
+        return self._readings[index]
+
+    def kind(self, index: int) -> PhysicalQuantity:
+        """Return the physical quantity of the sensor at the given index."""
+
+        return PHYSICAL_QUANTITIES[self._kinds[index]]
+
+    def sensor(self, index: int) -> Sensor | None:
+        """Return the sensor viewing the given index, None if it has none."""
+
+        return self._sensors[index]
+
+    def set_reading(self, index: int, value: int) -> None:
+        """Overwrite the reading stored at the given index.
+
+        The slot is marked dirty if the reading changed.
+        """
+
+        if self._readings[index] == value:
+            return
+
+        self._readings[index] = value
+        self._dirty.add(index)
+
+    def step(self, now: float | None = None) -> None:
+        """Advance every sensor in the fleet by one step.
+
+        Slots whose reading changed are marked dirty.
+
+        Parameters
+        ----------
+        now : float | None
+            The POSIX timestamp of the step, used by time dependent noise models.
+            If None, the current time is used.
+        """
+
+        if self._detached_count:
+            self.step_slots(compress(range(len(self._live)), self._live), now)
+            return
+
+        previous_readings: array[int] = self._readings
+        self._readings = array(
+            "q",
+            [
+                _walk(reading, range_min, range_max, variation, range_variation, noise)
+                for reading, range_min, range_max, variation, range_variation, noise in zip(
+                    self._readings,
+                    self._range_mins,
+                    self._range_maxs,
+                    self._variation_percentages,
+                    self._range_variations,
+                    self._uniforms.take(len(self._readings)),
+                )
+            ],
+        )
+
+        # Slots following a noise model were walked as well, and are overwritten.
+        for noise_model, model_slots in self._noise_model_slots.items():
+            self._step_noise_model(noise_model, model_slots, now)
+
+        self._mark_changed(previous_readings, range(len(previous_readings)))
+
+    def step_slots(self, indices: Iterable[int], now: float | None = None) -> None:
+        """Advance only the given slots by one step.
+
+        Slots whose reading changed are marked dirty,
+        the slots of detached sensors are skipped.
+        """
+
+        readings: array[int] = self._readings
+        range_mins: array[int] = self._range_mins
+        range_maxs: array[int] = self._range_maxs
+        variation_percentages: array[float] = self._variation_percentages
+        range_variations: array[int] = self._range_variations
+        noise_models: dict[int, NoiseModel] = self._noise_models
+        live: bytearray = self._live
+
+        walked_slots: list[int] = []
+        model_slots: dict[NoiseModel, list[int]] = {}
+        for index in indices:
+            if not live[index]:
+                continue
+            noise_model: NoiseModel | None = noise_models.get(index)
+            if noise_model is None:
+                walked_slots.append(index)
+            else:
+                model_slots.setdefault(noise_model, []).append(index)
+
+        for index, noise in zip(walked_slots, self._uniforms.take(len(walked_slots))):
+            reading: int = readings[index]
+            next_reading: int = _walk(
+                reading,
+                range_mins[index],
+                range_maxs[index],
+                variation_percentages[index],
+                range_variations[index],
+                noise,
+            )
+            if next_reading != reading:
+                readings[index] = next_reading
+                self._dirty.add(index)
+
+        for noise_model, slots in model_slots.items():
+            previous_readings: list[int] = [readings[index] for index in slots]
+            self._step_noise_model(noise_model, slots, now)
+            self._dirty.update(
+                index
+                for index, previous_reading in zip(slots, previous_readings)
+                if readings[index] != previous_reading
+            )
+
+    def _step_noise_model(
+        self,
+        noise_model: NoiseModel,
+        slots: list[int],
+        now: float | None,
+    ) -> None:
+        """Overwrite the readings of the given slots with the next readings of a model."""
+
+        readings: array[int] = self._readings
+        range_mins: array[int] = self._range_mins
+        range_maxs: array[int] = self._range_maxs
+
+        next_readings: list[int] = noise_model.next_readings(
+            [readings[index] for index in slots],
+            [range_mins[index] for index in slots],
+            [range_maxs[index] for index in slots],
+            time() if now is None else now,
+            self._random,
+        )
+        for index, next_reading in zip(slots, next_readings):
+            readings[index] = next_reading
+
+    def _mark_changed(
+        self,
+        previous_readings: array[int],
+        indices: Iterable[int],
+    ) -> None:
+        """Mark the given slots dirty if their reading differs from before."""
+
+        readings: array[int] = self._readings
+        self._dirty.update(
+            index for index in indices if readings[index] != previous_readings[index]
+        )
+
+    def pop_dirty(self) -> set[int]:
+        """Return the indices of the slots that changed and reset the tracking."""
+
+        dirty: set[int] = self._dirty
+        self._dirty = set()
+
+        return dirty
+
+    def load_readings(self, readings: bytes | memoryview) -> None:
+        """Overwrite every reading from native int64 bytes, one per slot.
+
+        Every slot in use is marked dirty.
+        """
+
+        loaded_readings: array[int] = array("q")
+        loaded_readings.frombytes(readings)
+        if len(loaded_readings) != len(self._readings):
+            raise ValueError("The number of readings does not match the fleet.")
+
+        self._readings[:] = loaded_readings
+        self._dirty.update(compress(range(len(self._live)), self._live))
+
+    def peek_dirty(self) -> list[int]:
+        """Return the sorted indices of the slots in use that changed,
+        without resetting the tracking."""
+
+        live: bytearray = self._live
+
+        return sorted(index for index in self._dirty if live[index])
+
+    def iter_readings(self) -> Iterator[tuple[int, int]]:
+        """Iterate over the (uuid, reading) pairs of the sensors in use."""
+
+        for uuid, reading, live in zip(self._uuids, self._readings, self._live):
+            if live:
+                yield uuid, reading
+
+    @property
+    def uuids(self) -> array[int]:
+        """Return the uuids of the fleet, indexed by slot.
+
+        The array is owned by the fleet and must not be modified by the caller.
+        """
+
+        return self._uuids
+
+    @property
+    def kinds(self) -> array[int]:
+        """Return the one byte codes of the physical quantities, indexed by slot.
+
+        The array is owned by the fleet and must not be modified by the caller.
+        """
+
+        return self._kinds
+
+    @property
+    def live(self) -> bytearray:
+        """Return whether each slot is in use, one byte each.
+
+        The array is owned by the fleet and must not be modified by the caller.
+        """
+
+        return self._live
+
+    @property
+    def readings(self) -> array[int]:
+        """Return the readings of the fleet.
+
+        The array is owned by the fleet and must not be modified by the caller.
+        """
+
+        return self._readings
+
+    @property
+    def sensors(self) -> list[Sensor]:
+        """Return the sensors attached to the fleet."""
+
+        return [sensor for sensor in self._sensors if sensor is not None]
+
+
+def _walk(
+    reading: int,
+    range_min: int,
+    range_max: int,
+    variation_percentage: float,
+    range_variation: int,
+    noise: float,
+) -> int:
+    """Return the next reading of a single fleet slot.
+
+    `noise` is a uniform random number in [0, 1).
+    """
+
+    variant_allowed: int = floor(reading * variation_percentage) + range_variation
+
+    random_min_value: int = max(range_min, reading - variant_allowed)
+    random_max_value: int = min(range_max, reading + variant_allowed)
+
+    if random_max_value <= random_min_value:
+        return random_min_value
+
+    return random_min_value + int(noise * (random_max_value - random_min_value))
@@ -0,0 +1,292 @@
+"""Multi-process sharded simulation of many homes.
+
+One `Scheduler` simulates one home.
+The `ShardedSimulation` splits homes into shards and runs each shard
+in a `multiprocessing` pool, on a `VirtualClock` so no process ever sleeps.
+
+Each home runs entirely inside its worker, and its sensor state
+never leaves the worker while it runs.
+Once a shard is done, its event records (in the binary event log format)
+and the final sensor readings of its homes are packed into a shared memory
+block instead of being pickled back.
+Only the name of the block, the layout of its content
+and the small catalog of each home are pickled.
+The parent reads the blocks and merges the records of every home
+into one stream ordered by timestamp.
+
+Uuids are assigned by each worker process, so the same uuid may name
+different sensors in different homes, and differ from one run to the next.
+The records of a home are named by the catalog of that home,
+see `ShardedSimulation.catalogs`.
+
+The home factory has to be picklable, for example a module level function.
+"""
+
+from __future__ import annotations
+
+import os
+from array import array
+from datetime import datetime
+from heapq import merge
+from math import ceil
+from multiprocessing import Pool, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterator, NamedTuple
+
+from src.clock import Clock, VirtualClock
+from src.event_log import (
+    RECORD_STRUCT,
+    CatalogEntry,
+    EventRecord,
+    RecordKind,
+    build_catalog,
+)
+from src.scheduler import Scheduler
+
+HomeFactory = Callable[[int, Clock], Scheduler]
+
+
+class HomeRecord(NamedTuple):
+    """An event record of one of the simulated homes."""
+
+    home_index: int
+    record: EventRecord
+
+
+class _HomeLayout(NamedTuple):
+    """Where the results of one home are stored in the shared memory block."""
+
+    home_index: int
+    records_offset: int
+    record_count: int
+    readings_offset: int
+    reading_count: int
+
+
+# The name of the shared memory block of a shard, the layout of its content,
+# and the catalog of each home.
+_ShardResult = tuple[str, list[_HomeLayout], dict[int, dict[int, CatalogEntry]]]
+
+
+class _ShardTask(NamedTuple):
+    home_factory: HomeFactory
+    home_indices: list[int]
+    step_count: int
+    start: datetime
+
+
+def _run_shard(task: _ShardTask) -> _ShardResult:
+    """Simulate the homes of a shard and store the results in shared memory.
+
+    The catalog of each home is small, and is returned as is.
+    """
+
+    packed_homes: list[tuple[int, bytes, array[int]]] = []
+    catalogs: dict[int, dict[int, CatalogEntry]] = {}
+
+    for home_index in task.home_indices:
+        scheduler: Scheduler = task.home_factory(home_index, VirtualClock(task.start))
+
+        packed_records: list[bytes] = []
+        scheduler.subscribe_records(
+            lambda records: packed_records.extend(
+                RECORD_STRUCT.pack(*record) for record in records
+            )
+        )
+        scheduler.simulate(task.step_count)
+        catalogs[home_index] = build_catalog(scheduler.sensors, scheduler.devices)
+
+        packed_homes.append(
+            (
+                home_index,
+                b"".join(packed_records),
+                array("q", [sensor.sensor_reading for sensor in scheduler.sensors]),
+            )
+        )
+
+    layouts: list[_HomeLayout] = []
+    size: int = 0
+    for home_index, records, readings in packed_homes:
+        records_offset: int = size
+        readings_offset: int = records_offset + len(records)
+        size = readings_offset + readings.itemsize * len(readings)
+        layouts.append(
+            _HomeLayout(
+                home_index,
+                records_offset,
+                len(records) // RECORD_STRUCT.size,
+                readings_offset,
+                len(readings),
+            )
+        )
+
+    shared_memory: SharedMemory = SharedMemory(create=True, size=max(size, 1))
+    try:
+        for (_, records, readings), layout in zip(packed_homes, layouts):
+            shared_memory.buf[layout.records_offset : layout.readings_offset] = records
+            shared_memory.buf[
+                layout.readings_offset : layout.readings_offset
+                + len(readings.tobytes())
+            ] = readings.tobytes()
+    except BaseException:
+        # The parent never learns the name of the block.
+        shared_memory.close()
+        shared_memory.unlink()
+        raise
+
+    name: str = shared_memory.name
+    shared_memory.close()
+
+    return name, layouts, catalogs
+
+
+class ShardedSimulation:
+    """Simulate many homes across a pool of processes.
+
+    Attributes
+    ----------
+    home_factory : HomeFactory
+        Builds the scheduler of a home from its index and the clock to use.
+    home_count : int
+        The number of homes to simulate.
+    process_count : int
+        The number of worker processes.
+    """
+
+    def __init__(
+        self,
+        home_factory: HomeFactory,
+        home_count: int,
+        process_count: int | None = None,
+    ) -> None:
+        self.home_factory = home_factory
+        self.home_count = home_count
+        self.process_count = process_count or os.cpu_count() or 1
+
+        self._final_readings: dict[int, list[int]] = {}
+        self._catalogs: dict[int, dict[int, CatalogEntry]] = {}
+
+    def run(self, step_count: int, start: datetime) -> list[HomeRecord]:
+        """Simulate every home for a number of autopilot steps.
+
+        Parameters
+        ----------
+        step_count : int
+            The number of autopilot steps of each home.
+        start : datetime
+            The simulated time at which every home starts.
+
+        Returns
+        -------
+        list[HomeRecord]
+            The records of every home, ordered by timestamp then home index.
+        """
+
+        # A few shards per process keep the pool busy when shards are uneven.
+        shard_size: int = max(1, ceil(self.home_count / (4 * self.process_count)))
+        tasks: list[_ShardTask] = [
+            _ShardTask(
+                self.home_factory,
+                list(range(first, min(first + shard_size, self.home_count))),
+                step_count,
+                start,
+            )
+            for first in range(0, self.home_count, shard_size)
+        ]
+
+        home_records: dict[int, list[EventRecord]] = {}
+        self._final_readings = {}
+        self._catalogs = {}
+
+        # The workers have to share the resource tracker of this process,
+        # otherwise they would clean up the blocks handed over to it.
+        resource_tracker.ensure_running()
+
+        with Pool(self.process_count) as pool:
+            shard_results: Iterator[_ShardResult] = pool.imap_unordered(
+                _run_shard, tasks
+            )
+            try:
+                for name, layouts, catalogs in shard_results:
+                    self._catalogs.update(catalogs)
+                    shared_memory: SharedMemory = SharedMemory(name=name)
+                    try:
+                        for layout in layouts:
+                            home_records[layout.home_index] = list(
+                                _unpack_records(shared_memory, layout)
+                            )
+                            self._final_readings[layout.home_index] = (
+                                shared_memory.buf[
+                                    layout.readings_offset : layout.readings_offset
+                                    + 8 * layout.reading_count
+                                ]
+                                .cast("q")
+                                .tolist()
+                            )
+                    finally:
+                        shared_memory.close()
+                        shared_memory.unlink()
+            finally:
+                # After a failure, the blocks of the other shards are still
+                # handed over, and have to be unlinked.
+                _unlink_blocks(shard_results)
+
+        return list(
+            merge(
+                *(
+                    [HomeRecord(home_index, record) for record in records]
+                    for home_index, records in sorted(home_records.items())
+                ),
+                key=lambda home_record: (
+                    home_record.record.timestamp,
+                    home_record.home_index,
+                ),
+            )
+        )
+
+    @property
+    def final_readings(self) -> dict[int, list[int]]:
+        """Return the sensor readings of each home at the end of the last run."""
+
+        return self._final_readings
+
+    @property
+    def catalogs(self) -> dict[int, dict[int, CatalogEntry]]:
+        """Return the catalog of each home of the last run, by home index.
+
+        The catalog of a home names the uuids of its records.
+        """
+
+        return self._catalogs
+
+
+def _unpack_records(
+    shared_memory: SharedMemory,
+    layout: _HomeLayout,
+) -> Iterator[EventRecord]:
+    """Unpack the records of a home from a shared memory block."""
+
+    records_end: int = layout.records_offset + layout.record_count * RECORD_STRUCT.size
+    for timestamp, uuid, kind, value in RECORD_STRUCT.iter_unpack(
+        shared_memory.buf[layout.records_offset : records_end]
+    ):
+        yield EventRecord(timestamp, uuid, RecordKind(kind), value)
+
+
+def _unlink_blocks(shard_results: Iterator[_ShardResult]) -> None:
+    """Unlink the shared memory blocks of the shard results not read yet.
+
+    The shards that failed are skipped.
+    """
+
+    while True:
+        try:
+            name, _, _ = next(shard_results)
+        except StopIteration:
+            return
+        except Exception:
+            continue
+
+        shared_memory: SharedMemory = SharedMemory(name=name)
+        shared_memory.close()
+        shared_memory.unlink()
@@ -0,0 +1,323 @@
+"""Memory-mapped time-series store for sensor history.
+
+Each sensor gets its own fixed-size ring file.
+A ring file consists of a small header (capacity, number of samples written),
+followed by a region of float64 timestamps and a region of int64 values.
+Both regions are memory mapped and exposed as typed `memoryview`s,
+so range queries binary search and slice the mapped memory directly,
+without parsing anything.
+
+Once a ring file is full, the oldest samples are overwritten.
+Timestamps are expected to be appended in non-decreasing order.
+
+The store is usually fed by the scheduler:
+
+```python
+scheduler.subscribe_records(history_store.append_records)
+```
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from mmap import mmap
+from pathlib import Path
+from struct import Struct
+from types import TracebackType
+from typing import BinaryIO, Iterator, NamedTuple, Self
+
+from src.event_log import EventRecord, RecordKind
+
+# Little-endian: uint64 capacity, uint64 number of samples ever written.
+_HEADER_STRUCT: Struct = Struct("<QQ")
+# Samples use the native byte order, matching the typed memoryviews.
+_TIMESTAMP_STRUCT: Struct = Struct("=d")
+_VALUE_STRUCT: Struct = Struct("=q")
+
+
+class DownsampledBucket(NamedTuple):
+    """Summary of the samples that fall into one time bucket."""
+
+    bucket_start: float
+    minimum: int
+    maximum: int
+    mean: float
+    sample_count: int
+
+
+class _RingFile:
+    """A single memory-mapped ring of (timestamp, value) samples."""
+
+    def __init__(self, path: Path, capacity: int) -> None:
+        ring_file: BinaryIO
+        if path.exists():
+            ring_file = open(path, "r+b")
+            capacity, _ = _HEADER_STRUCT.unpack(ring_file.read(_HEADER_STRUCT.size))
+        else:
+            ring_file = open(path, "w+b")
+            ring_file.truncate(_HEADER_STRUCT.size + 16 * capacity)
+            ring_file.write(_HEADER_STRUCT.pack(capacity, 0))
+            ring_file.flush()
+
+        # The mapping keeps its own descriptor, so the file can be closed.
+        with ring_file:
+            self.capacity: int = capacity
+            self._mmap: mmap = mmap(
+                ring_file.fileno(), _HEADER_STRUCT.size + 16 * capacity
+            )
+
+        _, self.count = _HEADER_STRUCT.unpack_from(self._mmap)
+
+        self._timestamps_offset: int = _HEADER_STRUCT.size
+        self._values_offset: int = self._timestamps_offset + 8 * capacity
+        view: memoryview = memoryview(self._mmap)
+        self.timestamps: memoryview = view[
+            self._timestamps_offset : self._values_offset
+        ].cast("d")
+        self.values: memoryview = view[self._values_offset :].cast("q")
+        view.release()
+
+    def append(self, timestamp: float, value: int) -> None:
+        """Write a sample, overwriting the oldest one if the ring is full."""
+
+        index: int = self.count % self.capacity
+        _TIMESTAMP_STRUCT.pack_into(
+            self._mmap, self._timestamps_offset + 8 * index, timestamp
+        )
+        _VALUE_STRUCT.pack_into(self._mmap, self._values_offset + 8 * index, value)
+
+        self.count += 1
+        _HEADER_STRUCT.pack_into(self._mmap, 0, self.capacity, self.count)
+
+    def segments(self) -> list[tuple[int, int]]:
+        """Return the (start, stop) index ranges of the samples, oldest first."""
+
+        if self.count <= self.capacity:
+            return [(0, self.count)]
+
+        split: int = self.count % self.capacity
+        if split == 0:
+            return [(0, self.capacity)]
+
+        return [(split, self.capacity), (0, split)]
+
+    def query(self, start: float, end: float) -> Iterator[tuple[float, int]]:
+        """Yield the samples with `start <= timestamp <= end`, oldest first."""
+
+        timestamps: memoryview = self.timestamps
+        for lower, upper in self.segments():
+            first: int = bisect_left(timestamps, start, lower, upper)
+            last: int = bisect_right(timestamps, end, first, upper)
+            yield from zip(timestamps[first:last], self.values[first:last])
+
+    def close(self) -> None:
+        """Release the views, flush and unmap the file."""
+
+        self.timestamps.release()
+        self.values.release()
+        self._mmap.flush()
+        self._mmap.close()
+
+
+class SensorHistoryStore:
+    """Per-sensor history of readings backed by memory-mapped ring files.
+
+    Every mapped ring file holds a file descriptor,
+    so only the `max_open_ring_files` most recently used ones stay mapped,
+    and the others are unmapped until they are used again.
+
+    Attributes
+    ----------
+    directory : Path
+        The directory that contains the ring files.
+    capacity : int
+        The number of samples kept per sensor for newly created ring files.
+    max_open_ring_files : int
+        The maximum number of ring files mapped at once.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        capacity: int = 86_400,
+        max_open_ring_files: int = 256,
+    ) -> None:
+        self.directory = Path(directory)
+        self.capacity = capacity
+        self.max_open_ring_files = max_open_ring_files
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Least recently used first.
+        self._ring_files: OrderedDict[int, _RingFile] = OrderedDict()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def append(self, uuid: int, timestamp: float, value: int) -> None:
+        """Append a reading to the history of a sensor."""
+
+        ring_file: _RingFile | None = self._used_ring_file(uuid)
+        if ring_file is None:
+            ring_file = self._open_ring_file(uuid)
+
+        ring_file.append(timestamp, value)
+
+    def append_records(self, records: list[EventRecord]) -> None:
+        """Append the sensor readings of a batch of event records.
+
+        Records of other kinds are ignored.
+        """
+
+        for timestamp, uuid, kind, value in records:
+            if kind != RecordKind.SENSOR:
+                continue
+            self.append(uuid, timestamp, value)
+
+    def query(
+        self,
+        uuid: int,
+        start: float,
+        end: float,
+    ) -> list[tuple[float, int]]:
+        """Return the (timestamp, reading) samples of a sensor within a time range.
+
+        Parameters
+        ----------
+        uuid : int
+            The unique identifier of the sensor.
+        start : float
+            The first timestamp to include.
+        end : float
+            The last timestamp to include.
+
+        Returns
+        -------
+        list[tuple[float, int]]
+            The samples, oldest first.
+        """
+
+        ring_file: _RingFile | None = self._existing_ring_file(uuid)
+        if ring_file is None:
+            return []
+
+        return list(ring_file.query(start, end))
+
+    def downsample(
+        self,
+        uuid: int,
+        start: float,
+        end: float,
+        bucket_count: int,
+    ) -> list[DownsampledBucket]:
+        """Summarize the history of a sensor into equally wide time buckets.
+
+        Parameters
+        ----------
+        uuid : int
+            The unique identifier of the sensor.
+        start : float
+            The first timestamp to include.
+        end : float
+            The last timestamp to include.
+        bucket_count : int
+            The number of buckets to split the time range into.
+
+        Returns
+        -------
+        list[DownsampledBucket]
+            The non-empty buckets, oldest first.
+        """
+
+        ring_file: _RingFile | None = self._existing_ring_file(uuid)
+        if ring_file is None or bucket_count <= 0 or end < start:
+            return []
+
+        bucket_width: float = (end - start) / bucket_count or 1.0
+        minimums: dict[int, int] = {}
+        maximums: dict[int, int] = {}
+        sums: dict[int, int] = {}
+        counts: dict[int, int] = {}
+
+        for timestamp, value in ring_file.query(start, end):
+            bucket: int = min(int((timestamp - start) / bucket_width), bucket_count - 1)
+            if bucket in counts:
+                minimums[bucket] = min(minimums[bucket], value)
+                maximums[bucket] = max(maximums[bucket], value)
+                sums[bucket] += value
+                counts[bucket] += 1
+            else:
+                minimums[bucket] = maximums[bucket] = sums[bucket] = value
+                counts[bucket] = 1
+
+        return [
+            DownsampledBucket(
+                start + bucket * bucket_width,
+                minimums[bucket],
+                maximums[bucket],
+                sums[bucket] / counts[bucket],
+                counts[bucket],
+            )
+            for bucket in sorted(counts)
+        ]
+
+    def close(self) -> None:
+        """Flush and close every ring file."""
+
+        for ring_file in self._ring_files.values():
+            ring_file.close()
+        self._ring_files = OrderedDict()
+
+    @property
+    def open_ring_file_count(self) -> int:
+        """Return the number of ring files currently mapped."""
+
+        return len(self._ring_files)
+
+    def _used_ring_file(self, uuid: int) -> _RingFile | None:
+        """Return the mapped ring file of a sensor, marking it as recently used."""
+
+        ring_file: _RingFile | None = self._ring_files.get(uuid)
+        if ring_file is not None:
+            self._ring_files.move_to_end(uuid)
+
+        return ring_file
+
+    def _existing_ring_file(self, uuid: int) -> _RingFile | None:
+        """Return the ring file of a sensor if it has any history."""
+
+        ring_file: _RingFile | None = self._used_ring_file(uuid)
+        if ring_file is not None:
+            return ring_file
+
+        if not self._ring_file_path(uuid).exists():
+            return None
+
+        return self._open_ring_file(uuid)
+
+    def _open_ring_file(self, uuid: int) -> _RingFile:
+        """Open the ring file of a sensor, creating it if needed.
+
+        The least recently used ring files are closed to stay within
+        `max_open_ring_files`.
+        """
+
+        while self._ring_files and len(self._ring_files) >= self.max_open_ring_files:
+            _, least_recently_used = self._ring_files.popitem(last=False)
+            least_recently_used.close()
+
+        ring_file: _RingFile = _RingFile(self._ring_file_path(uuid), self.capacity)
+        self._ring_files[uuid] = ring_file
+
+        return ring_file
+
+    def _ring_file_path(self, uuid: int) -> Path:
+        return self.directory / f"sensor_{uuid}.ring"
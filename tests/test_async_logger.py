@@ -0,0 +1,150 @@
+from pathlib import Path
+from threading import Event, current_thread
+from typing import BinaryIO, Iterable
+
+from src.async_logger import AsyncLogger, OverflowPolicy
+from src.event_log import EventLogWriter, EventRecord, RecordKind, read_event_log
+
+
+def test_async_logger_writes_on_close(tmp_path: Path):
+    """Test that every queued message is written once the logger is closed."""
+
+    streamed: list[str] = []
+    with open(tmp_path / "log.txt", "w", encoding="utf-8") as log_file:
+        with AsyncLogger(log_file, log_function=streamed.append) as logger:
+            logger.log_text("first")
+            logger.log_texts(["second", "third"])
+
+        assert logger.written_count == 3
+        assert logger.dropped_count == 0
+
+    assert streamed == ["first", "second", "third"]
+    assert (tmp_path / "log.txt").read_text(
+        encoding="utf-8"
+    ) == "first\nsecond\nthird\n"
+
+
+def test_async_logger_drop_oldest(tmp_path: Path):
+    """Test that the oldest messages are dropped when the queue is full."""
+
+    writer_started: Event = Event()
+    writer_released: Event = Event()
+    streamed: list[str] = []
+
+    def _stalled_log_function(loggable_text: str) -> None:
+        writer_started.set()
+        writer_released.wait()
+        streamed.append(loggable_text)
+
+    with open(tmp_path / "log.txt", "w", encoding="utf-8") as log_file:
+        logger: AsyncLogger = AsyncLogger(
+            log_file,
+            log_function=_stalled_log_function,
+            max_queue_size=2,
+            overflow_policy=OverflowPolicy.DROP_OLDEST,
+        )
+        logger.log_text("first")
+        writer_started.wait()
+
+        logger.log_texts(["second", "third", "fourth"])
+        assert logger.queue_depth == 2
+        assert logger.max_queue_depth == 2
+        assert logger.dropped_count == 1
+
+        writer_released.set()
+        logger.close()
+
+    assert streamed == ["first", "third", "fourth"]
+
+
+def test_async_logger_sample(tmp_path: Path):
+    """Test that only some overflowing messages are kept when sampling."""
+
+    writer_started: Event = Event()
+    writer_released: Event = Event()
+    streamed: list[str] = []
+
+    def _stalled_log_function(loggable_text: str) -> None:
+        writer_started.set()
+        writer_released.wait()
+        streamed.append(loggable_text)
+
+    with open(tmp_path / "log.txt", "w", encoding="utf-8") as log_file:
+        logger: AsyncLogger = AsyncLogger(
+            log_file,
+            log_function=_stalled_log_function,
+            max_queue_size=1,
+            overflow_policy=OverflowPolicy.SAMPLE,
+            sample_rate=3,
+        )
+        logger.log_text("first")
+        writer_started.wait()
+
+        logger.log_texts(["second", "third", "fourth", "fifth"])
+        assert logger.dropped_count == 3
+
+        writer_released.set()
+        logger.close()
+
+    assert streamed == ["first", "fifth"]
+
+
+def test_async_logger_survives_failed_batches(tmp_path: Path):
+    """Test that a failing batch is recorded and does not stop the writer."""
+
+    streamed: list[str] = []
+
+    def _log_function(loggable_text: str) -> None:
+        if loggable_text == "broken":
+            raise BrokenPipeError
+        streamed.append(loggable_text)
+
+    with open(tmp_path / "log.txt", "w", encoding="utf-8") as log_file:
+        with AsyncLogger(log_file, log_function=_log_function) as logger:
+            logger.log_text("broken")
+            logger.flush()
+            logger.log_text("after")
+
+        assert logger.failed_count == 1
+        assert isinstance(logger.last_error, BrokenPipeError)
+        assert logger.written_count == 1
+
+    assert streamed == ["after"]
+
+
+class _ThreadRecordingWriter(EventLogWriter):
+    def __init__(self, log_file: BinaryIO) -> None:
+        super().__init__(log_file)
+
+        self.thread_names: list[str] = []
+
+    def write_records(self, records: Iterable[EventRecord]) -> None:
+        self.thread_names.append(current_thread().name)
+
+        super().write_records(records)
+
+
+def test_async_logger_writes_records_on_the_writer_thread(tmp_path: Path):
+    """Test that binary records are written by the writer thread, in order."""
+
+    records: list[EventRecord] = [
+        EventRecord(float(second), 1, RecordKind.SENSOR, second) for second in range(3)
+    ]
+
+    with open(tmp_path / "log.txt", "w", encoding="utf-8") as log_file, open(
+        tmp_path / "log.bin", "wb"
+    ) as binary_log_file:
+        event_log_writer = _ThreadRecordingWriter(binary_log_file)
+        with AsyncLogger(
+            log_file, log_function=lambda _: None, event_log_writer=event_log_writer
+        ) as logger:
+            logger.log_records(records[:2])
+            logger.log_text("between")
+            logger.log_records(records[2:])
+
+        assert logger.written_count == 3
+
+    assert len(event_log_writer.thread_names) == 2
+    assert current_thread().name not in event_log_writer.thread_names
+    with open(tmp_path / "log.bin", "rb") as binary_log_file:
+        assert list(read_event_log(binary_log_file)) == records
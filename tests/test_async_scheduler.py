@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timezone
+
+from src.async_scheduler import (
+    AsyncScheduler,
+    AsyncSensorDriver,
+    SimulatedLatencyDriver,
+)
+from src.clock import VirtualClock
+from src.physical_quantity import PhysicalQuantity
+from src.sensor import Sensor
+
+
+class _ConstantDriver(AsyncSensorDriver):
+    async def read(self, sensor: Sensor) -> int:
+        return 42
+
+
+class _BarrierDriver(AsyncSensorDriver):
+    """Driver whose reads only complete once every sensor is being read."""
+
+    def __init__(self, sensor_count: int) -> None:
+        self.sensor_count = sensor_count
+        self.in_flight_count: int = 0
+        self.max_in_flight_count: int = 0
+
+        self._all_in_flight: asyncio.Event | None = None
+
+    async def read(self, sensor: Sensor) -> int:
+        if self._all_in_flight is None:
+            self._all_in_flight = asyncio.Event()
+        all_in_flight: asyncio.Event = self._all_in_flight
+
+        self.in_flight_count += 1
+        self.max_in_flight_count = max(self.max_in_flight_count, self.in_flight_count)
+        if self.in_flight_count == self.sensor_count:
+            all_in_flight.set()
+
+        # Reads awaited one by one never get there, and time out.
+        await asyncio.wait_for(all_in_flight.wait(), 5)
+
+        self.in_flight_count -= 1
+        if self.in_flight_count == 0:
+            self._all_in_flight = None
+
+        return 0
+
+
+def test_async_scheduler_reads_drivers():
+    """Test that driven sensors take their reading from the driver."""
+
+    driven_sensor: Sensor = Sensor("Driven sensor", PhysicalQuantity.MOTION, (0, 100))
+    walking_sensor: Sensor = Sensor("Walking sensor", PhysicalQuantity.MOTION, (0, 100))
+
+    scheduler: AsyncScheduler = AsyncScheduler(0)
+    scheduler.register_sensors([driven_sensor], driver=_ConstantDriver())
+    scheduler.register_sensors([walking_sensor])
+
+    dispatched: list[list[str]] = []
+    asyncio.run(scheduler.manual_update_async(dispatched.append))
+
+    assert driven_sensor.sensor_reading == 42
+    assert dispatched[0][0] == driven_sensor.get_loggable_text(False)
+
+    # The synchronous update does not read the drivers.
+    scheduler.manual_update()
+    assert driven_sensor.sensor_reading == 42
+
+
+def test_async_scheduler_overlaps_driver_latency():
+    """Test that slow drivers are awaited concurrently."""
+
+    sensors: list[Sensor] = [
+        Sensor("Serial sensor", PhysicalQuantity.TEMPERATURE, (-20, 75))
+        for _ in range(20)
+    ]
+    driver: _BarrierDriver = _BarrierDriver(len(sensors))
+
+    scheduler: AsyncScheduler = AsyncScheduler(
+        5,
+        clock=VirtualClock(datetime(2023, 1, 1, tzinfo=timezone.utc)),
+    )
+    scheduler.register_sensors(sensors, driver=driver)
+
+    asyncio.run(scheduler.simulate_async(2))
+
+    assert driver.max_in_flight_count == len(sensors)
+    assert driver.in_flight_count == 0
+    assert scheduler.clock.now() == datetime(2023, 1, 1, 0, 0, 10, tzinfo=timezone.utc)
+
+
+def test_simulated_latency_driver_reads_within_range():
+    """Test that the simulated driver returns a reading within the range."""
+
+    sensor: Sensor = Sensor("Serial sensor", PhysicalQuantity.TEMPERATURE, (-20, 75))
+
+    reading: int = asyncio.run(SimulatedLatencyDriver(0.0).read(sensor))
+
+    assert -20 <= reading <= 75
+
+
+def test_async_sensor_driver_is_abstract():
+    """Test that the base driver cannot be instantiated."""
+
+    try:
+        AsyncSensorDriver()  # type: ignore[abstract]
+    except TypeError:
+        return
+
+    raise AssertionError("The base driver was instantiated")
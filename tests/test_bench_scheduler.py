@@ -0,0 +1,37 @@
+from benchmarks.bench_scheduler import (
+    build_synthetic_home,
+    find_regressions,
+    run_benchmarks,
+)
+from src.scheduler import Scheduler
+
+
+def test_build_synthetic_home():
+    """Test that synthetic homes have the requested size."""
+
+    scheduler: Scheduler = build_synthetic_home(20, 5, 30, seed=1)
+
+    assert len(scheduler.sensors) == 20
+    assert len(scheduler.devices) == 5
+
+    scheduler.manual_update()
+
+
+def test_run_benchmarks_and_find_regressions():
+    """Test that a small benchmark run reports every metric."""
+
+    results: dict = run_benchmarks(10, 2, 10, tick_count=5, message_count=200)
+
+    assert results["parameters"]["sensors"] == 10
+    assert results["results"]["ticks_per_sec"] > 0
+    assert results["results"]["tick_p99_ms"] >= results["results"]["tick_p50_ms"]
+    assert results["results"]["bytes_per_entity"] > 0
+
+    assert find_regressions(results, results, 0.1) == []
+
+    faster_baseline: dict = {
+        "results": {"ticks_per_sec": results["results"]["ticks_per_sec"] * 2}
+    }
+    regressions: list[str] = find_regressions(results, faster_baseline, 0.1)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("ticks_per_sec:")
@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.checkpoint import (
+    CheckpointWriter,
+    capture_checkpoint,
+    load_checkpoint,
+    restore_checkpoint,
+)
+from src.clock import VirtualClock
+from src.device import Device
+from src.device_command import DeviceCommand
+from src.noise import GaussianDrift
+from src.physical_quantity import PhysicalQuantity
+from src.requirement import SensorRequirement
+from src.scheduler import Scheduler, SchedulerEvent
+from src.sensor import Sensor
+
+
+def _build_home(sensor_count: int = 20) -> Scheduler:
+    """Build the same home every time, with fresh sensors and devices."""
+
+    sensors: list[Sensor] = [
+        Sensor(
+            f"Checkpoint sensor {index}",
+            PhysicalQuantity.TEMPERATURE,
+            (0, 100),
+            noise_model=GaussianDrift() if index % 2 else None,
+        )
+        for index in range(sensor_count)
+    ]
+    device: Device = Device("Checkpoint heater", PhysicalQuantity.TEMPERATURE, (0, 100))
+
+    scheduler: Scheduler = Scheduler(
+        1,
+        VirtualClock(datetime(2024, 1, 1, tzinfo=timezone.utc)),
+    )
+    scheduler.register_sensors(sensors)
+    scheduler.register_devices([device])
+    scheduler.register_events(
+        [
+            SchedulerEvent(
+                requirements=[SensorRequirement(sensors[0], "GT", 50, hysteresis=10)],
+                actions=[DeviceCommand(device, 100)],
+                edge_triggered=True,
+            ),
+            SchedulerEvent(
+                requirements=[SensorRequirement(sensors[0], "LE", 50)],
+                actions=[DeviceCommand(device, 0)],
+                cooldown_sec=3,
+            ),
+        ]
+    )
+    scheduler.seed(0)
+
+    return scheduler
+
+
+def _state(scheduler: Scheduler) -> tuple[datetime, list[int], list[int]]:
+    return (
+        scheduler.clock.now(),
+        [sensor.sensor_reading for sensor in scheduler.sensors],
+        [device.device_value for device in scheduler.devices],
+    )
+
+
+def test_checkpoint_resumes_the_same_simulation(tmp_path: Path):
+    """Test that a restored simulation continues exactly like the original."""
+
+    scheduler: Scheduler = _build_home()
+    scheduler.simulate(25)
+
+    load_path: Path = tmp_path / "home.checkpoint"
+    with CheckpointWriter() as checkpoint_writer:
+        checkpoint_writer.save(scheduler, load_path)
+        checkpoint_writer.flush()
+        assert checkpoint_writer.written_count == 1
+    checkpoint = capture_checkpoint(scheduler)
+
+    scheduler.simulate(25)
+    expected_state = _state(scheduler)
+
+    loaded_scheduler: Scheduler = _build_home()
+    load_checkpoint(loaded_scheduler, load_path)
+    loaded_scheduler.simulate(25)
+    assert _state(loaded_scheduler) == expected_state
+
+    forked_scheduler: Scheduler = _build_home()
+    restore_checkpoint(forked_scheduler, checkpoint)
+    forked_scheduler.simulate(25)
+    assert _state(forked_scheduler) == expected_state
+
+
+def test_checkpoint_rejects_another_home():
+    """Test that a checkpoint cannot be restored into a different home."""
+
+    checkpoint = capture_checkpoint(_build_home())
+
+    try:
+        restore_checkpoint(_build_home(sensor_count=10), checkpoint)
+    except ValueError:
+        return
+
+    raise AssertionError("The checkpoint was restored into another home")
+
+
+def test_checkpoint_keeps_uuids_unique():
+    """Test that the uuid trackers never move backwards when restoring."""
+
+    checkpoint = capture_checkpoint(_build_home())
+    scheduler: Scheduler = _build_home()
+    sensor_uuid_tracker: int = Sensor.next_uuid()
+
+    restore_checkpoint(scheduler, checkpoint)
+
+    assert Sensor.next_uuid() == sensor_uuid_tracker
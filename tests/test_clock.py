@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from src.clock import VirtualClock
+from src.event_log import EventRecord
+from src.physical_quantity import PhysicalQuantity
+from src.scheduler import Scheduler
+from src.sensor import Sensor
+
+SIMULATION_START: datetime = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+def test_virtual_clock_sleep_advances_time():
+    """Test that sleeping on a virtual clock advances the simulated time."""
+
+    clock: VirtualClock = VirtualClock(SIMULATION_START)
+
+    clock.sleep(3600)
+    assert clock.now() == datetime(2023, 1, 1, 1, tzinfo=timezone.utc)
+
+
+def test_scheduler_simulate_with_virtual_clock():
+    """Test that simulated ticks are stamped with simulated time."""
+
+    sensor: Sensor = Sensor("Clock sensor", PhysicalQuantity.MOTION, (0, 100))
+    scheduler: Scheduler = Scheduler(5, clock=VirtualClock(SIMULATION_START))
+    scheduler.register_sensors([sensor])
+
+    dispatched: list[list[EventRecord]] = []
+    scheduler.subscribe_records(dispatched.append)
+    scheduler.simulate(24 * 60 * 12)
+
+    assert len(dispatched) == 24 * 60 * 12
+    assert dispatched[1][0].timestamp - dispatched[0][0].timestamp == 5
+    assert scheduler.clock.now() == datetime(2023, 1, 2, tzinfo=timezone.utc)
+    assert sensor.get_loggable_text().startswith("[2023-01-02 00:00:00+00:00]")
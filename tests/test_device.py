@@ -1,4 +1,4 @@
-from src.device import BASIC_SMART_LIGHT
+from src.device import BASIC_SMART_LIGHT, Device
 from src.physical_quantity import PhysicalQuantity
 
 
@@ -21,3 +21,34 @@ def test_device_getters():
         BASIC_SMART_LIGHT.set_device_value(50)
         == "Basic smart light: current BRIGHTNESS (%) is 50."
     )
+
+
+def test_device_loggable_text_is_cached():
+    """Test that the loggable text is reused until the value changes."""
+
+    device: Device = Device("Cached light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    loggable_text: str = device.get_loggable_text(False)
+    assert device.get_loggable_text(False) is loggable_text
+    assert device.set_device_value(0) is loggable_text
+
+    assert device.set_device_value(30) == "Cached light: current BRIGHTNESS (%) is 30."
+
+
+def test_device_restore_device_value():
+    """Test that a restored value refreshes the loggable text without a write."""
+
+    device: Device = Device("Restored light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+    writes: list[int] = []
+    device._value_listener = lambda written_device: writes.append(
+        written_device.device_value
+    )
+    device.get_loggable_text(False)
+
+    device.restore_device_value(70)
+
+    assert device.device_value == 70
+    assert device.get_loggable_text(False) == (
+        "Restored light: current BRIGHTNESS (%) is 70."
+    )
+    assert writes == []
@@ -0,0 +1,79 @@
+from src.device import Device
+from src.device_command import CoalescePolicy, CommandBuffer, DeviceCommand
+from src.physical_quantity import PhysicalQuantity
+
+
+def _make_device() -> Device:
+    return Device("Command light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+
+def test_device_command_call():
+    """Test that calling a command writes the device right away."""
+
+    device: Device = _make_device()
+
+    assert (
+        DeviceCommand(device, 150)() == "Command light: current BRIGHTNESS (%) is 100."
+    )
+    assert device.device_value == 100
+
+
+def test_command_buffer_policies():
+    """Test how each policy merges conflicting commands."""
+
+    expected_values: dict[CoalescePolicy, int] = {
+        CoalescePolicy.LAST_WRITER: 30,
+        CoalescePolicy.PRIORITY: 80,
+        CoalescePolicy.MAX: 80,
+        CoalescePolicy.MIN: 10,
+    }
+
+    for policy, expected_value in expected_values.items():
+        device: Device = _make_device()
+        commands: CommandBuffer = CommandBuffer(policy)
+
+        commands.add(DeviceCommand(device, 10), priority=0)
+        commands.add(DeviceCommand(device, 80), priority=5)
+        commands.add(DeviceCommand(device, 30), priority=1)
+
+        assert len(commands) == 1
+        assert device.device_value == 0
+
+        assert commands.apply() == [
+            f"Command light: current BRIGHTNESS (%) is {expected_value}."
+        ]
+        assert device.device_value == expected_value
+        assert len(commands) == 0
+
+
+def test_command_buffer_applies_each_device_once():
+    """Test that the device listener sees one write per device."""
+
+    first_device: Device = _make_device()
+    second_device: Device = _make_device()
+    written_uuids: list[int] = []
+    first_device._value_listener = lambda device: written_uuids.append(device.uuid)
+    second_device._value_listener = lambda device: written_uuids.append(device.uuid)
+
+    commands: CommandBuffer = CommandBuffer()
+    for value in range(5):
+        commands.add(DeviceCommand(first_device, value))
+        commands.add(DeviceCommand(second_device, value))
+    commands.apply()
+
+    assert written_uuids == [first_device.uuid, second_device.uuid]
+
+
+def test_command_buffer_apply_changes_only():
+    """Test that commands repeating the device value are not logged."""
+
+    device: Device = _make_device()
+    commands: CommandBuffer = CommandBuffer()
+
+    commands.add(DeviceCommand(device, 0))
+    assert commands.apply(changes_only=True) == []
+
+    commands.add(DeviceCommand(device, 40))
+    assert commands.apply(changes_only=True) == [
+        "Command light: current BRIGHTNESS (%) is 40."
+    ]
@@ -0,0 +1,110 @@
+from src.event_gate import EventGates
+from src.scheduler import SchedulerEvent
+
+
+def _gate(**gate_options: object) -> EventGates:
+    """Build gates for an ungated event followed by a gated one."""
+
+    event_gates: EventGates = EventGates()
+    event_gates.build(
+        [
+            SchedulerEvent(requirements=[], actions=[]),
+            SchedulerEvent(requirements=[], actions=[], **gate_options),  # type: ignore[arg-type]
+        ]
+    )
+
+    return event_gates
+
+
+def _fires(event_gates: EventGates, level: bool, now: float) -> bool:
+    triggered_event_indices: list[int] = [0, 1] if level else [0]
+    fired_event_indices: list[int] = event_gates.filter(
+        triggered_event_indices,
+        [True, level],
+        None,
+        now,
+    )
+
+    # The ungated event is never filtered.
+    assert fired_event_indices[0] == 0
+
+    return 1 in fired_event_indices
+
+
+def test_event_gates_ignore_ungated_events():
+    """Test that only gated events are tracked."""
+
+    assert len(_gate()) == 0
+    assert len(_gate(edge_triggered=True)) == 1
+
+
+def test_event_gates_edge_triggered():
+    """Test that an edge-triggered event fires once per rising edge."""
+
+    event_gates: EventGates = _gate(edge_triggered=True)
+
+    levels: list[bool] = [True, True, False, True, True]
+    assert [_fires(event_gates, level, now) for now, level in enumerate(levels)] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+    ]
+
+
+def test_event_gates_debounce():
+    """Test that a debounced event fires once its requirements held long enough."""
+
+    event_gates: EventGates = _gate(debounce_sec=2)
+
+    levels: list[bool] = [True, True, False, True, True, True, True]
+    assert [_fires(event_gates, level, now) for now, level in enumerate(levels)] == [
+        False,
+        False,
+        False,
+        False,
+        False,
+        True,
+        True,
+    ]
+
+
+def test_event_gates_cooldown():
+    """Test that an event waits for its cooldown before firing again."""
+
+    event_gates: EventGates = _gate(cooldown_sec=2)
+
+    assert [_fires(event_gates, True, now) for now in range(5)] == [
+        True,
+        False,
+        True,
+        False,
+        True,
+    ]
+
+
+def test_event_gates_pass_events_that_are_not_due_through():
+    """Test that events that are not due are not filtered, nor their state updated."""
+
+    event_gates: EventGates = _gate(edge_triggered=True)
+
+    # The edge is only seen once the event is due, so it fires then.
+    assert event_gates.filter([1], [False, True], [0], 0) == [1]
+    assert event_gates.filter([1], [False, True], [1], 1) == [1]
+    assert event_gates.filter([1], [False, True], [1], 2) == []
+
+
+def test_event_gates_keep_state_when_rebuilt():
+    """Test that registering more events keeps the state of the others."""
+
+    events: list[SchedulerEvent] = [
+        SchedulerEvent(requirements=[], actions=[], edge_triggered=True)
+    ]
+    event_gates: EventGates = EventGates()
+    event_gates.build(events)
+    assert event_gates.filter([0], [True], None, 0) == [0]
+
+    events.append(SchedulerEvent(requirements=[], actions=[], edge_triggered=True))
+    event_gates.build(events)
+    assert event_gates.filter([0, 1], [True, True], None, 1) == [1]
@@ -0,0 +1,89 @@
+from io import BytesIO, StringIO
+
+from src.device import Device
+from src.event_log import (
+    RECORD_STRUCT,
+    EventLogWriter,
+    EventRecord,
+    RecordKind,
+    dump_catalog,
+    load_catalog,
+    read_event_log,
+    render_event_record,
+)
+from src.physical_quantity import PhysicalQuantity
+from src.scheduler import Scheduler, SchedulerEvent
+from src.sensor import Sensor
+
+
+def test_event_log_round_trip():
+    """Test that written records can be read back, ignoring partial records."""
+
+    records: list[EventRecord] = [
+        EventRecord(1700000000.5, 1, RecordKind.SENSOR, -20),
+        EventRecord(1700000001.0, 100001, RecordKind.DEVICE, 75),
+        EventRecord(1700000002.0, 2**40, RecordKind.SENSOR, 3_000_000_000),
+    ]
+
+    log_file: BytesIO = BytesIO()
+    EventLogWriter(log_file).write_records(records)
+    assert len(log_file.getvalue()) == 3 * RECORD_STRUCT.size
+
+    log_file.write(b"\x00\x01")
+    log_file.seek(0)
+    assert list(read_event_log(log_file)) == records
+
+
+def test_event_log_render():
+    """Test that records render in the text format of the entities."""
+
+    sensor: Sensor = Sensor("Log sensor", PhysicalQuantity.BRIGHTNESS, (0, 100))
+    device: Device = Device("Log light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    catalog_file: StringIO = StringIO()
+    dump_catalog(catalog_file, [sensor], [device])
+    catalog_file.seek(0)
+    catalog = load_catalog(catalog_file)
+
+    assert (
+        render_event_record(
+            EventRecord(0, sensor.uuid, RecordKind.SENSOR, 0),
+            catalog,
+        )
+        == f"[1970-01-01 00:00:00+00:00] {sensor.get_loggable_text(False)}"
+    )
+    assert (
+        render_event_record(
+            EventRecord(0, device.uuid, RecordKind.DEVICE, 0),
+            catalog,
+        )
+        == f"[1970-01-01 00:00:00+00:00] {device.get_loggable_text(False)}"
+    )
+
+
+def test_scheduler_subscribe_records():
+    """Test that the scheduler reports sensor readings and device writes."""
+
+    sensor: Sensor = Sensor("Log sensor", PhysicalQuantity.MOTION, (0, 100))
+    device: Device = Device("Log light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_sensors([sensor])
+    scheduler.register_devices([device])
+    scheduler.register_events(
+        [
+            SchedulerEvent(
+                requirements=[],
+                actions=[lambda: device.set_device_value(60)],
+            )
+        ]
+    )
+
+    dispatched: list[list[EventRecord]] = []
+    scheduler.subscribe_records(dispatched.append)
+    scheduler.manual_update()
+
+    assert [(record.uuid, record.kind, record.value) for record in dispatched[0]] == [
+        (sensor.uuid, RecordKind.SENSOR, sensor.sensor_reading),
+        (device.uuid, RecordKind.DEVICE, 60),
+    ]
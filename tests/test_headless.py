@@ -0,0 +1,77 @@
+import json
+from http.client import HTTPConnection, HTTPResponse
+from threading import Thread
+
+from src.device import Device
+from src.headless import HeadlessServer
+from src.physical_quantity import PhysicalQuantity
+from src.scheduler import Scheduler
+from src.sensor import Sensor
+
+
+def _read_sse_event(response: HTTPResponse) -> tuple[str, dict]:
+    event: str = ""
+    data: dict = {}
+    while True:
+        line: str = response.readline().decode("utf-8").rstrip("\n")
+        if line.startswith("event: "):
+            event = line.removeprefix("event: ")
+        elif line.startswith("data: "):
+            data = json.loads(line.removeprefix("data: "))
+        elif not line and event:
+            return event, data
+
+
+def test_headless_server_streams_state_and_diffs():
+    """Test that the server serves the full state, then diffs per tick."""
+
+    sensor: Sensor = Sensor("Headless sensor", PhysicalQuantity.MOTION, (0, 100))
+    device: Device = Device("Headless light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_sensors([sensor])
+    scheduler.register_devices([device])
+
+    with HeadlessServer(scheduler, port=0) as server:
+        host, port = server.address
+
+        connection: HTTPConnection = HTTPConnection(host, port, timeout=5)
+        connection.request("GET", "/state")
+        state: dict = json.loads(connection.getresponse().read())
+        assert state["sensors"][0]["uuid"] == sensor.uuid
+        assert state["sensors"][0]["value"] == sensor.sensor_reading
+        assert state["devices"][0]["name"] == "Headless light"
+
+        connection.request("GET", "/missing")
+        assert connection.getresponse().status == 404
+        connection.close()
+
+        stream: HTTPConnection = HTTPConnection(host, port, timeout=5)
+        stream.request("GET", "/events")
+        response: HTTPResponse = stream.getresponse()
+        assert response.getheader("Content-Type") == "text/event-stream"
+
+        event, data = _read_sse_event(response)
+        assert event == "state"
+        assert data["devices"][0]["value"] == 0
+
+        device.set_device_value(70)
+        scheduler.manual_update()
+
+        event, data = _read_sse_event(response)
+        assert event == "diff"
+        assert data["devices"] == {str(device.uuid): 70}
+
+        stream.close()
+
+
+def test_headless_server_closes_without_starting():
+    """Test that a server that never started can be closed."""
+
+    server: HeadlessServer = HeadlessServer(Scheduler(0), port=0)
+
+    closing: Thread = Thread(target=server.close, daemon=True)
+    closing.start()
+    closing.join(5)
+
+    assert not closing.is_alive()
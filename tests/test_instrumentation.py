@@ -0,0 +1,98 @@
+from time import sleep
+
+from src.instrumentation import DurationHistogram, HistogramInstrumentation, TickPhase
+from src.device import Device
+from src.device_command import DeviceCommand
+from src.physical_quantity import PhysicalQuantity
+from src.requirement import SensorRequirement
+from src.scheduler import Scheduler, SchedulerEvent
+from src.sensor import Sensor
+
+
+def test_duration_histogram():
+    """Test that durations are counted in power-of-two buckets."""
+
+    histogram: DurationHistogram = DurationHistogram()
+    for duration_ns in [0, 1, 3, 100, 100, 1000]:
+        histogram.add(duration_ns)
+
+    assert histogram.count == 6
+    assert histogram.total_ns == 1204
+
+    summary: dict = histogram.export()
+    assert summary["max_ns"] == 1000
+    assert summary["buckets"] == {"0": 1, "1": 1, "3": 1, "127": 2, "1023": 1}
+    assert summary["p50_ns"] == 3
+    assert summary["p99_ns"] == 1000
+
+
+def test_scheduler_instrumentation():
+    """Test that the scheduler reports its tick phases and triggered events."""
+
+    sensor: Sensor = Sensor("Instrumented sensor", PhysicalQuantity.MOTION, (0, 100))
+    device: Device = Device("Instrumented light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_sensors([sensor])
+    scheduler.register_devices([device])
+    scheduler.register_events(
+        [
+            SchedulerEvent(
+                requirements=[SensorRequirement(sensor, "LT", 0)],
+                actions=[lambda: device.set_device_value(0)],
+            ),
+            SchedulerEvent(
+                requirements=[SensorRequirement(sensor, "GE", 0)],
+                actions=[lambda: device.set_device_value(100)],
+            ),
+        ]
+    )
+
+    # Nothing is recorded without instrumentation.
+    scheduler.manual_update()
+
+    instrumentation: HistogramInstrumentation = HistogramInstrumentation()
+    scheduler.instrumentation = instrumentation
+
+    dispatched: list[list[str]] = []
+    scheduler.manual_update(dispatched.append)
+    scheduler.manual_update()
+
+    assert instrumentation.phases[TickPhase.UPDATE_SENSORS].count == 2
+    assert instrumentation.phases[TickPhase.EVALUATE_REQUIREMENTS].count == 2
+    assert instrumentation.phases[TickPhase.TRIGGER_ACTIONS].count == 2
+    assert instrumentation.phases[TickPhase.DISPATCH_LOGS].count == 1
+    assert instrumentation.phases[TickPhase.DISPATCH_RECORDS].count == 2
+    assert list(instrumentation.events) == [1]
+    assert instrumentation.events[1].count == 2
+
+    assert dispatched[0][-1] == "Instrumented light: current BRIGHTNESS (%) is 100."
+    assert list(instrumentation.export()["events"]) == ["1"]
+
+
+class _SlowDevice(Device):
+    __slots__ = ()
+
+    def set_device_value(self, value: int, include_timestamp: bool = False) -> str:
+        sleep(0.01)
+
+        return super().set_device_value(value, include_timestamp)
+
+
+def test_scheduler_instrumentation_times_device_commands():
+    """Test that the write of a device command counts towards its event."""
+
+    device: Device = _SlowDevice("Slow light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_devices([device])
+    scheduler.register_events(
+        [SchedulerEvent(requirements=[], actions=[DeviceCommand(device, 50)])]
+    )
+
+    instrumentation: HistogramInstrumentation = HistogramInstrumentation()
+    scheduler.instrumentation = instrumentation
+    scheduler.manual_update()
+
+    assert instrumentation.events[0].count == 1
+    assert instrumentation.export()["events"]["0"]["max_ns"] >= 10_000_000
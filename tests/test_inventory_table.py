@@ -0,0 +1,27 @@
+from src.device import Device
+from src.inventory_table import filter_inventory, item_kind
+from src.physical_quantity import PhysicalQuantity
+from src.sensor import Sensor
+
+
+def test_filter_inventory():
+    """Test that items can be searched by name and filtered by kind."""
+
+    motion_sensor: Sensor = Sensor("Hallway motion", PhysicalQuantity.MOTION, (0, 100))
+    thermometer: Sensor = Sensor(
+        "Hallway thermometer", PhysicalQuantity.TEMPERATURE, (0, 40)
+    )
+    light: Device = Device("Kitchen light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    items: list[Sensor | Device] = [motion_sensor, thermometer, light]
+
+    assert item_kind(thermometer) == PhysicalQuantity.TEMPERATURE
+    assert item_kind(light) == PhysicalQuantity.BRIGHTNESS
+
+    assert filter_inventory(items) == items
+    assert filter_inventory(items, "  hallway ") == [motion_sensor, thermometer]
+    assert filter_inventory(items, "hallway", PhysicalQuantity.MOTION) == [
+        motion_sensor
+    ]
+    assert filter_inventory(items, kind=PhysicalQuantity.BRIGHTNESS) == [light]
+    assert filter_inventory(items, "garage") == []
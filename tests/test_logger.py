@@ -0,0 +1,75 @@
+from pathlib import Path
+from time import monotonic, sleep
+
+from src.logger import Logger
+
+
+def test_logger_log_texts(tmp_path: Path):
+    """Test that messages are appended to the log file and the stream."""
+
+    streamed: list[str] = []
+    with open(tmp_path / "log.txt", "w", encoding="utf-8") as log_file:
+        logger: Logger = Logger(log_file, log_function=streamed.append)
+        logger.log_text("first")
+        logger.log_texts(["second", "third"])
+
+    assert streamed == ["first", "second", "third"]
+    assert (tmp_path / "log.txt").read_text(
+        encoding="utf-8"
+    ) == "first\nsecond\nthird\n"
+
+
+def test_logger_buffered_flushes_on_close(tmp_path: Path):
+    """Test that buffered messages are written only when flushed."""
+
+    with open(tmp_path / "log.txt", "w", encoding="utf-8") as log_file:
+        with Logger(
+            log_file,
+            log_function=lambda _: None,
+            buffered=True,
+            flush_interval_sec=3600,
+        ) as logger:
+            logger.log_texts(["first", "second"])
+            assert (tmp_path / "log.txt").read_text(encoding="utf-8") == ""
+
+        assert (tmp_path / "log.txt").read_text(encoding="utf-8") == "first\nsecond\n"
+
+
+def test_logger_buffered_flushes_on_size(tmp_path: Path):
+    """Test that the buffer is flushed once it grows beyond the flush size."""
+
+    with open(tmp_path / "log.txt", "w", encoding="utf-8") as log_file:
+        logger: Logger = Logger(
+            log_file,
+            log_function=lambda _: None,
+            buffered=True,
+            flush_size=10,
+            flush_interval_sec=3600,
+        )
+        logger.log_text("short")
+        assert (tmp_path / "log.txt").read_text(encoding="utf-8") == ""
+
+        logger.log_text("long enough")
+        assert (tmp_path / "log.txt").read_text(
+            encoding="utf-8"
+        ) == "short\nlong enough\n"
+
+
+def test_logger_buffered_flushes_on_timer(tmp_path: Path):
+    """Test that buffered messages are flushed even if no message follows."""
+
+    with open(tmp_path / "log.txt", "w", encoding="utf-8") as log_file:
+        with Logger(
+            log_file,
+            log_function=lambda _: None,
+            buffered=True,
+            flush_interval_sec=0.05,
+        ) as logger:
+            logger.log_texts(["first"])
+
+            deadline: float = monotonic() + 5
+            while not (tmp_path / "log.txt").read_text(encoding="utf-8"):
+                assert monotonic() < deadline
+                sleep(0.01)
+
+            assert (tmp_path / "log.txt").read_text(encoding="utf-8") == "first\n"
@@ -0,0 +1,150 @@
+from random import Random
+
+from src.noise import DiurnalCurve, GaussianDrift, NoiseModel, UniformBlock
+from src.physical_quantity import PhysicalQuantity
+from src.scheduler import Scheduler
+from src.sensor import Sensor
+from src.sensor_fleet import SensorFleet
+
+
+def _seeded_fleet_readings(seed: int) -> list[list[int]]:
+    fleet: SensorFleet = SensorFleet(seed)
+    for index in range(50):
+        fleet.attach(
+            Sensor(f"Seeded sensor {index}", PhysicalQuantity.MOTION, (0, 100))
+        )
+    fleet.attach(
+        Sensor(
+            "Drifting sensor",
+            PhysicalQuantity.MOTION,
+            (0, 100),
+            noise_model=GaussianDrift(),
+        )
+    )
+
+    readings: list[list[int]] = []
+    for step in range(20):
+        if step % 2:
+            fleet.step(0.0)
+        else:
+            fleet.step_slots(range(0, 51, 3), 0.0)
+        readings.append(list(fleet.readings))
+
+    return readings
+
+
+def test_uniform_block_matches_random():
+    """Test that blocks return the numbers of the generator, in order."""
+
+    block: UniformBlock = UniformBlock(Random(7), block_size=4)
+    expected: Random = Random(7)
+
+    numbers: list[float] = block.take(3) + block.take(3) + block.take(10)
+
+    assert numbers == [expected.random() for _ in range(16)]
+
+
+def test_seeded_fleets_are_reproducible():
+    """Test that fleets seeded the same way produce the same readings."""
+
+    assert _seeded_fleet_readings(1) == _seeded_fleet_readings(1)
+    assert _seeded_fleet_readings(1) != _seeded_fleet_readings(2)
+
+
+def test_noise_models_stay_in_range():
+    """Test that noise models replace the random walk within the range."""
+
+    fleet: SensorFleet = SensorFleet(3)
+    drifting_index: int = fleet.attach(
+        Sensor(
+            "Drifting sensor",
+            PhysicalQuantity.TEMPERATURE,
+            (-20, 40),
+            noise_model=GaussianDrift(0.5),
+        )
+    )
+    diurnal_index: int = fleet.attach(
+        Sensor(
+            "Diurnal sensor",
+            PhysicalQuantity.BRIGHTNESS,
+            (0, 100),
+            noise_model=DiurnalCurve(peak_sec=0.0, noise_percentage=0.0),
+        )
+    )
+
+    for _ in range(100):
+        fleet.step(0.0)
+        assert -20 <= fleet.reading(drifting_index) <= 40
+
+    # At the peak, and half a day later at the trough.
+    assert fleet.reading(diurnal_index) == 100
+    fleet.step_slots([diurnal_index], 43_200.0)
+    assert fleet.reading(diurnal_index) == 0
+
+    # The random walk takes over again without a model.
+    fleet.set_noise_model(diurnal_index, None)
+    fleet.set_reading(diurnal_index, 50)
+    fleet.step(43_200.0)
+    assert 40 <= fleet.reading(diurnal_index) <= 60
+
+
+def test_sensor_random_generator_is_reproducible():
+    """Test that sensors outside a fleet use their own generator."""
+
+    readings: list[list[int]] = []
+    for _ in range(2):
+        sensor: Sensor = Sensor(
+            "Standalone sensor",
+            PhysicalQuantity.MOTION,
+            (0, 100),
+            random_generator=Random(5),
+        )
+        readings.append([sensor.sample_next_reading() for _ in range(10)])
+
+    assert readings[0] == readings[1]
+
+
+def test_scheduler_seed_is_reproducible():
+    """Test that seeded schedulers update their sensors the same way."""
+
+    readings: list[list[int]] = []
+    for _ in range(2):
+        sensors: list[Sensor] = [
+            Sensor(f"Scheduled sensor {index}", PhysicalQuantity.MOTION, (0, 100))
+            for index in range(10)
+        ]
+        scheduler: Scheduler = Scheduler(0)
+        scheduler.register_sensors(sensors)
+        scheduler.seed(11)
+        for _ in range(5):
+            scheduler.manual_update()
+        readings.append([sensor.sensor_reading for sensor in sensors])
+
+    assert readings[0] == readings[1]
+
+
+def test_attached_sensors_use_the_seeded_fleet_generator():
+    """Test that sensors updated directly are reproducible once the scheduler is seeded."""
+
+    readings: list[list[int]] = []
+    for _ in range(2):
+        sensor: Sensor = Sensor("Direct sensor", PhysicalQuantity.MOTION, (0, 100))
+        scheduler: Scheduler = Scheduler(0)
+        scheduler.register_sensors([sensor])
+        scheduler.seed(13)
+        for _ in range(10):
+            sensor.update_sensor_value()
+        readings.append([sensor.sensor_reading, sensor.sample_next_reading()])
+
+    assert readings[0] == readings[1]
+
+
+def test_noise_model_is_abstract():
+    """Test that the base noise model cannot be instantiated."""
+
+    try:
+        NoiseModel()  # type: ignore[abstract]
+    except TypeError:
+        return
+
+    raise AssertionError("The base noise model was instantiated")
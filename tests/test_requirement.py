@@ -0,0 +1,54 @@
+from src.physical_quantity import PhysicalQuantity
+from src.requirement import SensorRequirement
+from src.sensor import Sensor
+
+
+def test_sensor_requirement_properties():
+    """Test that sensor requirements expose what they depend on."""
+
+    sensor: Sensor = Sensor("Requirement sensor", PhysicalQuantity.MOTION, (0, 100))
+    requirement: SensorRequirement = SensorRequirement(sensor, "GT", 80)
+
+    assert requirement.sensor is sensor
+    assert requirement.sensor_uuid == sensor.uuid
+    assert requirement.mode == "GT"
+    assert requirement.threshold == 80
+
+
+def test_sensor_requirement_call():
+    """Test that sensor requirements can be called like plain requirements."""
+
+    sensor: Sensor = Sensor("Requirement sensor", PhysicalQuantity.MOTION, (0, 100))
+
+    assert SensorRequirement(sensor, "LE", 80)() is True
+    assert SensorRequirement(sensor, "GT", 80)() is False
+
+
+def test_sensor_requirement_hysteresis():
+    """Test that a satisfied requirement is released past its hysteresis band."""
+
+    sensor: Sensor = Sensor("Requirement sensor", PhysicalQuantity.MOTION, (0, 100))
+    requirement: SensorRequirement = SensorRequirement(sensor, "GT", 50, hysteresis=10)
+    assert requirement.release_threshold == 40
+
+    results: list[bool] = []
+    for reading in (45, 55, 45, 40, 45):
+        sensor._sensor_reading = reading
+        results.append(requirement())
+
+    assert results == [False, True, True, False, False]
+
+
+def test_sensor_requirement_hysteresis_modes():
+    """Test that hysteresis is only allowed for ordering comparison modes."""
+
+    sensor: Sensor = Sensor("Requirement sensor", PhysicalQuantity.MOTION, (0, 100))
+
+    assert SensorRequirement(sensor, "LT", 50, hysteresis=5).release_threshold == 55
+
+    for mode in ("EQ", "NE"):
+        try:
+            SensorRequirement(sensor, mode, 50, hysteresis=5)  # type: ignore[arg-type]
+        except ValueError:
+            continue
+        raise AssertionError(f"{mode} accepted a hysteresis band")
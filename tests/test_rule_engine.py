@@ -0,0 +1,163 @@
+from src.physical_quantity import PhysicalQuantity
+from src.requirement import SensorRequirement
+from src.rule_engine import RuleEngine
+from src.scheduler import SchedulerEvent
+from src.sensor import ComparisonMode, Sensor
+from src.sensor_fleet import SensorFleet
+
+
+def _prepare_fleet() -> tuple[SensorFleet, Sensor]:
+    sensor: Sensor = Sensor("Rule sensor", PhysicalQuantity.BRIGHTNESS, (0, 100))
+    fleet: SensorFleet = SensorFleet()
+    fleet.attach(sensor)
+
+    return fleet, sensor
+
+
+def test_rule_engine_matches_compare_sensor_reading():
+    """Test that compiled requirements agree with compare_sensor_reading."""
+
+    fleet, sensor = _prepare_fleet()
+    modes: list[ComparisonMode] = ["EQ", "NE", "LE", "GE", "LT", "GT"]
+    events: list[SchedulerEvent] = [
+        SchedulerEvent(
+            requirements=[SensorRequirement(sensor, mode, threshold)],
+            actions=[],
+        )
+        for mode in modes
+        for threshold in (40, 50, 60)
+    ]
+
+    rule_engine: RuleEngine = RuleEngine()
+    rule_engine.compile(events, fleet)
+    assert rule_engine.compiled_requirement_count == len(events)
+
+    fleet.set_reading(0, 50)
+    assert rule_engine.evaluate() == [event.should_trigger() for event in events]
+
+
+def test_rule_engine_requires_all_requirements():
+    """Test that an event triggers only when every requirement is met."""
+
+    fleet, sensor = _prepare_fleet()
+    event: SchedulerEvent = SchedulerEvent(
+        requirements=[
+            SensorRequirement(sensor, "GT", 20),
+            SensorRequirement(sensor, "LE", 40),
+        ],
+        actions=[],
+    )
+
+    rule_engine: RuleEngine = RuleEngine()
+    rule_engine.compile([event], fleet)
+
+    fleet.set_reading(0, 30)
+    assert rule_engine.evaluate() == [True]
+
+    fleet.set_reading(0, 50)
+    assert rule_engine.evaluate() == [False]
+
+
+def test_rule_engine_falls_back_to_opaque_requirements():
+    """Test that events with plain callables are still evaluated."""
+
+    fleet, _ = _prepare_fleet()
+    unattached_sensor: Sensor = Sensor(
+        "Unattached sensor",
+        PhysicalQuantity.BRIGHTNESS,
+        (0, 100),
+    )
+    events: list[SchedulerEvent] = [
+        SchedulerEvent(requirements=[lambda: False], actions=[]),
+        SchedulerEvent(
+            requirements=[SensorRequirement(unattached_sensor, "EQ", 0)],
+            actions=[],
+        ),
+        SchedulerEvent(requirements=[], actions=[]),
+    ]
+
+    rule_engine: RuleEngine = RuleEngine()
+    rule_engine.compile(events, fleet)
+
+    assert rule_engine.compiled_requirement_count == 0
+    assert rule_engine.evaluate() == [False, True, True]
+
+
+def test_rule_engine_evaluates_only_changed_slots():
+    """Test that only events depending on changed slots are checked again."""
+
+    fleet, sensor = _prepare_fleet()
+    event: SchedulerEvent = SchedulerEvent(
+        requirements=[SensorRequirement(sensor, "GT", 20)],
+        actions=[],
+    )
+
+    rule_engine: RuleEngine = RuleEngine()
+    rule_engine.compile([event], fleet)
+    assert rule_engine.evaluate(fleet.pop_dirty()) == [False]
+
+    fleet.set_reading(0, 30)
+    assert rule_engine.evaluate(set()) == [False]
+    assert rule_engine.evaluate(fleet.pop_dirty()) == [True]
+
+
+def test_rule_engine_threshold_index_matches_full_evaluation():
+    """Test that incremental evaluation agrees with a full evaluation."""
+
+    fleet, sensor = _prepare_fleet()
+    modes: list[ComparisonMode] = ["EQ", "NE", "LE", "GE", "LT", "GT"]
+    events: list[SchedulerEvent] = [
+        SchedulerEvent(
+            requirements=[
+                SensorRequirement(sensor, lower_mode, lower),
+                SensorRequirement(sensor, upper_mode, lower + 10),
+            ],
+            actions=[],
+        )
+        for lower_mode in modes
+        for upper_mode in modes
+        for lower in range(0, 100, 10)
+    ]
+
+    rule_engine: RuleEngine = RuleEngine()
+    rule_engine.compile(events, fleet)
+    rule_engine.evaluate(fleet.pop_dirty())
+
+    for reading in [5, 10, 20, 15, 15, 90, 0, 100, 40, 41, 39, 40]:
+        fleet.set_reading(0, reading)
+        assert rule_engine.evaluate(fleet.pop_dirty()) == [
+            event.should_trigger() for event in events
+        ]
+
+
+def test_rule_engine_hysteresis_matches_requirements():
+    """Test that compiled hysteresis bands agree with the requirements."""
+
+    fleet, sensor = _prepare_fleet()
+    events: list[SchedulerEvent] = [
+        SchedulerEvent(
+            requirements=[SensorRequirement(sensor, mode, 50, hysteresis=10)],
+            actions=[],
+        )
+        for mode in ("LE", "GE", "LT", "GT")
+    ]
+    # Called directly, the requirements keep their own state.
+    uncompiled_events: list[SchedulerEvent] = [
+        SchedulerEvent(
+            requirements=[SensorRequirement(sensor, mode, 50, hysteresis=10)],
+            actions=[],
+        )
+        for mode in ("LE", "GE", "LT", "GT")
+    ]
+
+    rule_engine: RuleEngine = RuleEngine()
+    rule_engine.compile(events, fleet)
+    assert rule_engine.evaluate(fleet.pop_dirty()) == [
+        event.should_trigger() for event in uncompiled_events
+    ]
+
+    for reading in [45, 55, 45, 40, 39, 60, 50, 61, 55, 50]:
+        fleet.set_reading(0, reading)
+        assert rule_engine.evaluate(fleet.pop_dirty()) == [
+            event.should_trigger() for event in uncompiled_events
+        ]
@@ -0,0 +1,74 @@
+from collections import Counter
+from datetime import datetime, timezone
+
+from src.clock import VirtualClock
+from src.device import Device
+from src.event_log import EventRecord, RecordKind
+from src.physical_quantity import PhysicalQuantity
+from src.sampling_schedule import SamplingSchedule
+from src.scheduler import Scheduler, SchedulerEvent
+from src.sensor import Sensor
+
+
+def test_sampling_schedule_groups_by_interval():
+    """Test that sensors and events sharing an interval share a group."""
+
+    sensors: list[Sensor] = [
+        Sensor(
+            "Fast sensor", PhysicalQuantity.MOTION, (0, 100), sampling_interval_sec=1
+        ),
+        Sensor("Slow sensor", PhysicalQuantity.TEMPERATURE, (-20, 75)),
+    ]
+    events: list[SchedulerEvent] = [
+        SchedulerEvent(requirements=[], actions=[], interval_sec=1),
+    ]
+
+    sampling_schedule: SamplingSchedule = SamplingSchedule()
+    sampling_schedule.build(sensors, events, 10, 0.0)
+
+    assert [
+        (group.interval_sec, group.sensors, group.event_indices)
+        for group in sampling_schedule.pop_due(0.0)
+    ] == [(1, [sensors[0]], [0]), (10, [sensors[1]], [])]
+    assert sampling_schedule.next_due_time() == 1.0
+    assert sampling_schedule.pop_due(0.5) == []
+
+
+def test_scheduler_samples_sensors_at_their_own_interval():
+    """Test that the autopilot updates each sensor at its own interval."""
+
+    fast_sensor: Sensor = Sensor(
+        "Fast sensor",
+        PhysicalQuantity.MOTION,
+        (0, 100),
+        sampling_interval_sec=0.5,
+    )
+    slow_sensor: Sensor = Sensor("Slow sensor", PhysicalQuantity.TEMPERATURE, (-20, 75))
+    device: Device = Device("Sampled light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(
+        10,
+        clock=VirtualClock(datetime(2023, 1, 1, tzinfo=timezone.utc)),
+    )
+    scheduler.register_sensors([fast_sensor, slow_sensor])
+    scheduler.register_devices([device])
+    scheduler.register_events(
+        [
+            SchedulerEvent(
+                requirements=[],
+                actions=[lambda: device.set_device_value(1)],
+                interval_sec=5,
+            )
+        ]
+    )
+
+    dispatched: list[list[EventRecord]] = []
+    scheduler.subscribe_records(dispatched.append)
+    scheduler.simulate(40)
+
+    counts: Counter[tuple[RecordKind, int]] = Counter(
+        (record.kind, record.uuid) for records in dispatched for record in records
+    )
+    assert counts[(RecordKind.SENSOR, fast_sensor.uuid)] == 40
+    assert counts[(RecordKind.SENSOR, slow_sensor.uuid)] == 2
+    assert counts[(RecordKind.DEVICE, device.uuid)] == 4
@@ -1,4 +1,10 @@
-from src.scheduler import Scheduler
+from src.device import Device
+from src.device_command import CoalescePolicy, DeviceCommand
+from src.physical_quantity import PhysicalQuantity
+from src.requirement import SensorRequirement
+from src.clock import VirtualClock
+from src.scheduler import LogMode, Scheduler, SchedulerEvent
+from src.sensor import Sensor
 
 
 def test_scheduler_is_running_getter():
@@ -26,3 +32,354 @@ def test_scheduler_stop_schedule_method():
     scheduler.start()
     scheduler.stop()
     assert scheduler.running is False
+
+
+def test_scheduler_manual_update_triggers_events():
+    """Test that a manual update dispatches sensor and action logs."""
+
+    sensor: Sensor = Sensor("Scheduler sensor", PhysicalQuantity.MOTION, (0, 100))
+    device: Device = Device("Scheduler light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_sensors([sensor])
+    scheduler.register_devices([device])
+    scheduler.register_events(
+        [
+            SchedulerEvent(
+                requirements=[SensorRequirement(sensor, "GE", 0)],
+                actions=[lambda: device.set_device_value(100)],
+            ),
+            SchedulerEvent(
+                requirements=[SensorRequirement(sensor, "LT", 0)],
+                actions=[lambda: device.set_device_value(50)],
+            ),
+        ]
+    )
+
+    dispatched: list[list[str]] = []
+    scheduler.manual_update(dispatched.append)
+
+    assert dispatched == [
+        [
+            sensor.get_loggable_text(False),
+            "Scheduler light: current BRIGHTNESS (%) is 100.",
+        ]
+    ]
+
+
+def test_scheduler_pop_changed_uuids():
+    """Test that the scheduler reports the sensors and devices that changed."""
+
+    changing_sensor: Sensor = Sensor(
+        "Changing sensor", PhysicalQuantity.MOTION, (0, 100)
+    )
+    constant_sensor: Sensor = Sensor("Constant sensor", PhysicalQuantity.MOTION, (0, 0))
+    device: Device = Device("Changed light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_sensors([changing_sensor, constant_sensor])
+    scheduler.register_devices([device])
+    scheduler.manual_update()
+
+    # The first call reports everything.
+    assert scheduler.pop_changed_uuids() == {
+        changing_sensor.uuid,
+        constant_sensor.uuid,
+        device.uuid,
+    }
+    assert scheduler.pop_changed_uuids() == set()
+
+    scheduler._sensor_fleet.set_reading(changing_sensor._fleet_index, 50)
+    device.set_device_value(100)
+    scheduler.manual_update()
+
+    assert scheduler.pop_changed_uuids() == {changing_sensor.uuid, device.uuid}
+
+
+def test_scheduler_registry_lookups():
+    """Test the uuid, kind and name lookups of the registry."""
+
+    thermometer: Sensor = Sensor("Lookup sensor", PhysicalQuantity.TEMPERATURE, (0, 40))
+    motion_sensor: Sensor = Sensor("Lookup sensor", PhysicalQuantity.MOTION, (0, 100))
+    device: Device = Device("Lookup light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(0)
+    sensors = scheduler.sensors
+    thermometers = scheduler.sensors_of_kind(PhysicalQuantity.TEMPERATURE)
+
+    scheduler.register_sensors([thermometer, motion_sensor])
+    scheduler.register_devices([device])
+
+    # Views are live.
+    assert list(sensors) == [thermometer, motion_sensor]
+    assert list(thermometers) == [thermometer]
+    assert list(scheduler.devices_of_kind(PhysicalQuantity.BRIGHTNESS)) == [device]
+    assert list(scheduler.devices_of_kind(PhysicalQuantity.MOTION)) == []
+
+    assert scheduler.get_sensor(motion_sensor.uuid) is motion_sensor
+    assert scheduler.get_sensor(device.uuid) is None
+    assert scheduler.get_device(device.uuid) is device
+
+    assert scheduler.sensors_named("Lookup sensor") == [thermometer, motion_sensor]
+    assert scheduler.devices_named("Lookup light") == [device]
+    assert scheduler.devices_named("Missing light") == []
+
+
+def test_scheduler_rejects_sensors_of_another_scheduler():
+    """Test that a sensor cannot be registered to two schedulers."""
+
+    sensor: Sensor = Sensor("Shared sensor", PhysicalQuantity.TEMPERATURE, (0, 40))
+    first_scheduler: Scheduler = Scheduler(0)
+    second_scheduler: Scheduler = Scheduler(0)
+
+    first_scheduler.register_sensors([sensor])
+    try:
+        second_scheduler.register_sensors([sensor])
+        assert False, "The sensor was registered to two schedulers."
+    except ValueError:
+        pass
+
+    assert second_scheduler.get_sensor(sensor.uuid) is None
+    assert first_scheduler.get_sensor(sensor.uuid) is sensor
+
+
+def test_scheduler_ignores_detached_sensors():
+    """Test that a sensor detached from the fleet no longer changes."""
+
+    kept_sensor: Sensor = Sensor("Kept sensor", PhysicalQuantity.MOTION, (0, 100))
+    detached_sensor: Sensor = Sensor(
+        "Detached sensor", PhysicalQuantity.MOTION, (0, 100)
+    )
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_sensors([kept_sensor, detached_sensor])
+    scheduler.pop_changed_uuids()
+
+    scheduler.sensor_fleet.detach(detached_sensor)
+    detached_reading: int = detached_sensor.sensor_reading
+    for _ in range(20):
+        scheduler.manual_update()
+        assert detached_sensor.uuid not in scheduler.pop_changed_uuids()
+
+    assert detached_sensor.sensor_reading == detached_reading
+    assert scheduler.sensor_fleet.pop_dirty() == set()
+
+
+def test_scheduler_reports_only_live_slots_as_changed():
+    """Test that writes to the slot of a detached sensor are not reported."""
+
+    sensor: Sensor = Sensor("Detached sensor", PhysicalQuantity.MOTION, (0, 100))
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_sensors([sensor])
+    scheduler.pop_changed_uuids()
+
+    slot: int = scheduler.sensor_fleet.attach(sensor)
+    scheduler.sensor_fleet.detach(sensor)
+    scheduler.sensor_fleet.set_reading(slot, 77)
+    scheduler.manual_update()
+
+    assert scheduler.pop_changed_uuids() == set()
+
+
+def test_scheduler_coalesces_device_commands():
+    """Test that a device written by several events is written once per tick."""
+
+    device: Device = Device("Coalesced light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+    events: list[SchedulerEvent] = [
+        SchedulerEvent(requirements=[], actions=[DeviceCommand(device, 75)]),
+        SchedulerEvent(
+            requirements=[],
+            actions=[DeviceCommand(device, 25), lambda: "other action"],
+            priority=1,
+        ),
+    ]
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_devices([device])
+    scheduler.register_events(events)
+
+    logs: list[str] = []
+    scheduler.manual_update(logs.extend)
+
+    assert logs == ["other action", "Coalesced light: current BRIGHTNESS (%) is 25."]
+
+    scheduler.coalesce_policy = CoalescePolicy.MAX
+    scheduler.manual_update()
+    assert device.device_value == 75
+
+    scheduler.coalesce_policy = CoalescePolicy.PRIORITY
+    scheduler.manual_update()
+    assert device.device_value == 25
+
+
+def test_scheduler_keeps_the_declared_order_of_writes():
+    """Test that the last declared write of a device wins, command or not."""
+
+    command_last: Device = Device("Command last", PhysicalQuantity.BRIGHTNESS, (0, 100))
+    action_last: Device = Device("Action last", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_devices([command_last, action_last])
+    scheduler.register_events(
+        [
+            SchedulerEvent(
+                requirements=[],
+                actions=[
+                    lambda: command_last.set_device_value(20),
+                    DeviceCommand(command_last, 10),
+                    DeviceCommand(action_last, 10),
+                    lambda: action_last.set_device_value(20),
+                ],
+            )
+        ]
+    )
+    scheduler.manual_update()
+
+    assert command_last.device_value == 10
+    assert action_last.device_value == 20
+
+
+def test_scheduler_delta_logging():
+    """Test that only changes are logged, with periodic keyframes."""
+
+    sensor: Sensor = Sensor(
+        "Delta sensor", PhysicalQuantity.MOTION, (0, 100), variation_percentage=0.0
+    )
+    device: Device = Device("Delta light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+    clock: VirtualClock = VirtualClock()
+
+    scheduler: Scheduler = Scheduler(1, clock)
+    scheduler.register_sensors([sensor])
+    scheduler.register_devices([device])
+    scheduler.register_events(
+        [SchedulerEvent(requirements=[], actions=[DeviceCommand(device, 50)])]
+    )
+    scheduler.log_mode = LogMode.DELTA
+    scheduler.keyframe_interval_sec = 10
+
+    recorded_uuids: list[list[int]] = []
+    scheduler.subscribe_records(
+        lambda records: recorded_uuids.append([record.uuid for record in records])
+    )
+    logs: list[str] = []
+
+    expected_logs: list[str] = [
+        "Delta sensor: current MOTION (%) reading is 0.",
+        "Delta light: current BRIGHTNESS (%) is 50.",
+    ]
+
+    # The first tick is a keyframe.
+    scheduler.manual_update(logs.extend)
+    assert logs == expected_logs
+    assert recorded_uuids == [[sensor.uuid, device.uuid]]
+
+    # Nothing changed.
+    logs.clear()
+    clock.sleep(5)
+    scheduler.manual_update(logs.extend)
+    assert logs == []
+    assert recorded_uuids[-1] == []
+
+    # The next keyframe repeats the full state.
+    clock.sleep(5)
+    scheduler.manual_update(logs.extend)
+    assert logs == expected_logs
+    assert recorded_uuids[-1] == [sensor.uuid, device.uuid]
+
+
+def test_scheduler_delta_logging_of_plain_actions():
+    """Test that plain actions writing unchanged devices are not logged in delta mode."""
+
+    device: Device = Device("Plain light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+    target_values: list[int] = [40]
+
+    scheduler: Scheduler = Scheduler(1, VirtualClock())
+    scheduler.register_devices([device])
+    scheduler.register_events(
+        [
+            SchedulerEvent(
+                requirements=[],
+                actions=[
+                    lambda: device.set_device_value(target_values[0]),
+                    lambda: "deviceless action",
+                ],
+            )
+        ]
+    )
+    scheduler.log_mode = LogMode.DELTA
+
+    logs: list[str] = []
+    scheduler.manual_update(logs.extend)
+    assert logs == ["Plain light: current BRIGHTNESS (%) is 40.", "deviceless action"]
+
+    logs.clear()
+    scheduler.manual_update(logs.extend)
+    assert logs == ["deviceless action"]
+
+    target_values[0] = 60
+    logs.clear()
+    scheduler.manual_update(logs.extend)
+    assert logs == ["Plain light: current BRIGHTNESS (%) is 60.", "deviceless action"]
+
+
+def test_scheduler_keyframe_logs_plain_action_writes_once():
+    """Test that a keyframe does not log again a device written by a plain action."""
+
+    written_device: Device = Device(
+        "Written light", PhysicalQuantity.BRIGHTNESS, (0, 100)
+    )
+    idle_device: Device = Device("Idle light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(1, VirtualClock())
+    scheduler.register_devices([written_device, idle_device])
+    scheduler.register_events(
+        [
+            SchedulerEvent(
+                requirements=[],
+                actions=[lambda: written_device.set_device_value(40)],
+            )
+        ]
+    )
+    scheduler.log_mode = LogMode.DELTA
+    scheduler.keyframe_interval_sec = 10
+
+    logs: list[str] = []
+    scheduler.manual_update(logs.extend)
+
+    assert logs == [
+        "Written light: current BRIGHTNESS (%) is 40.",
+        "Idle light: current BRIGHTNESS (%) is 0.",
+    ]
+
+
+def test_scheduler_edge_triggered_events():
+    """Test that an edge-triggered event only fires when its requirements become met."""
+
+    sensor: Sensor = Sensor("Edge sensor", PhysicalQuantity.MOTION, (0, 100))
+    device: Device = Device("Edge light", PhysicalQuantity.BRIGHTNESS, (0, 100))
+
+    scheduler: Scheduler = Scheduler(0)
+    scheduler.register_sensors([sensor])
+    scheduler.register_devices([device])
+    scheduler.register_events(
+        [
+            SchedulerEvent(
+                requirements=[SensorRequirement(sensor, "GE", 0)],
+                actions=[DeviceCommand(device, 50)],
+                edge_triggered=True,
+            )
+        ]
+    )
+
+    written_values: list[int] = []
+    scheduler.subscribe_records(
+        lambda records: written_values.extend(
+            record.value for record in records if record.uuid == device.uuid
+        )
+    )
+
+    for _ in range(3):
+        scheduler.manual_update()
+
+    assert written_values == [50]
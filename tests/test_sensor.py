@@ -1,4 +1,7 @@
-from src.sensor import BASIC_DAYLIGHT_SENSOR
+from datetime import datetime, timezone
+
+from src.sensor import BASIC_DAYLIGHT_SENSOR, Sensor
+from src.sensor_fleet import SensorFleet
 from src.physical_quantity import PhysicalQuantity
 
 
@@ -22,6 +25,35 @@ def test_sensor_getters():
     # assert BASIC_DAYLIGHT_SENSOR.update_sensor_value()
 
 
+def test_sensor_loggable_text_is_cached():
+    """Test that the loggable text is reused until the reading changes."""
+
+    sensor: Sensor = Sensor("Cached sensor", PhysicalQuantity.MOTION, (0, 100))
+    fleet: SensorFleet = SensorFleet()
+    fleet.attach(sensor)
+
+    loggable_text: str = sensor.get_loggable_text(False)
+    assert sensor.get_loggable_text(False) is loggable_text
+
+    fleet.set_reading(sensor._fleet_index, 42)
+    assert sensor.get_loggable_text(False) == (
+        "Cached sensor: current MOTION (%) reading is 42."
+    )
+
+    sensor.name = "Renamed sensor"
+    loggable_text = sensor.get_loggable_text(False)
+    assert loggable_text.startswith("Renamed sensor:")
+
+    # An equal name built at runtime is interned, and keeps the text.
+    sensor.name = "".join(["Renamed", " sensor"])
+    assert sensor.get_loggable_text(False) is loggable_text
+
+    timestamp: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert sensor.get_loggable_text(timestamp=timestamp) == (
+        "[2024-01-01 00:00:00+00:00] Renamed sensor: current MOTION (%) reading is 42."
+    )
+
+
 def test_sensor_reading_is_equal_method():
     """Testing EQ mode of reading_is method."""
 
@@ -72,3 +104,23 @@ def test_sensor_reading_is_less_than_or_equal_method():
 
 def test_random_sensor_reading():
     """Test that the random sensor reading is within the range."""
+
+
+def test_fixed_range_sensor_stays_at_lower_bound():
+    """Test that a sensor with an empty interval behaves the same in and out of a fleet."""
+
+    standalone_sensor: Sensor = Sensor("Fixed sensor", PhysicalQuantity.MOTION, (5, 5))
+    attached_sensor: Sensor = Sensor("Fixed sensor", PhysicalQuantity.MOTION, (5, 5))
+    stepped_sensor: Sensor = Sensor("Fixed sensor", PhysicalQuantity.MOTION, (5, 5))
+    fleet: SensorFleet = SensorFleet()
+    fleet.attach(attached_sensor)
+    fleet.attach(stepped_sensor)
+
+    standalone_sensor.update_sensor_value()
+    attached_sensor.update_sensor_value()
+    fleet.step_slots([stepped_sensor._fleet_index])
+
+    assert standalone_sensor.sensor_reading == 5
+    assert attached_sensor.sensor_reading == 5
+    assert attached_sensor.sample_next_reading() == 5
+    assert stepped_sensor.sensor_reading == 5
@@ -0,0 +1,97 @@
+from src.physical_quantity import PhysicalQuantity
+from src.sensor import Sensor
+from src.sensor_fleet import SensorFleet
+
+
+def test_sensor_fleet_attach():
+    """Test that attaching a sensor keeps its reading and makes it a view."""
+
+    sensor: Sensor = Sensor("Fleet sensor", PhysicalQuantity.BRIGHTNESS, (10, 100))
+    fleet: SensorFleet = SensorFleet()
+
+    assert fleet.attach(sensor) == 0
+    assert fleet.attach(sensor) == 0
+    assert len(fleet) == 1
+    assert fleet.reading(0) == 10
+
+    fleet.set_reading(0, 42)
+    assert sensor.sensor_reading == 42
+    assert sensor.compare_sensor_reading("EQ", 42) is True
+    assert fleet.kind(0) == PhysicalQuantity.BRIGHTNESS
+
+    # Sensors are slotted.
+    assert not hasattr(sensor, "__dict__")
+
+
+def test_sensor_fleet_step_within_range():
+    """Test that a batched step keeps every reading within its range."""
+
+    sensors: list[Sensor] = [
+        Sensor("Fleet thermometer", PhysicalQuantity.TEMPERATURE, (-20, 75)),
+        Sensor("Fleet hygrometer", PhysicalQuantity.AIR_HUMIDITY, (0, 100)),
+        Sensor("Fleet motion sensor", PhysicalQuantity.MOTION, (0, 5)),
+    ]
+    fleet: SensorFleet = SensorFleet()
+    for sensor in sensors:
+        fleet.attach(sensor)
+
+    for _ in range(200):
+        fleet.step()
+        for sensor in sensors:
+            range_min, range_max = sensor.sensor_reading_range
+            assert range_min <= sensor.sensor_reading <= range_max
+
+
+def test_sensor_fleet_update_sensor_value_writes_to_fleet():
+    """Test that updating an attached sensor writes the reading into the fleet."""
+
+    sensor: Sensor = Sensor("Fleet sensor", PhysicalQuantity.BRIGHTNESS, (0, 100))
+    fleet: SensorFleet = SensorFleet()
+    fleet.attach(sensor)
+
+    sensor.update_sensor_value()
+    assert fleet.reading(0) == sensor.sensor_reading
+
+
+def test_sensor_fleet_attach_moves_sensor():
+    """Test that a sensor only moves to another fleet once detached."""
+
+    sensor: Sensor = Sensor("Fleet sensor", PhysicalQuantity.BRIGHTNESS, (0, 100))
+    first_fleet: SensorFleet = SensorFleet()
+    second_fleet: SensorFleet = SensorFleet()
+
+    first_fleet.attach(sensor)
+    first_fleet.set_reading(0, 30)
+    try:
+        second_fleet.attach(sensor)
+        assert False, "The sensor was taken from its fleet."
+    except ValueError:
+        pass
+    assert first_fleet.sensors == [sensor]
+    assert len(second_fleet) == 0
+
+    first_fleet.detach(sensor)
+    second_fleet.attach(sensor)
+
+    assert first_fleet.sensors == []
+    assert second_fleet.sensors == [sensor]
+    assert sensor.sensor_reading == 30
+
+
+def test_sensor_fleet_tracks_dirty_slots():
+    """Test that only slots whose reading changed are reported as dirty."""
+
+    sensors: list[Sensor] = [
+        Sensor("Fleet sensor", PhysicalQuantity.BRIGHTNESS, (0, 100)),
+        Sensor("Fleet sensor", PhysicalQuantity.BRIGHTNESS, (0, 100)),
+    ]
+    fleet: SensorFleet = SensorFleet()
+    for sensor in sensors:
+        fleet.attach(sensor)
+
+    assert fleet.pop_dirty() == {0, 1}
+    assert fleet.pop_dirty() == set()
+
+    fleet.set_reading(0, 0)
+    fleet.set_reading(1, 50)
+    assert fleet.pop_dirty() == {1}
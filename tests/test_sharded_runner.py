@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.clock import Clock
+from src.event_log import CatalogEntry, RecordKind
+from src.physical_quantity import PhysicalQuantity
+from src.scheduler import Scheduler
+from src.sensor import Sensor
+from src.sharded_runner import HomeRecord, ShardedSimulation
+
+
+def _build_home(home_index: int, clock: Clock) -> Scheduler:
+    scheduler: Scheduler = Scheduler(5, clock)
+    scheduler.register_sensors(
+        [
+            Sensor(f"Home {home_index} motion", PhysicalQuantity.MOTION, (0, 100)),
+            Sensor(f"Home {home_index} uv", PhysicalQuantity.UV_INDEX, (0, 10)),
+        ]
+    )
+
+    return scheduler
+
+
+def test_sharded_simulation_merges_records():
+    """Test that the records of every home are merged in timestamp order."""
+
+    start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    simulation: ShardedSimulation = ShardedSimulation(_build_home, 5, 2)
+
+    records: list[HomeRecord] = simulation.run(3, start)
+
+    # 5 homes, 2 sensors each, 3 ticks.
+    assert len(records) == 5 * 2 * 3
+    assert all(record.record.kind == RecordKind.SENSOR for record in records)
+    assert [
+        (record.record.timestamp, record.home_index) for record in records
+    ] == sorted((record.record.timestamp, record.home_index) for record in records)
+    assert records[0].record.timestamp == start.timestamp()
+    assert records[-1].record.timestamp == start.timestamp() + 10
+
+    assert sorted(simulation.final_readings) == [0, 1, 2, 3, 4]
+    for home_index, readings in simulation.final_readings.items():
+        last_readings: list[int] = [
+            record.record.value
+            for record in records[-10:]
+            if record.home_index == home_index
+        ]
+        assert readings == last_readings
+
+    # Every record is named by the catalog of its home.
+    assert sorted(simulation.catalogs) == [0, 1, 2, 3, 4]
+    for record in records:
+        catalog: dict[int, CatalogEntry] = simulation.catalogs[record.home_index]
+        assert catalog[record.record.uuid].name.startswith(f"Home {record.home_index} ")
+
+
+def _build_meter_home(home_index: int, clock: Clock) -> Scheduler:
+    scheduler: Scheduler = Scheduler(5, clock)
+    scheduler.register_sensors(
+        [
+            Sensor(
+                f"Home {home_index} meter",
+                PhysicalQuantity.NONE,
+                (3_000_000_000, 3_000_000_100),
+            )
+        ]
+    )
+
+    return scheduler
+
+
+def test_sharded_simulation_keeps_wide_values():
+    """Test that readings beyond 32 bits survive the shared memory transfer."""
+
+    start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    simulation: ShardedSimulation = ShardedSimulation(_build_meter_home, 2, 2)
+
+    records: list[HomeRecord] = simulation.run(2, start)
+
+    assert len(records) == 2 * 2
+    assert all(record.record.value >= 3_000_000_000 for record in records)
+
+
+def _build_failing_home(home_index: int, clock: Clock) -> Scheduler:
+    if home_index == 0:
+        raise RuntimeError("The home could not be built.")
+
+    return _build_home(home_index, clock)
+
+
+def _shared_memory_blocks() -> set[str]:
+    shared_memory_directory: Path = Path("/dev/shm")
+    if not shared_memory_directory.is_dir():
+        return set()
+
+    return {path.name for path in shared_memory_directory.iterdir()}
+
+
+def test_sharded_simulation_unlinks_blocks_after_a_failure():
+    """Test that the blocks of the other shards are unlinked when a shard fails."""
+
+    start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    simulation: ShardedSimulation = ShardedSimulation(_build_failing_home, 8, 2)
+    blocks: set[str] = _shared_memory_blocks()
+
+    try:
+        simulation.run(2, start)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("The failure of the shard was not raised")
+
+    assert _shared_memory_blocks() == blocks
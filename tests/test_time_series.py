@@ -0,0 +1,79 @@
+from pathlib import Path
+
+from src.event_log import EventRecord, RecordKind
+from src.time_series import DownsampledBucket, SensorHistoryStore
+
+
+def test_sensor_history_store_query(tmp_path: Path):
+    """Test that samples within a time range are returned oldest first."""
+
+    with SensorHistoryStore(tmp_path, capacity=100) as history_store:
+        for second in range(10):
+            history_store.append(1, float(second), second * 10)
+
+        assert history_store.query(1, 2.5, 5.0) == [(3.0, 30), (4.0, 40), (5.0, 50)]
+        assert history_store.query(2, 0.0, 10.0) == []
+
+
+def test_sensor_history_store_wraps_around(tmp_path: Path):
+    """Test that the oldest samples are overwritten once the ring is full."""
+
+    with SensorHistoryStore(tmp_path, capacity=4) as history_store:
+        for second in range(10):
+            history_store.append(1, float(second), second)
+
+        assert history_store.query(1, 0.0, 10.0) == [
+            (6.0, 6),
+            (7.0, 7),
+            (8.0, 8),
+            (9.0, 9),
+        ]
+
+
+def test_sensor_history_store_persists(tmp_path: Path):
+    """Test that history survives reopening the store."""
+
+    with SensorHistoryStore(tmp_path, capacity=4) as history_store:
+        history_store.append_records(
+            [
+                EventRecord(1.0, 1, RecordKind.SENSOR, 10),
+                EventRecord(1.0, 100001, RecordKind.DEVICE, 75),
+            ]
+        )
+
+    with SensorHistoryStore(tmp_path) as history_store:
+        assert history_store.query(1, 0.0, 2.0) == [(1.0, 10)]
+        assert history_store.query(100001, 0.0, 2.0) == []
+
+
+def test_sensor_history_store_downsample(tmp_path: Path):
+    """Test that samples are summarized per time bucket."""
+
+    with SensorHistoryStore(tmp_path) as history_store:
+        for second in range(10):
+            history_store.append(1, float(second), second)
+
+        assert history_store.downsample(1, 0.0, 10.0, 2) == [
+            DownsampledBucket(0.0, 0, 4, 2.0, 5),
+            DownsampledBucket(5.0, 5, 9, 7.0, 5),
+        ]
+
+
+def test_sensor_history_store_bounds_open_ring_files(tmp_path: Path):
+    """Test that least recently used ring files are closed and reopened on use."""
+
+    with SensorHistoryStore(
+        tmp_path, capacity=10, max_open_ring_files=2
+    ) as history_store:
+        for second in range(3):
+            for uuid in range(1, 6):
+                history_store.append(uuid, float(second), uuid * 100 + second)
+
+        assert history_store.open_ring_file_count == 2
+        for uuid in range(1, 6):
+            assert history_store.query(uuid, 0.0, 10.0) == [
+                (0.0, uuid * 100),
+                (1.0, uuid * 100 + 1),
+                (2.0, uuid * 100 + 2),
+            ]
+        assert history_store.open_ring_file_count == 2